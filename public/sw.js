@@ -0,0 +1,219 @@
+/**
+ * Service worker for repeat visits.
+ *
+ * scripts/prerender.py writes /sw-manifest.json on every build: the Vite shell
+ * assets and the hot landing routes (home, hubs, city pages, top clubs), each
+ * with a content hash. Those are served cache-first. A sync to a new manifest
+ * version copies every entry whose hash is unchanged from the previous cache
+ * and fetches only the rest, so after a deploy repeat visitors re-download
+ * just the pages that actually changed.
+ *
+ * Hashed /assets/* files outside the manifest (lazy chunks, images) are cached
+ * at runtime — their names change whenever their content does. Everything else
+ * (other routes, /data/, the API) goes straight to the network.
+ *
+ * Navigations are served from the current version only. Open pages rendered
+ * from an older version still request that version's hashed assets, so older
+ * precaches are kept until no open window loaded its HTML from one.
+ *
+ * The sync throttle and the current version live in a small state entry in the
+ * cache, since the worker's globals are lost whenever the browser stops it.
+ *
+ * A 404 for the manifest (a build without prerender, or `--watch`) clears the
+ * caches and unregisters the worker.
+ */
+
+const MANIFEST_URL = '/sw-manifest.json';
+const MANIFEST_VERSION = 1; // MUST match SW_MANIFEST_VERSION in scripts/prerender.py
+const PRECACHE_PREFIX = 'clubin-precache-';
+const RUNTIME_CACHE = 'clubin-assets';
+const RUNTIME_MAX_ENTRIES = 80;
+const STATE_CACHE = 'clubin-state';
+const STATE_URL = '/__sw-state'; // {lastSync, current}: current is the complete precache to navigate from
+const SYNC_INTERVAL_MS = 5 * 60 * 1000;
+const NETWORK_PAGE = 'network'; // a page whose HTML came from the network needs no precache
+
+let state = null; // cached copy of the STATE_URL entry
+let syncing = null;
+const clientVersions = new Map(); // window client id -> precache name its HTML came from (or NETWORK_PAGE)
+
+async function loadState() {
+    if (!state) {
+        const stored = await caches.match(STATE_URL, { cacheName: STATE_CACHE });
+        state = stored ? await stored.json() : { lastSync: 0, current: null };
+    }
+    return state;
+}
+
+async function saveState(changes) {
+    state = { ...(await loadState()), ...changes };
+    const cache = await caches.open(STATE_CACHE);
+    await cache.put(STATE_URL, new Response(JSON.stringify(state), {
+        headers: { 'Content-Type': 'application/json' },
+    }));
+}
+
+/** The current manifest; null when it is gone. Throws when it can't be fetched or read. */
+async function fetchManifest() {
+    const res = await fetch(MANIFEST_URL, { cache: 'no-store' });
+    if (res.status === 404) return null;
+    if (!res.ok) throw new Error(`manifest HTTP ${res.status}`);
+    const manifest = await res.json();
+    if (manifest.v !== MANIFEST_VERSION) throw new Error(`manifest v${manifest.v}`);
+    return manifest;
+}
+
+function manifestEntries(manifest) {
+    return { ...manifest.assets, ...manifest.routes };
+}
+
+async function unregister() {
+    const names = await caches.keys();
+    await Promise.all(names.filter((name) => name.startsWith('clubin-')).map((name) => caches.delete(name)));
+    state = null;
+    await self.registration.unregister();
+}
+
+/** Delete precaches older than the current one once no open window was rendered from them. */
+async function pruneOldPrecaches() {
+    const { current } = await loadState();
+    if (!current) return;
+    const windows = await self.clients.matchAll({ type: 'window' });
+    const open = new Set(windows.map((client) => client.id));
+    for (const id of clientVersions.keys()) {
+        if (!open.has(id)) clientVersions.delete(id);
+    }
+    // A window we have no record of (the worker restarted since it loaded) may need any version
+    const inUse = windows.map((client) => clientVersions.get(client.id));
+    if (inUse.some((version) => version !== current && version !== NETWORK_PAGE)) return;
+    for (const name of await caches.keys()) {
+        if (name !== current && name.startsWith(PRECACHE_PREFIX)) await caches.delete(name);
+    }
+}
+
+/** Bring the precache up to the current manifest, reusing unchanged entries. */
+async function sync() {
+    await saveState({ lastSync: Date.now() });
+    await pruneOldPrecaches();
+    let manifest;
+    try {
+        manifest = await fetchManifest();
+    } catch {
+        return; // offline or a bad deploy — keep serving what we have
+    }
+    if (manifest === null) {
+        await unregister();
+        return;
+    }
+
+    const name = PRECACHE_PREFIX + manifest.version;
+    const cache = await caches.open(name);
+    // The manifest is stored last, so its presence marks a complete cache
+    if (await cache.match(MANIFEST_URL)) {
+        if ((await loadState()).current !== name) await saveState({ current: name });
+        return;
+    }
+
+    const previous = [];
+    for (const other of await caches.keys()) {
+        if (other === name || !other.startsWith(PRECACHE_PREFIX)) continue;
+        const otherCache = await caches.open(other);
+        const stored = await otherCache.match(MANIFEST_URL);
+        if (stored) previous.push([otherCache, manifestEntries(await stored.json())]);
+    }
+
+    const entries = manifestEntries(manifest);
+    const results = await Promise.allSettled(Object.entries(entries).map(async ([url, hash]) => {
+        if (await cache.match(url)) return; // fetched by an interrupted sync to this version
+        for (const [otherCache, otherEntries] of previous) {
+            if (otherEntries[url] !== hash) continue;
+            const kept = await otherCache.match(url);
+            if (kept) return cache.put(url, kept);
+        }
+        const res = await fetch(url, { cache: 'no-cache' });
+        if (!res.ok || res.redirected) throw new Error(`${url}: HTTP ${res.status}`);
+        await cache.put(url, res);
+    }));
+    if (results.some((result) => result.status === 'rejected')) return; // retried on the next sync
+
+    await cache.put(MANIFEST_URL, new Response(JSON.stringify(manifest), {
+        headers: { 'Content-Type': 'application/json' },
+    }));
+    await saveState({ current: name });
+    await pruneOldPrecaches();
+}
+
+function syncOnce() {
+    if (!syncing) syncing = sync().finally(() => { syncing = null; });
+    return syncing;
+}
+
+async function syncIfDue() {
+    if (Date.now() - (await loadState()).lastSync > SYNC_INTERVAL_MS) await syncOnce();
+}
+
+/** A navigation: the current version's copy of the page, else the network. */
+async function navigate(event, path) {
+    const { current } = await loadState();
+    const cached = current ? await caches.match(path, { cacheName: current }) : undefined;
+    if (event.resultingClientId) clientVersions.set(event.resultingClientId, cached ? current : NETWORK_PAGE);
+    return cached || fetch(event.request);
+}
+
+async function fromPrecache(path) {
+    for (const name of await caches.keys()) {
+        if (!name.startsWith(PRECACHE_PREFIX)) continue;
+        const res = await (await caches.open(name)).match(path);
+        if (res) return res;
+    }
+    return null;
+}
+
+async function trimRuntimeCache(cache) {
+    const keys = await cache.keys();
+    await Promise.all(keys.slice(0, Math.max(0, keys.length - RUNTIME_MAX_ENTRIES)).map((key) => cache.delete(key)));
+}
+
+async function cacheFirstAsset(request, path) {
+    const precached = await fromPrecache(path);
+    if (precached) return precached;
+    const cache = await caches.open(RUNTIME_CACHE);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    const res = await fetch(request);
+    if (res.ok && res.type === 'basic') {
+        await cache.put(request, res.clone());
+        await trimRuntimeCache(cache);
+    }
+    return res;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(syncOnce());
+    self.skipWaiting();
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('fetch', (event) => {
+    const { request } = event;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (request.mode === 'navigate') {
+        if (request.cache === 'reload') {
+            // Hard reload: bypass the precache
+            if (event.resultingClientId) clientVersions.set(event.resultingClientId, NETWORK_PAGE);
+            return;
+        }
+        event.waitUntil(syncIfDue());
+        event.respondWith(navigate(event, url.pathname));
+        return;
+    }
+    if (url.pathname.startsWith('/assets/')) {
+        event.respondWith(cacheFirstAsset(request, url.pathname));
+    }
+});
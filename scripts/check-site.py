@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Post-render integrity check of dist/: internal links and canonicals.
+
+prerender.py writes thousands of routes and links them to each other with
+link()/route_path(); nothing else verifies that every emitted URL resolves to
+a route that was actually written. This walks dist/ once to index the route
+set, then scans every page in parallel (a single-pass tokenizer over the raw
+bytes for <a>, canonical/prev/next <link>, og:url and speculationrules) and
+reports:
+
+  dangling links     href / rel=prev|next / prefetch URL with no route or file
+  redirecting links  internal hrefs without the trailing slash (a 301 on Pages)
+  canonical problems missing, off-site, not a written route, no trailing slash,
+                     og:url differing from it, or pointing at a non-canonical page
+  orphan routes      self-canonical routes no other page links to (aliases such
+                     as /c/:code or legacy bare-UUID URLs are exempt by design)
+
+Usage:
+  python3 scripts/check-site.py [--dist=dist] [--workers=N] [--show=10] [--mode=warn|fail]
+
+--mode=fail exits 1 on dangling links or canonical problems; orphans and
+redirecting links only ever warn.
+"""
+
+import html
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import prerender  # noqa: E402
+
+CHECK_CHUNK_PAGES = 2000  # pages per worker task
+CHECK_SHOW = 10  # examples printed per problem; override with --show=N
+
+# The tokenizer: one left-to-right pass per page that yields only the tokens
+# carrying URLs, in the exact forms prerender.py (inject_meta, link(),
+# inject_speculation_rules) and the Vite template write them:
+#   (a href, link rel, link href, og:url, speculationrules body)
+TOKEN_RE = re.compile(
+    rb'<a\s[^>]*?href="([^"]*)"'
+    rb'|<link rel="(canonical|prev|next)" href="([^"]*)"'
+    rb'|<meta property="og:url" content="([^"]*)"'
+    rb'|<script type="speculationrules">(.*?)</script>', re.S)
+SITE_PREFIX = prerender.SITE_URL.encode('utf-8')
+
+
+def index_dist(dist):
+    """(routes, files): every '/path/' with an index.html, and every other file path."""
+    routes, files = [], set()
+    root = str(dist)
+    for dirpath, _dirnames, filenames in os.walk(root):
+        rel = dirpath[len(root):].replace(os.sep, '/')
+        for name in filenames:
+            if name == 'index.html':
+                routes.append(rel + '/' if rel else '/')
+            else:
+                files.add(f'{rel}/{name}')
+    routes.sort()
+    return routes, files
+
+
+def page_urls(data):
+    """(links, canonical, og_url) of a page; links are (kind, url) with kind a | rel | prefetch."""
+    links, canonical, og_url = [], None, None
+    for href, rel, rel_href, og, rules in TOKEN_RE.findall(data):
+        if href:
+            links.append(('a', href))
+        elif rel == b'canonical':
+            canonical = rel_href
+        elif rel:
+            links.append(('rel', rel_href))
+        elif og:
+            og_url = og
+        elif rules:
+            try:
+                rules = json.loads(rules)
+            except ValueError:
+                continue
+            for rule in rules.get('prefetch', []):
+                links.extend(('prefetch', url.encode('utf-8')) for url in rule.get('urls', []))
+    return links, canonical, og_url
+
+
+def url_path(url):
+    """Site-internal path of an href (str), or None for external / non-http links."""
+    if url.startswith(SITE_PREFIX):
+        url = url[len(SITE_PREFIX):] or b'/'
+    if not url.startswith(b'/') or url.startswith(b'//'):
+        return None
+    path = url.split(b'#', 1)[0].split(b'?', 1)[0].decode('utf-8', 'replace')
+    return html.unescape(path) if '&' in path else path
+
+
+# Per-worker route index, set once by the pool initializer
+ROUTE_INDEX = {}
+FILES = set()
+RESOLVED = {}  # url bytes -> (path, route index, redirects); sitewide links repeat on every page
+
+
+def init_worker(routes, files):
+    ROUTE_INDEX.clear()
+    ROUTE_INDEX.update((route, i) for i, route in enumerate(routes))
+    FILES.clear()
+    FILES.update(files)
+    RESOLVED.clear()
+
+
+def resolve(url):
+    """(path, route index or None, True if it only resolves via the trailing-slash redirect)."""
+    hit = RESOLVED.get(url)
+    if hit is None:
+        path = url_path(url)
+        i = ROUTE_INDEX.get(path) if path is not None else None
+        redirects = False
+        if i is None and path is not None and not path.endswith('/'):
+            i = ROUTE_INDEX.get(path + '/')
+            redirects = i is not None
+        hit = RESOLVED[url] = (path, i, redirects)
+    return hit
+
+
+def check_pages(dist, pages):
+    """Scan one chunk of pages; returns small aggregates the parent merges."""
+    linked = bytearray(len(ROUTE_INDEX))  # 1 where some other page links to the route
+    dangling = defaultdict(lambda: [0, None])  # target -> [links, first page]
+    redirecting = [0, None]
+    canonical_problems = []
+    aliases = {}  # page -> canonical path, for pages that aren't self-canonical
+    links_checked = 0
+    size = 0
+    for page in pages:
+        with open(os.path.join(dist, page.lstrip('/'), 'index.html'), 'rb') as f:
+            data = f.read()
+        size += len(data)
+        links, canonical, og_url = page_urls(data)
+        links_checked += len(links)
+        for kind, url in links:
+            path, i, redirects = resolve(url)
+            if path is None:
+                continue
+            if redirects and kind == 'a':
+                redirecting[0] += 1
+                redirecting[1] = redirecting[1] or f'{path} on {page}'
+            if i is not None:
+                if path != page:
+                    linked[i] = 1
+            elif path not in FILES:
+                entry = dangling[path]
+                entry[0] += 1
+                entry[1] = entry[1] or page
+
+        if canonical is None:
+            canonical_problems.append((page, 'no canonical'))
+            continue
+        if not canonical.startswith(SITE_PREFIX + b'/'):
+            canonical_problems.append((page, f'canonical {canonical.decode()} is not on {prerender.SITE_URL}'))
+            continue
+        target = url_path(canonical)
+        if not target.endswith('/'):
+            canonical_problems.append((page, f'canonical {target} has no trailing slash'))
+        elif target not in ROUTE_INDEX:
+            canonical_problems.append((page, f'canonical {target} is not a written route'))
+        elif target != page:
+            aliases[page] = target
+        if og_url is not None and og_url != canonical:
+            canonical_problems.append((page, f'og:url {og_url.decode()} != canonical {canonical.decode()}'))
+    return {'pages': len(pages), 'bytes': size, 'links': links_checked, 'linked': linked,
+            'dangling': dict(dangling), 'redirecting': redirecting,
+            'canonical': canonical_problems, 'aliases': aliases}
+
+
+def check_site(dist, workers=None):
+    """Index dist/, scan every page (in parallel when workers > 1) and merge the results."""
+    routes, files = index_dist(dist)
+    chunks = [routes[i:i + CHECK_CHUNK_PAGES] for i in range(0, len(routes), CHECK_CHUNK_PAGES)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(routes, files)) as pool:
+            results = list(pool.map(check_pages, [str(dist)] * len(chunks), chunks))
+    else:
+        init_worker(routes, files)
+        results = [check_pages(str(dist), chunk) for chunk in chunks]
+
+    linked = 0  # bitmask over routes, OR-ed from the chunks' byte maps
+    dangling = defaultdict(lambda: [0, None])
+    report = {'routes': len(routes), 'bytes': 0, 'links': 0, 'redirecting': [0, None],
+              'canonical': [], 'workers': min(workers, len(chunks))}
+    aliases = {}
+    for result in results:
+        report['bytes'] += result['bytes']
+        report['links'] += result['links']
+        linked |= int.from_bytes(result['linked'], 'little')
+        for target, (count, page) in result['dangling'].items():
+            dangling[target][0] += count
+            dangling[target][1] = dangling[target][1] or page
+        report['redirecting'][0] += result['redirecting'][0]
+        report['redirecting'][1] = report['redirecting'][1] or result['redirecting'][1]
+        report['canonical'] += result['canonical']
+        aliases.update(result['aliases'])
+    # A canonical must name a self-canonical page, not another alias
+    report['canonical'] += [(page, f'canonical {target} is itself canonicalised to {aliases[target]}')
+                            for page, target in aliases.items() if target in aliases]
+    report['dangling'] = sorted(dangling.items(), key=lambda item: -item[1][0])
+    linked = linked.to_bytes(len(routes), 'little')
+    report['orphans'] = [route for i, route in enumerate(routes)
+                         if not linked[i] and route != '/' and route not in aliases]
+    return report
+
+
+def print_report(report, elapsed, show):
+    print(f'Site integrity: {report["routes"]} routes, {report["bytes"] / 1024 / 1024:.1f} MB HTML, '
+          f'{report["links"]} links checked in {elapsed:.1f}s ({report["workers"]} worker(s))')
+    dangling = report['dangling']
+    print(f'  Dangling links: {len(dangling)} targets ({sum(count for _t, (count, _p) in dangling)} links)')
+    for target, (count, page) in dangling[:show]:
+        print(f'    {target}  <- {count} link(s), e.g. from {page}')
+    count, example = report['redirecting']
+    print(f'  Redirecting links (no trailing slash): {count}' + (f', e.g. {example}' if example else ''))
+    print(f'  Canonical problems: {len(report["canonical"])}')
+    for page, problem in report['canonical'][:show]:
+        print(f'    {page}: {problem}')
+    print(f'  Orphan routes (no internal links in): {len(report["orphans"])}')
+    for route in report['orphans'][:show]:
+        print(f'    {route}')
+
+
+def main():
+    dist = Path(prerender.cli_option('dist', str(prerender.DIST_DIR))).resolve()
+    if not (dist / 'index.html').exists():
+        print(f'Error: {dist} has no index.html — run `npm run build` first.')
+        sys.exit(1)
+    workers = int(prerender.cli_option('workers', os.cpu_count() or 1))
+    show = int(prerender.cli_option('show', CHECK_SHOW))
+    start = time.monotonic()
+    report = check_site(dist, workers)
+    print_report(report, time.monotonic() - start, show)
+
+    errors = len(report['dangling']) + len(report['canonical'])
+    if report['dangling']:
+        print(f'::warning::{len(report["dangling"])} internal link target(s) do not resolve to a written route')
+    if report['canonical']:
+        print(f'::warning::{len(report["canonical"])} page(s) with canonical/og:url problems')
+    if errors and prerender.cli_option('mode', 'warn') == 'fail':
+        print(f'Error: {errors} site integrity problem(s).')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+DEV-ONLY benchmark for scripts/check-site.py on a synthetic site.
+
+Writes --routes pages shaped like prerender.py's output (head tags, canonical
+and og:url, sitewide nav/footer, content links to other routes, a
+speculationrules list) into a temp dir, plants a known set of defects, then
+runs the checker and verifies it reports exactly those.
+
+Run:
+  python3 scripts/dev/bench-check-site.py [--routes=100000] [--workers=N]
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+import prerender  # noqa: E402
+
+# check-site.py isn't importable by name (dash); load it like a module
+_spec = importlib.util.spec_from_file_location('check_site', ROOT / 'scripts' / 'check-site.py')
+check_site = importlib.util.module_from_spec(_spec)
+sys.modules['check_site'] = check_site  # so pool workers can unpickle its functions
+_spec.loader.exec_module(check_site)
+
+PAGE_PADDING = 'x' * 6000  # inline CSS / JSON-LD / copy of a real page, minus the links
+
+
+def page_html(path, canonical, links, prefetch):
+    url = prerender.SITE_URL + canonical
+    nav = ''.join(prerender.link(href, 'nav') for href in ('/', '/clubs/', '/explore/'))
+    content = ''.join(f'<li>{prerender.link(href, "item")}</li>' for href in links)
+    rules = ','.join(f'"{href}"' for href in prefetch)
+    return (f'<!doctype html><html><head><title>{path}</title>'
+            f'<link rel="canonical" href="{url}" /><meta property="og:url" content="{url}" />'
+            f'<style>{PAGE_PADDING}</style></head><body><div id="root"><nav>{nav}</nav><ul>{content}</ul>'
+            f'{prerender.SITE_FOOTER_START}{prerender.link("/explore/", "Explore")}</div>'
+            f'<script type="speculationrules">{{"prefetch":[{{"source":"list","urls":[{rules}],'
+            f'"eagerness":"moderate"}}]}}</script></body></html>')
+
+
+def synth_site(dist, n, rng):
+    """Write n routes; returns the defects planted: {kind: set of pages/targets}."""
+    routes = ['/', '/clubs/', '/explore/'] + [f'/events/e-{i}/' for i in range(n - 3)]
+    orphan = routes[-1]
+    linkable = routes[:-1]
+    planted = {'dangling': {'/events/missing-1/', '/events/missing-2'}, 'orphans': {orphan},
+               'canonical': {routes[10], routes[11]}}
+    for i, path in enumerate(routes):
+        links = [rng.choice(linkable) for _ in range(20)]
+        if i < len(linkable) - 1:
+            links.append(linkable[i + 1])  # a chain so every non-orphan has a link in
+        if i == 5:
+            links.append('/events/missing-1/')
+        if i == 6:
+            links.append('/events/missing-2')
+        canonical = path if path != routes[10] else '/events/not-written/'
+        out = dist / path.strip('/') / 'index.html'
+        out.parent.mkdir(parents=True, exist_ok=True)
+        html = page_html(path, canonical, links, links[:4])
+        if path == routes[11]:
+            html = html.replace('<meta property="og:url" content="', '<meta property="og:url" content="https://example.com', 1)
+        out.write_text(html, encoding='utf-8')
+    return planted
+
+
+def main():
+    n = int(prerender.cli_option('routes', '100000'))
+    workers = int(prerender.cli_option('workers', os.cpu_count() or 1))
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(tmp)
+        start = time.monotonic()
+        planted = synth_site(dist, n, random.Random(n))
+        print(f'Synthesised {n} routes in {time.monotonic() - start:.1f}s')
+        start = time.monotonic()
+        report = check_site.check_site(dist, workers)
+        elapsed = time.monotonic() - start
+        check_site.print_report(report, elapsed, check_site.CHECK_SHOW)
+
+    found = {'dangling': {target for target, _ in report['dangling']},
+             'orphans': set(report['orphans']),
+             'canonical': {page for page, _problem in report['canonical']}}
+    for kind, expected in planted.items():
+        status = 'ok' if found[kind] == expected else f'MISMATCH (found {sorted(found[kind])[:5]})'
+        print(f'  planted {kind}: {sorted(expected)} -> {status}')
+    print(f'  {n / elapsed:,.0f} pages/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Local DEV-ONLY mock of the public api.clubin.info endpoints the build uses.
+
+Serves the clubs/events snapshot in .api-cache/ (or --snapshot=DIR) so
+prerender.py and render-server.py can be exercised without the real API —
+including entities "created after the last build" and outages:
+
+  GET  /api/clubs                 GET  /api/clubs/:id
+  GET  /api/events                GET  /api/events/:id
+  GET  /api/promoter/public/:id   GET  /api/shortlinks/:code
+  POST /api/shortlinks            {type, targetId} -> {code}
+  POST /__mock/clubs              add/replace a club   (JSON body, needs "id")
+  POST /__mock/events             add/replace an event (JSON body, needs "id")
+  POST /__mock/fail               {"status": 530} -> every /api call fails; {"status": 0} heals
+
+Run:
+  python3 scripts/dev/mock-api-server.py [--port=5175] [--snapshot=.api-cache] [--latency-ms=0]
+  CLUBIN_API_BASE=http://127.0.0.1:5175/api python3 scripts/prerender.py
+  python3 scripts/render-server.py --api-base=http://127.0.0.1:5175/api
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+MOCK_PORT = 5175
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+sys.path.insert(0, str(ROOT / 'scripts'))
+import prerender  # noqa: E402
+
+
+def load_snapshot(snapshot_dir):
+    data = {}
+    for kind in ('clubs', 'events'):
+        try:
+            data[kind] = {r['id']: r for r in prerender.load_snapshot(snapshot_dir / f'{kind}.json')}
+        except (OSError, ValueError) as e:
+            print(f'  Warning: no {kind} snapshot ({e}); starting empty')
+            data[kind] = {}
+    return data
+
+
+STATE = {'clubs': {}, 'events': {}, 'shortlinks': {}, 'fail': 0, 'latency': 0.0}
+STATE_LOCK = threading.Lock()
+
+
+def shortlink_for(kind, target_id):
+    """Deterministic 6-char code per target, like the real API hands out stable codes."""
+    code = hashlib.sha1(f'{kind}:{target_id}'.encode()).hexdigest()[:6]
+    STATE['shortlinks'][code] = (kind, target_id)
+    return code
+
+
+def promoter_public(pid):
+    promoter, events = None, []
+    for e in STATE['events'].values():
+        ref = e.get('promoterRef') or {}
+        if ref.get('id') == pid:
+            promoter = promoter or ref
+            events.append(e)
+    for c in STATE['clubs'].values():
+        for pc in c.get('promoterClubs', []):
+            if (pc.get('promoter') or {}).get('id') == pid:
+                promoter = promoter or pc['promoter']
+    return {'promoter': promoter, 'events': events} if promoter else None
+
+
+def handle_api(method, parts, body):
+    """(status, payload) for /api/<parts...>."""
+    if STATE['fail']:
+        return STATE['fail'], {'error': 'mock outage'}
+    if method == 'GET' and parts == ['clubs']:
+        return 200, list(STATE['clubs'].values())
+    if method == 'GET' and parts == ['events']:
+        return 200, list(STATE['events'].values())
+    if method == 'GET' and len(parts) == 2 and parts[0] in ('clubs', 'events'):
+        record = STATE[parts[0]].get(parts[1])
+        return (200, record) if record else (404, {'error': 'not found'})
+    if method == 'GET' and len(parts) == 3 and parts[:2] == ['promoter', 'public']:
+        result = promoter_public(parts[2])
+        return (200, result) if result else (404, {'error': 'not found'})
+    if method == 'POST' and parts == ['shortlinks']:
+        kind, target_id = body.get('type'), body.get('targetId')
+        if kind not in ('club', 'event') or target_id not in STATE[f'{kind}s']:
+            return 400, {'error': 'unknown target'}
+        return 201, {'code': shortlink_for(kind, target_id)}
+    if method == 'GET' and len(parts) == 2 and parts[0] == 'shortlinks':
+        kind, target_id = STATE['shortlinks'].get(parts[1], (None, None))
+        record = STATE[f'{kind}s'].get(target_id) if kind else None
+        if not record:
+            return 404, {'error': 'not found'}
+        return 200, {'type': kind, 'targetId': target_id, 'data': record}
+    return 404, {'error': 'no such endpoint'}
+
+
+def handle_mock(parts, body):
+    if parts in (['clubs'], ['events']) and isinstance(body, dict) and body.get('id'):
+        STATE[parts[0]][body['id']] = body
+        return 200, {'ok': True, parts[0]: len(STATE[parts[0]])}
+    if parts == ['fail']:
+        STATE['fail'] = int(body.get('status') or 0)
+        return 200, {'ok': True, 'fail': STATE['fail']}
+    return 400, {'error': 'bad mock request'}
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    def _respond(self, method):
+        path = urlsplit(self.path).path.strip('/').split('/')
+        body = {}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = {}
+        if STATE['latency']:
+            time.sleep(STATE['latency'])
+        with STATE_LOCK:
+            if path[0] == 'api':
+                status, payload = handle_api(method, path[1:], body)
+            elif path[0] == '__mock' and method == 'POST':
+                status, payload = handle_mock(path[1:], body)
+            else:
+                status, payload = 404, {'error': 'no such endpoint'}
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def log_message(self, fmt, *args):
+        print(f'  {self.command} {self.path} -> {args[1] if len(args) > 1 else ""}')
+
+
+def main():
+    port = int(prerender.cli_option('port', MOCK_PORT))
+    snapshot_dir = Path(prerender.cli_option('snapshot', str(ROOT / '.api-cache')))
+    STATE.update(load_snapshot(snapshot_dir))
+    STATE['latency'] = int(prerender.cli_option('latency-ms', '0')) / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockApiHandler)
+    print(f'Mock API on http://127.0.0.1:{port}/api — {len(STATE["clubs"])} clubs, '
+          f'{len(STATE["events"])} events from {snapshot_dir}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
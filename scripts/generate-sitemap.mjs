@@ -48,6 +48,14 @@ async function fetchJSON(url, { retries = 3, timeoutMs = 15000 } = {}) {
     return null;
 }
 
+/** Write a cache snapshot via a temp file, so readers never see it half-written. */
+function writeSnapshot(name, data) {
+    const file = path.join(CACHE_DIR, `${name}.json`);
+    fs.mkdirSync(CACHE_DIR, { recursive: true });
+    fs.writeFileSync(`${file}.tmp`, JSON.stringify(data), 'utf-8');
+    fs.renameSync(`${file}.tmp`, file);
+}
+
 /**
  * Load API data with graceful degradation:
  *   1. Try the live API (with retries).
@@ -56,17 +64,16 @@ async function fetchJSON(url, { retries = 3, timeoutMs = 15000 } = {}) {
  *   4. If nothing is available, return null (caller preserves the existing sitemap).
  */
 async function loadData(name, url) {
-    const cachePath = path.join(CACHE_DIR, `${name}.json`);
     const fresh = await fetchJSON(url);
     if (fresh !== null) {
         try {
-            fs.mkdirSync(CACHE_DIR, { recursive: true });
-            fs.writeFileSync(cachePath, JSON.stringify(fresh), 'utf-8');
+            writeSnapshot(name, fresh);
         } catch (err) {
             console.warn(`  Could not write cache for ${name}: ${err.message}`);
         }
         return fresh;
     }
+    const cachePath = path.join(CACHE_DIR, `${name}.json`);
     if (fs.existsSync(cachePath)) {
         console.warn(`  Using cached ${name} snapshot (live API unavailable): ${cachePath}`);
         try {
@@ -108,6 +115,30 @@ function slugId(name, id) {
     return slug ? `${slug}-${id}` : id;
 }
 
+// Clubs and events per city listing page; pages 2+ live at /clubs/<slug>/page/<n>/.
+// Override with the CITY_PAGE_SIZE env var — scripts/prerender.py and the SPA
+// read the same variable, and prerender.py refuses a sitemap written with
+// a different size (recorded in a comment at the top of sitemap.xml).
+const CITY_PAGE_SIZE = 50;
+
+function cityPageSize() {
+    const value = process.env.CITY_PAGE_SIZE || String(CITY_PAGE_SIZE);
+    const size = Number(value);
+    if (!Number.isInteger(size) || size < 1) {
+        console.error(`Error: CITY_PAGE_SIZE must be a whole number >= 1 (got '${value}')`);
+        process.exit(1);
+    }
+    return size;
+}
+
+/** Listing URLs of one city/sub-area landing page: page 1 plus /page/<n>/ (mirrors city_routes()). */
+function cityPageUrls(slug, nClubs, nEvents, pageSize) {
+    const pages = Math.max(1, Math.ceil(nClubs / pageSize), Math.ceil(nEvents / pageSize));
+    const locs = [`${SITE_URL}/clubs/${slug}/`];
+    for (let page = 2; page <= pages; page++) locs.push(`${SITE_URL}/clubs/${slug}/page/${page}/`);
+    return locs;
+}
+
 // High-intent sub-areas with their own landing page (mirrors src/lib/urls.ts
 // and scripts/prerender.py). Only sitemapped when real venues match.
 const SUBCITIES = [
@@ -201,15 +232,18 @@ async function generateSitemap() {
     urls.push({ loc: `${SITE_URL}/privacy/`, changefreq: 'monthly', priority: '0.3', lastmod: today });
     urls.push({ loc: `${SITE_URL}/delete-account/`, changefreq: 'monthly', priority: '0.3', lastmod: today });
 
-    // 2. City pages — use lowercase slugs matching React routes
+    // 2. City pages — use lowercase slugs matching React routes. Listings are
+    //    paginated like prerender.py does (upcoming = event day >= today, UTC),
+    //    and every /page/<n>/ is self-canonical, so each one is listed.
+    const pageSize = cityPageSize();
+    const listedEvents = events.filter(e => (e.date || '').slice(0, 10) >= today);
     for (const city of CITIES) {
         const slug = city.toLowerCase().replace(/\s+/g, '-');
-        urls.push({
-            loc: `${SITE_URL}/clubs/${slug}/`,
-            changefreq: 'daily',
-            priority: '0.8',
-            lastmod: today,
-        });
+        const nClubs = clubs.filter(c => getCitySlug(c.location || 'india') === slug).length;
+        const nEvents = listedEvents.filter(e => (e.region || e.location) && getCitySlug(e.region || e.location) === slug).length;
+        for (const loc of cityPageUrls(slug, nClubs, nEvents, pageSize)) {
+            urls.push({ loc, changefreq: 'daily', priority: loc.includes('/page/') ? '0.5' : '0.8', lastmod: today });
+        }
     }
 
     // 3. Club detail pages — use city slug, not raw location
@@ -235,7 +269,11 @@ async function generateSitemap() {
         const hasClub = clubs.some(c => locationMatches(c.location, needles));
         const hasEvent = upcomingEvents.some(e => locationMatches(e.location || e.region, needles));
         if (hasClub || hasEvent) {
-            urls.push({ loc: `${SITE_URL}/clubs/${slug}/`, changefreq: 'daily', priority: '0.8', lastmod: today });
+            const nClubs = clubs.filter(c => locationMatches(c.location, needles)).length;
+            const nEvents = listedEvents.filter(e => locationMatches(e.location || e.region, needles)).length;
+            for (const loc of cityPageUrls(slug, nClubs, nEvents, pageSize)) {
+                urls.push({ loc, changefreq: 'daily', priority: loc.includes('/page/') ? '0.5' : '0.8', lastmod: today });
+            }
         }
     }
 
@@ -261,6 +299,7 @@ async function generateSitemap() {
 
     // Build XML
     let xml = `<?xml version="1.0" encoding="UTF-8"?>\n`;
+    xml += `<!-- city-page-size: ${pageSize} -->\n`;
     xml += `<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"\n`;
     xml += `        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"\n`;
     xml += `        xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n`;
@@ -17,19 +17,43 @@ so <path>/ is the real, final URL and must be what canonical/og:url say.
 Usage:
   python3 scripts/prerender.py           # fetches from API
   python3 scripts/prerender.py --cached  # uses /tmp cached JSON files
+  python3 scripts/prerender.py --no-image-probe  # skip probing new image sizes
+  python3 scripts/prerender.py --no-critical-css  # keep the render-blocking stylesheet
+  python3 scripts/prerender.py --speculation-limit=4  # prefetch hints per page (0 = none)
+  python3 scripts/prerender.py --budgets=event=150KB,event_total=300MB,dist=400MB --budget-mode=fail  # per page / per type / artifact
+  CITY_PAGE_SIZE=30 python3 scripts/prerender.py  # clubs/events per city page (same env var as the sitemap)
+  python3 scripts/prerender.py --event-retention-days=14  # freeze events older than this
+  python3 scripts/prerender.py --search-index-budget=300KB  # per-shard warning threshold
+  python3 scripts/prerender.py --network-deadline=300 --breaker-threshold=5  # bound time lost to a degraded API
+  python3 scripts/prerender.py --cached --watch [--port=4173]  # re-render on change + serve dist/
+  python3 scripts/prerender.py --no-checkpoint  # don't resume from / write .api-cache/render-checkpoint.bin
 """
 
+import hashlib
+import importlib.util
 import json
 import os
 import re
+import socket
+import struct
 import sys
+import threading
 import time
+import traceback
+import zlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
 from urllib.request import urlopen, Request
 
-API_BASE = 'https://api.clubin.info/api'
+# CLUBIN_API_BASE points the build (or render-server.py) at another API, e.g.
+# scripts/dev/mock-api-server.py
+API_BASE = os.environ.get('CLUBIN_API_BASE', 'https://api.clubin.info/api')
 SITE_URL = 'https://clubin.co.in'
 DIST_DIR = Path(__file__).resolve().parent.parent / 'dist'
 # Last-known-good API snapshots shared with generate-sitemap.mjs. Persisted
@@ -125,33 +149,200 @@ def slug_id(name, ident):
     return f'{s}-{ident}' if s else ident
 
 
+def cli_option(name, default=None):
+    """Value of a `--name=value` command-line option, or default."""
+    prefix = f'--{name}='
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+# ─── Network budget (circuit breaker + build deadline) ────────────────────────
+#
+# Every request (API fetches, shortlink POSTs, image probes) asks network_gate()
+# first. After NETWORK_BREAKER_THRESHOLD consecutive outage-type failures
+# (connection errors, timeouts, 5xx/530 — not 4xx or a malformed body, the host
+# answered) a host's circuit opens and its remaining requests this build are
+# skipped. Each network phase of the build (API fetch, image probes, rendering
+# with its shortlink POSTs) gets its own deadline from start_network_phase(), so
+# slow probing can't eat the shortlinks' time. No request starts after it, and
+# timeouts/retry sleeps are clipped to what is left of it. So a degraded API
+# costs about K x timeout, not one timeout per club and per event. Skipped calls
+# are summarised by network_report().
+
+NETWORK_BREAKER_THRESHOLD = 5  # override with --breaker-threshold=N
+NETWORK_DEADLINE = 600  # seconds per network phase; override with --network-deadline=S
+NETWORK = {
+    'deadline': None,
+    'requests': 0,
+    'failed': 0,
+    'failures': defaultdict(int),  # host -> consecutive outage-type failures
+    'open': {},  # host -> time.monotonic() when its circuit opened
+    'skipped': defaultdict(int),  # (label, reason) -> count
+}
+NETWORK_LOCK = threading.Lock()
+
+
+def start_network_phase():
+    """Restart the network deadline clock for the build phase about to make requests."""
+    NETWORK['deadline'] = time.monotonic() + float(cli_option('network-deadline', NETWORK_DEADLINE))
+
+
+def network_remaining():
+    """Seconds left before the network deadline (the clock starts on first use)."""
+    if NETWORK['deadline'] is None:
+        start_network_phase()
+    return NETWORK['deadline'] - time.monotonic()
+
+
+def network_timeout(timeout):
+    return max(0.5, min(timeout, network_remaining()))
+
+
+def network_gate(label, url):
+    """True if a request to url may start now; otherwise counts it as skipped under label."""
+    host = urlsplit(url).netloc
+    with NETWORK_LOCK:
+        if host in NETWORK['open']:
+            reason = f'circuit open for {host}'
+        elif network_remaining() <= 0:
+            reason = 'network deadline reached'
+        else:
+            NETWORK['requests'] += 1
+            return True
+        NETWORK['skipped'][(label, reason)] += 1
+        return False
+
+
+def network_result(url, error=None):
+    """Feed a request's outcome to its host's circuit breaker."""
+    host = urlsplit(url).netloc
+    if isinstance(error, HTTPError):
+        outage = error.code >= 500
+    else:
+        # Connection failures and timeouts; a body that isn't JSON came from a live host
+        outage = isinstance(error, (URLError, socket.timeout))
+    with NETWORK_LOCK:
+        if error is not None:
+            NETWORK['failed'] += 1
+        if not outage:
+            NETWORK['failures'][host] = 0
+            return
+        NETWORK['failures'][host] += 1
+        threshold = int(cli_option('breaker-threshold', NETWORK_BREAKER_THRESHOLD))
+        if NETWORK['failures'][host] >= threshold and host not in NETWORK['open']:
+            NETWORK['open'][host] = time.monotonic()
+            print(f'::warning::{host} failed {threshold} times in a row — skipping its remaining requests this build')
+
+
+def close_cooled_circuits(cooldown):
+    """Give hosts whose circuit opened over cooldown seconds ago another chance (long-running callers)."""
+    with NETWORK_LOCK:
+        for host, opened in list(NETWORK['open'].items()):
+            if time.monotonic() - opened >= cooldown:
+                del NETWORK['open'][host]
+                NETWORK['failures'][host] = 0
+
+
+def network_report():
+    """Requests made, failed and skipped (by endpoint and reason) this build."""
+    skipped = sum(NETWORK['skipped'].values())
+    print(f'  Network: {NETWORK["requests"]} requests, {NETWORK["failed"]} failed, {skipped} skipped'
+          + (f' (circuit open: {", ".join(NETWORK["open"])})' if NETWORK['open'] else ''))
+    for (label, reason), n in sorted(NETWORK['skipped'].items(), key=lambda kv: -kv[1]):
+        print(f'    skipped {n:>6}  {label}  ({reason})')
+    if skipped:
+        print(f'::warning::{skipped} network call(s) skipped (circuit breaker / deadline) — some short link pages or image sizes are missing from this build')
+
+
+def endpoint_label(method, url):
+    """'POST /api/shortlinks' — the URL without query string, for the skipped-calls summary."""
+    return f'{method} {urlsplit(url).path}'
+
+
 def fetch_json(url, retries=3, timeout=15):
     """Fetch JSON from URL with retries. Returns None on persistent failure."""
     for attempt in range(1, retries + 1):
+        if not network_gate(endpoint_label('GET', url), url):
+            return None
         try:
             req = Request(url, headers={'User-Agent': 'Clubin-Prerender/1.0'})
-            with urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read())
+            with urlopen(req, timeout=network_timeout(timeout)) as resp:
+                data = json.loads(resp.read())
+            network_result(url)
+            return data
         except Exception as e:
+            network_result(url, e)
             print(f'  Attempt {attempt}/{retries} failed for {url}: {e}')
             if attempt < retries:
+                # Don't sleep into the deadline: the next attempt couldn't start anyway
+                if attempt * 2 >= network_remaining():
+                    break
                 time.sleep(attempt * 2)
     return None
 
 
 def post_json(url, payload):
-    """POST JSON to URL and return parsed response."""
+    """POST JSON to URL; (parsed response, None), or (None, HTTP status or None) on failure."""
+    if not network_gate(endpoint_label('POST', url), url):
+        return None, None
     try:
         data = json.dumps(payload).encode('utf-8')
         req = Request(url, data=data, headers={
             'User-Agent': 'Clubin-Prerender/1.0',
             'Content-Type': 'application/json',
         }, method='POST')
-        with urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
+        with urlopen(req, timeout=network_timeout(15)) as resp:
+            result = json.loads(resp.read())
+        network_result(url)
+        return result, None
     except Exception as e:
+        network_result(url, e)
         print(f'  Warning: POST {url} failed: {e}')
-        return None
+        return None, e.code if isinstance(e, HTTPError) else None
+
+
+SHORTLINK_CODES = {}  # (type, targetId) -> code (or None), one POST per entity per run
+# (type, targetId) the API answered with a 4xx — asking again won't help
+SHORTLINK_REFUSED = set()
+# --watch (local iteration) and render-server.py (renders one route) never POST
+SHORTLINK_POSTS = '--watch' not in sys.argv
+
+
+def shortlink_code(kind, target_id):
+    """
+    Short link code for a club/event, for pre-rendering /c/:code and /e/:code.
+    POSTed at most once per run, and only when SHORTLINK_POSTS is set.
+    """
+    key = (kind, target_id)
+    if key not in SHORTLINK_CODES:
+        code = None
+        if SHORTLINK_POSTS:
+            result, status = post_json(f'{API_BASE}/shortlinks', {'type': kind, 'targetId': target_id})
+            code = result.get('code') if result else None
+            if status and 400 <= status < 500 and status not in (408, 429):
+                SHORTLINK_REFUSED.add(key)
+        SHORTLINK_CODES[key] = code
+    return SHORTLINK_CODES[key]
+
+
+# ─── API snapshot files (.api-cache/<name>.json) ─────────────────────────────
+
+def load_snapshot(cache_path):
+    """Data of a JSON snapshot file; raises OSError/ValueError."""
+    with open(cache_path) as f:
+        return json.load(f)
+
+
+def save_snapshot(cache_path, data):
+    """Write a JSON snapshot via a temp file, so readers never see it half-written."""
+    cache_path = Path(cache_path)
+    os.makedirs(cache_path.parent, exist_ok=True)
+    tmp = cache_path.with_suffix(cache_path.suffix + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, cache_path)
 
 
 def fetch_json_cached(url, cache_path):
@@ -162,28 +353,153 @@ def fetch_json_cached(url, cache_path):
       live fetch fails + cache  -> fall back to the last cached snapshot
       otherwise                 -> None
     """
-    cache_path = str(cache_path)
-    if '--cached' in sys.argv and os.path.exists(cache_path):
-        print(f'  Using cache (--cached): {cache_path}')
-        with open(cache_path) as f:
-            return json.load(f)
+    cached = cache_path if Path(cache_path).exists() else None
+    if '--cached' in sys.argv and cached:
+        try:
+            data = load_snapshot(cache_path)
+            print(f'  Using cache (--cached): {cached}')
+            return data
+        except (OSError, ValueError) as e:
+            print(f'  Warning: unreadable cache {cached}: {e}')
     data = fetch_json(url)
     if data is not None:
         try:
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, 'w') as f:
-                json.dump(data, f)
+            save_snapshot(cache_path, data)
         except OSError as e:
             print(f'  Warning: could not write cache {cache_path}: {e}')
         return data
-    if os.path.exists(cache_path):
-        print(f'  Using cached snapshot (live API unavailable): {cache_path}')
-        with open(cache_path) as f:
-            return json.load(f)
+    if cached:
+        try:
+            data = load_snapshot(cache_path)
+            print(f'  Using cached snapshot (live API unavailable): {cached}')
+            return data
+        except (OSError, ValueError) as e:
+            print(f'  Warning: unreadable cache {cached}: {e}')
     print(f'  No data available for {url} (live API down, no cache).')
     return None
 
 
+# ─── Image dimensions (width/height attrs, og:image size, LCP preload) ───────
+
+# Probed sizes keyed by image URL. Lives next to the API snapshot so
+# actions/cache carries it across runs — each image is only probed once.
+IMAGE_DIMS_CACHE = CACHE_DIR / 'image-dims.json'
+IMAGE_PROBE_WORKERS = 16
+# Enough for PNG/GIF/WebP headers and a JPEG SOF behind typical EXIF blocks.
+IMAGE_PROBE_BYTES = 64 * 1024
+
+
+def parse_image_size(data):
+    """(width, height) from the leading bytes of a PNG/GIF/WebP/JPEG, else None."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            w, h = struct.unpack('<HH', data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b'VP8L':
+            b = data[21:25]
+            w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+            h = 1 + (((b[3] & 0xF) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+            return w, h
+        if chunk == b'VP8X':
+            w = 1 + int.from_bytes(data[24:27], 'little')
+            h = 1 + int.from_bytes(data[27:30], 'little')
+            return w, h
+        return None
+    if data[:2] == b'\xff\xd8':
+        i = 2
+        while i + 9 <= len(data):
+            if data[i] != 0xFF:
+                return None
+            marker = data[i + 1]
+            if marker == 0xFF:  # fill byte
+                i += 1
+                continue
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                i += 2
+                continue
+            seg_len = struct.unpack('>H', data[i + 2:i + 4])[0]
+            # SOF0..SOF15 (minus DHT/JPG/DAC) carry the frame size
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                h, w = struct.unpack('>HH', data[i + 5:i + 9])
+                return w, h
+            i += 2 + seg_len
+    return None
+
+
+def probe_image_size(url, timeout=10):
+    """Read only the header bytes of an image (HTTP Range) and return its size, or None."""
+    if not network_gate(f'image probe {urlsplit(url).netloc}', url):
+        return None
+    try:
+        req = Request(url, headers={
+            'User-Agent': 'Clubin-Prerender/1.0',
+            'Range': f'bytes=0-{IMAGE_PROBE_BYTES - 1}',
+        })
+        with urlopen(req, timeout=network_timeout(timeout)) as resp:
+            data = b''
+            # Servers that ignore Range send the whole file — stop reading as
+            # soon as the header parses instead of downloading it.
+            while len(data) < IMAGE_PROBE_BYTES:
+                chunk = resp.read(4096)
+                if not chunk:
+                    break
+                data += chunk
+                size = parse_image_size(data)
+                if size:
+                    break
+        network_result(url)
+        return parse_image_size(data)
+    except Exception as e:
+        network_result(url, e)
+        print(f'  Warning: image probe failed for {url}: {e}')
+        return None
+
+
+def probe_image_dims(urls, cache_path=IMAGE_DIMS_CACHE, workers=IMAGE_PROBE_WORKERS):
+    """
+    {url: (width, height)} for every probe-able URL. Cached sizes are reused;
+    new URLs are probed concurrently and added to the cache. Failures are not
+    cached, so a flaky CDN gets another chance on the next build.
+    """
+    dims = {}
+    try:
+        with open(cache_path) as f:
+            dims = {u: tuple(wh) for u, wh in json.load(f).items()}
+    except (OSError, ValueError):
+        pass
+    todo = sorted({u for u in urls if u and u.startswith(('http://', 'https://'))} - dims.keys())
+    if '--no-image-probe' in sys.argv:
+        todo = []
+    if todo:
+        print(f'  Probing {len(todo)} new image(s) for dimensions ({len(dims)} cached)...')
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for url, size in zip(todo, pool.map(probe_image_size, todo)):
+                if size and size[0] and size[1]:
+                    dims[url] = tuple(size)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump(dims, f)
+        except OSError as e:
+            print(f'  Warning: could not write cache {cache_path}: {e}')
+    return dims
+
+
+def img_size_attrs(size):
+    """` width="W" height="H"` for an <img>, or '' when the size is unknown."""
+    return f' width="{size[0]}" height="{size[1]}"' if size else ''
+
+
+# The untouched Vite shell, kept because dist/index.html is overwritten with the
+# rendered home page (render-server.py needs the shell after the build)
+TEMPLATE_SNAPSHOT = CACHE_DIR / 'index.template.html'
+
+
 def read_template():
     """Read the built index.html as template."""
     index_path = DIST_DIR / 'index.html'
@@ -193,17 +509,29 @@ def read_template():
     return index_path.read_text(encoding='utf-8')
 
 
+def save_template_snapshot(template):
+    try:
+        os.makedirs(os.path.dirname(TEMPLATE_SNAPSHOT), exist_ok=True)
+        TEMPLATE_SNAPSHOT.write_text(template, encoding='utf-8')
+    except OSError as e:
+        print(f'  Warning: could not write {TEMPLATE_SNAPSHOT}: {e}')
+
+
 def esc(s):
     """Escape HTML entities for attribute values and text."""
     return str(s).replace('&', '&amp;').replace('"', '&quot;').replace('<', '&lt;').replace('>', '&gt;')
 
 
-def inject_meta(html, title, description, image=None, url=None, structured_data=None):
+def inject_meta(html, title, description, image=None, url=None, structured_data=None,
+                image_size=None, preload_image=None, prev_url=None, next_url=None):
     """
     Replace default meta tags in the HTML template with page-specific ones.
     Supports structured_data as a single dict or a list of dicts.
     Also swaps the home page's full JSON-LD @graph for a slim Organization
     + WebSite graph (FAQPage/WebPage markup only belongs on the home page).
+    image_size is the probed (width, height) of a custom og:image;
+    preload_image adds a high-priority preload for the page's hero (LCP) image.
+    prev_url/next_url add rel=prev/next for paginated listings.
     """
     # Replace <title>
     html = re.sub(r'<title>[^<]*</title>', f'<title>{esc(title)}</title>', html, count=1)
@@ -222,8 +550,12 @@ def inject_meta(html, title, description, image=None, url=None, structured_data=
         html = re.sub(r'<meta property="og:url" content="[^"]*"\s*/?>', f'<meta property="og:url" content="{esc(url)}" />', html, count=1)
     if image:
         html = re.sub(r'<meta property="og:image"\s+content="[^"]*"\s*/?>', f'<meta property="og:image" content="{esc(image)}" />', html, count=1)
-        # Remove default og:image dimensions when using a custom image (crawlers auto-detect)
-        if image != OG_IMAGE:
+        # Custom image: use its probed dimensions, or drop the default logo's
+        # (crawlers auto-detect) rather than advertise the wrong size
+        if image != OG_IMAGE and image_size:
+            html = re.sub(r'<meta property="og:image:width"\s+content="[^"]*"\s*/?>', f'<meta property="og:image:width" content="{image_size[0]}" />', html, count=1)
+            html = re.sub(r'<meta property="og:image:height"\s+content="[^"]*"\s*/?>', f'<meta property="og:image:height" content="{image_size[1]}" />', html, count=1)
+        elif image != OG_IMAGE:
             html = re.sub(r'\s*<meta property="og:image:width"\s+content="[^"]*"\s*/?>', '', html, count=1)
             html = re.sub(r'\s*<meta property="og:image:height"\s+content="[^"]*"\s*/?>', '', html, count=1)
 
@@ -239,6 +571,21 @@ def inject_meta(html, title, description, image=None, url=None, structured_data=
     if url:
         html = re.sub(r'<link rel="canonical" href="[^"]*"\s*/?>', f'<link rel="canonical" href="{esc(url)}" />', html, count=1)
 
+    # Pagination hints next to the canonical
+    rel_links = ''.join(
+        f'\n  <link rel="{rel}" href="{esc(href)}" />' for rel, href in (('prev', prev_url), ('next', next_url)) if href
+    )
+    if rel_links:
+        html = re.sub(r'(<link rel="canonical" href="[^"]*"\s*/?>)', lambda m: m.group(1) + rel_links, html, count=1)
+
+    # Hero image preload, early in <head> so it is fetched before the poster/logo preloads
+    if preload_image:
+        html = re.sub(
+            r'(<link rel="canonical" href="[^"]*"\s*/?>)',
+            lambda m: m.group(1) + f'\n  <link rel="preload" as="image" href="{esc(preload_image)}" fetchpriority="high" />',
+            html, count=1
+        )
+
     # Swap the home page's full @graph for the slim sitewide graph
     html = re.sub(
         r'<script type="application/ld\+json">.*?</script>',
@@ -287,6 +634,9 @@ def route_path(path):
     return path if path.endswith('/') else path + '/'
 
 
+SITE_FOOTER_START = '<h2>Explore Clubin</h2>'
+
+
 def body_wrap(inner, city_slugs_with_clubs=None):
     """Wrap page content with sitewide nav + footer links (real crawlable <a> tags)."""
     nav = (
@@ -301,17 +651,51 @@ def body_wrap(inner, city_slugs_with_clubs=None):
         link(f'/clubs/{c.lower().replace(" ", "-")}/', f'Nightclubs in {c}') for c in CITIES
     )
     footer = (
-        '<h2>Explore Clubin</h2>'
-        f'<p>{city_links}</p>'
+        SITE_FOOTER_START
+        + f'<p>{city_links}</p>'
         f'<p class="muted">{link("/explore/", "Explore all clubs & events")} &middot; {link("/support/", "Support")} &middot; {link("/terms/", "Terms of Service")} &middot; {link("/privacy/", "Privacy Policy")} &middot; '
         f'{link("/list-your-club/", "Partner with Clubin")}</p>'
     )
     return SEO_STYLE + f'<div class="seo-static"><div class="wrap">{nav}{inner}{footer}</div></div>'
 
 
-def inject_body(html, body_html):
-    """Inject static content inside #root — React replaces it on mount."""
-    return re.sub(r'<div id="root">\s*</div>', f'<div id="root">{body_html}</div>', html, count=1)
+# Fields the detail pages render; the rest of the API record stays out of the payload.
+CLUB_PAYLOAD_FIELDS = ('id', 'name', 'location', 'address', 'description', 'imageUrl', 'venueImages',
+                       'mapUrl', 'instagramUrl', 'promoterClubs', 'createdAt', 'updatedAt')
+CLUB_EVENT_PAYLOAD_FIELDS = ('id', 'title', 'date', 'startTime', 'imageUrl', 'price', 'guestlistStatus')
+EVENT_PAYLOAD_FIELDS = ('id', 'title', 'club', 'clubId', 'location', 'region', 'description', 'rules', 'genre',
+                        'imageUrl', 'bannerUrl', 'videoUrl', 'price', 'priceLabel', 'stagPrice', 'couplePrice',
+                        'ladiesPrice', 'date', 'startTime', 'endTime', 'guestlistStatus', 'spotsRemaining',
+                        'clubRef', 'promoterRef')
+ROUTE_DATA_VERSION = 1
+
+
+def pick_fields(record, fields):
+    return {k: record[k] for k in fields if k in record}
+
+
+def route_data_json(payload):
+    """
+    JSON for an inline <script type="application/json">. <, >, & and the JS line
+    separators are unicode-escaped so no string value can close the script tag.
+    """
+    return (json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+            .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+            .replace('\u2028', '\\u2028').replace('\u2029', '\\u2029'))
+
+
+def inject_body(html, body_html, route_data=None):
+    """
+    Inject static content inside #root — React replaces it on mount.
+    route_data (the entity the page was rendered from) is embedded right after
+    #root as #route-data so the detail page can hydrate without refetching
+    (see src/lib/routeData.ts).
+    """
+    data_tag = ''
+    if route_data is not None:
+        payload = dict(route_data, v=ROUTE_DATA_VERSION)
+        data_tag = f'<script type="application/json" id="route-data">{route_data_json(payload)}</script>'
+    return re.sub(r'<div id="root">\s*</div>', lambda m: f'<div id="root">{body_html}</div>{data_tag}', html, count=1)
 
 
 def write_route(route_path_str, html):
@@ -321,11 +705,17 @@ def write_route(route_path_str, html):
         return  # Root is written separately via write_home
     out_dir = DIST_DIR / clean
     out_dir.mkdir(parents=True, exist_ok=True)
+    html = inline_critical_css(html, route_type(route_path_str))
+    html = inject_speculation_rules(html, route_path_str)
     (out_dir / 'index.html').write_text(html, encoding='utf-8')
+    ROUTE_SIZES[route_path(route_path_str)] = len(html.encode('utf-8'))
 
 
 def write_home(html):
+    html = inline_critical_css(html, 'home')
+    html = inject_speculation_rules(html, '/')
     (DIST_DIR / 'index.html').write_text(html, encoding='utf-8')
+    ROUTE_SIZES['/'] = len(html.encode('utf-8'))
 
 
 # ─── Data helpers ─────────────────────────────────────────────────────────────
@@ -455,55 +845,781 @@ def faq_schema(qa_pairs):
     }
 
 
-def render_city_page(template, clubs_url, slug, display, city_clubs, city_events):
-    """Write a /clubs/<slug>/ landing page. Shared by curated cities and sub-areas."""
-    city_url = page_url(f'/clubs/{slug}')
+# Clubs and events per city listing page; pages 2+ live at /clubs/<slug>/page/<n>/.
+# Override with the CITY_PAGE_SIZE env var, which generate-sitemap.mjs and the
+# SPA (vite.config.ts) read too, so all three always paginate alike.
+CITY_PAGE_SIZE = 50
+SITEMAP_PAGE_SIZE_RE = re.compile(r'<!-- city-page-size: (\d+) -->')
+
+
+def city_page_size():
+    """$CITY_PAGE_SIZE (default CITY_PAGE_SIZE); exits with an error unless it is a whole number >= 1."""
+    value = os.environ.get('CITY_PAGE_SIZE') or str(CITY_PAGE_SIZE)
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        print(f'Error: CITY_PAGE_SIZE must be a whole number >= 1 (got {value!r}).')
+        sys.exit(1)
+    return size
+
+
+def check_sitemap_page_size():
+    """Exit with an error when dist/sitemap.xml was paginated with a different page size.
+
+    The sitemap lists every /clubs/<slug>/page/<n>/ as self-canonical, so a
+    mismatch would publish pages that were never rendered (or miss real ones).
+    """
+    try:
+        match = SITEMAP_PAGE_SIZE_RE.search((DIST_DIR / 'sitemap.xml').read_text(encoding='utf-8'))
+    except OSError:
+        return
+    if match and int(match.group(1)) != city_page_size():
+        print(f'Error: dist/sitemap.xml was generated with CITY_PAGE_SIZE={match.group(1)} '
+              f'but prerender is using {city_page_size()}. Re-run the build with one value.')
+        sys.exit(1)
+
+
+def city_page_path(slug, page):
+    return f'/clubs/{slug}' if page == 1 else f'/clubs/{slug}/page/{page}'
+
+
+def pagination_html(slug, page, n_pages):
+    """Crawlable prev / page numbers / next links for a paginated city listing."""
+    if n_pages <= 1:
+        return ''
+    parts = []
+    if page > 1:
+        parts.append(link(route_path(city_page_path(slug, page - 1)), '« Previous'))
+    for n in range(1, n_pages + 1):
+        parts.append(f'<strong>{n}</strong>' if n == page else link(route_path(city_page_path(slug, n)), str(n)))
+    if page < n_pages:
+        parts.append(link(route_path(city_page_path(slug, page + 1)), 'Next »'))
+    return f'<p>{" &middot; ".join(parts)}</p>'
+
+
+def city_routes(template, slug, display, city_clubs, city_events, page_size=CITY_PAGE_SIZE):
+    """
+    The /clubs/<slug>/ landing page plus /clubs/<slug>/page/<n>/ for the rest
+    of its clubs and events, page_size of each per page, as [(path, html)].
+    Shared by curated cities and sub-areas.
+    Every page is self-canonical with rel=prev/next; the FAQ (visible and
+    JSON-LD) and the CollectionPage/Breadcrumb markup stay on page 1.
+    """
+    clubs_url = page_url('/clubs')
     club_names = [c['name'] for c in city_clubs]
-    if club_names:
-        description = (f'Discover the best nightclubs in {display}: {", ".join(club_names[:4])} & more. '
-                       f'Book free guestlist entry, party tickets and VIP tables on Clubin.')[:160]
+    city_events = sorted(city_events, key=event_date_str)
+    routes = []
+    n_pages = max(1, -(-len(city_clubs) // page_size), -(-len(city_events) // page_size))
+    for page in range(1, n_pages + 1):
+        path = city_page_path(slug, page)
+        city_url = page_url(path)
+        lo, hi = (page - 1) * page_size, page * page_size
+        page_clubs, page_events = city_clubs[lo:hi], city_events[lo:hi]
+        featured = [c['name'] for c in page_clubs[:4]] or club_names[:4]
+        if featured:
+            description = (f'Discover the best nightclubs in {display}: {", ".join(featured)} & more. '
+                           f'Book free guestlist entry, party tickets and VIP tables on Clubin.')[:160]
+        else:
+            description = f'Discover the hottest nightclubs and party venues in {display}. Book guestlists and get VIP table reservations on Clubin.'
+        page_suffix = f' (Page {page} of {n_pages})' if page > 1 else ''
+        qa = city_faq(display, club_names) if page == 1 else []
+        city_body = body_wrap(
+            f'<h1>Best Nightclubs in {esc(display)}{esc(page_suffix)}</h1>'
+            f'<p>Looking for the best nightlife in {esc(display)}? Browse top nightclubs and party venues, '
+            f'check upcoming events, and book free guestlist entry or VIP tables on Clubin.</p>'
+            + club_list_html(page_clubs, heading=f'Nightclubs in {display}')
+            + event_list_html(page_events, heading=f'Upcoming Parties &amp; Events in {display}')
+            + pagination_html(slug, page, n_pages)
+            + faq_html(qa)
+        )
+        structured = None
+        if page == 1:
+            structured = [
+                {'@context': 'https://schema.org', '@type': 'CollectionPage', 'name': f'Best Nightclubs in {display}', 'url': city_url},
+                {'@context': 'https://schema.org', '@type': 'BreadcrumbList', 'itemListElement': [
+                    {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
+                    {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
+                    {'@type': 'ListItem', 'position': 3, 'name': display},
+                ]},
+            ]
+            if qa:
+                structured.append(faq_schema(qa))
+        html = inject_meta(template,
+            title=f'Best Nightclubs in {display}{page_suffix} - Guestlist, Events & VIP Tables | Clubin',
+            description=description,
+            url=city_url,
+            structured_data=structured,
+            prev_url=page_url(city_page_path(slug, page - 1)) if page > 1 else None,
+            next_url=page_url(city_page_path(slug, page + 1)) if page < n_pages else None,
+        )
+        routes.append((path, inject_body(html, city_body)))
+    return routes
+
+
+# ─── Past-event archive ───────────────────────────────────────────────────────
+#
+# Events that ended more than EVENT_RETENTION_DAYS ago are rendered once into a
+# minimal "event ended" page and frozen in .api-cache/event-archive.json (carried
+# across CI runs by actions/cache). Later builds only re-apply the frozen meta +
+# body to the current template — no data lookups, no shortlink POSTs — so build
+# work scales with live events, and old URLs keep serving 200 even after the
+# API stops returning the event.
+
+EVENT_ARCHIVE = CACHE_DIR / 'event-archive.json'
+EVENT_RETENTION_DAYS = 30
+EVENT_ARCHIVE_VERSION = 1
+
+
+def is_archivable(event, retention_days):
+    d = event_date_str(event)
+    if not d:
+        return False
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+    return d < cutoff
+
+
+def load_event_archive():
+    """{event_id: frozen page record}; empty when missing, unreadable or from an older format."""
+    try:
+        with open(EVENT_ARCHIVE) as f:
+            data = json.load(f)
+        if data.get('version') == EVENT_ARCHIVE_VERSION:
+            return data['events']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_event_archive(archive):
+    try:
+        os.makedirs(os.path.dirname(EVENT_ARCHIVE), exist_ok=True)
+        with open(EVENT_ARCHIVE, 'w') as f:
+            json.dump({'version': EVENT_ARCHIVE_VERSION, 'events': archive}, f)
+    except OSError as e:
+        print(f'  Warning: could not write {EVENT_ARCHIVE}: {e}')
+
+
+def archive_event(event, club):
+    """Render the frozen "event ended" record for a past event (one shortlink POST, once)."""
+    date_str = event_date_str(event)
+    nice_date = fmt_date(date_str)
+    event_seg = slug_id(event['title'], event['id'])
+    event_url = page_url(f'/events/{event_seg}')
+    city_slug = event_city_slug(event)
+    city = city_name_from_slug(city_slug) if city_slug else ''
+    venue = event.get('club', '')
+    if club:
+        club_path = route_path('/clubs/' + get_city_slug(club.get('location', 'india')) + '/' + slug_id(club['name'], club['id']))
+        venue_html = f'<p>Venue: {link(club_path, club["name"])}</p>'
     else:
-        description = f'Discover the hottest nightclubs and party venues in {display}. Book guestlists and get VIP table reservations on Clubin.'
-    qa = city_faq(display, club_names)
-    city_body = body_wrap(
-        f'<h1>Best Nightclubs in {esc(display)}</h1>'
-        f'<p>Looking for the best nightlife in {esc(display)}? Browse top nightclubs and party venues, '
-        f'check upcoming events, and book free guestlist entry or VIP tables on Clubin.</p>'
-        + club_list_html(city_clubs, heading=f'Nightclubs in {display}')
-        + event_list_html(city_events, heading=f'Upcoming Parties &amp; Events in {display}')
-        + faq_html(qa)
+        venue_html = f'<p>Venue: {esc(venue)}</p>' if venue else ''
+    more = link(f'/clubs/{city_slug}/', f'Upcoming parties in {city}') if city_slug else link('/explore/', 'Upcoming parties on Clubin')
+    inner = (
+        (f'<p class="muted">{link("/clubs/", "Clubs")} / {link(f"/clubs/{city_slug}/", city)}</p>' if city_slug else '')
+        + f'<h1>{esc(event["title"])}</h1>'
+        + f'<p class="muted">{esc(nice_date)} · {esc(venue)}, {esc(event.get("location", ""))}</p>'
+        + '<p><strong>This event has ended.</strong> Bookings are closed.</p>'
+        + venue_html
+        + f'<p>{more}</p>'
     )
-    structured = [
-        {'@context': 'https://schema.org', '@type': 'CollectionPage', 'name': f'Best Nightclubs in {display}', 'url': city_url},
-        {'@context': 'https://schema.org', '@type': 'BreadcrumbList', 'itemListElement': [
+    routes = [f'/events/{event_seg}']
+    if event_seg != event['id']:
+        routes.append(f'/events/{event["id"]}')
+    code = shortlink_code('event', event['id'])
+    if code:
+        routes.append(f'/e/{code}')
+    return {
+        'date': date_str,
+        'routes': routes,
+        'title': f'{event["title"]} at {venue} - {nice_date} (Ended) | Clubin',
+        'description': f'{event["title"]} at {venue}, {event.get("location", "")} took place on {nice_date}. Find upcoming parties and guestlists on Clubin.',
+        'url': event_url,
+        'breadcrumbs': [
             {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
-            {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
-            {'@type': 'ListItem', 'position': 3, 'name': display},
-        ]},
-    ]
-    if qa:
-        structured.append(faq_schema(qa))
+            {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': page_url('/clubs')},
+            *([{'@type': 'ListItem', 'position': 3, 'name': city, 'item': page_url(f'/clubs/{city_slug}')}] if city_slug else []),
+            {'@type': 'ListItem', 'position': 4 if city_slug else 3, 'name': event['title']},
+        ],
+        'inner': inner,
+    }
+
+
+def archived_event_routes(template, record):
+    """Apply a frozen record to the current template: [(path, html)] for all its routes."""
     html = inject_meta(template,
-        title=f'Best Nightclubs in {display} - Guestlist, Events & VIP Tables | Clubin',
-        description=description,
-        url=city_url,
-        structured_data=structured,
+        title=record['title'],
+        description=record['description'],
+        url=record['url'],
+        structured_data={'@context': 'https://schema.org', '@type': 'BreadcrumbList', 'itemListElement': record['breadcrumbs']},
     )
-    write_route(f'/clubs/{slug}', inject_body(html, city_body))
+    html = inject_body(html, body_wrap(record['inner']))
+    return [(path, html) for path in record['routes']]
 
 
-# ─── Main ─────────────────────────────────────────────────────────────────────
+def update_event_archive(site, archive, retention_days):
+    """
+    Freeze events past the retention window into archive (in place) and set
+    site['archive'] / site['live_events']. Returns the number newly frozen.
 
-def main():
-    print('Pre-rendering pages for GitHub Pages SEO...')
-    template = read_template()
+    Records frozen without an /e/:code route (the short link POST failed or was
+    skipped) ask for a code again on every run until they get one, unless the
+    API refused the event with a 4xx (e.g. it was deleted) — that is recorded
+    as 'shortlinkRefused' and never asked again.
+    """
+    live_events = []
+    newly_archived = 0
+    for event in site['events']:
+        if not is_archivable(event, retention_days):
+            archive.pop(event['id'], None)  # rescheduled into the live window
+            live_events.append(event)
+        elif event['id'] not in archive:
+            archive[event['id']] = archive_event(event, site['club_by_id'].get(event.get('clubId') or ''))
+            newly_archived += 1
+    for event_id, record in archive.items():
+        if record.get('shortlinkRefused') or any(path.startswith('/e/') for path in record['routes']):
+            continue
+        code = shortlink_code('event', event_id)
+        if code:
+            record['routes'].append(f'/e/{code}')
+        elif ('event', event_id) in SHORTLINK_REFUSED:
+            record['shortlinkRefused'] = True
+    site['archive'] = archive
+    site['live_events'] = live_events
+    return newly_archived
+
+
+# ─── Critical CSS (first paint without the Vite stylesheet) ──────────────────
+#
+# The static #root content only needs SEO_STYLE plus whatever base rules of the
+# Vite bundle hit its elements (html/body, preflight resets, .muted, ...). Each
+# route type gets that subset inlined, and the bundle link is switched to the
+# same media="print" onload swap index.html already uses for Google Fonts, so
+# it no longer blocks first paint. src/main.tsx holds the React mount (which
+# replaces the static markup) until that stylesheet has loaded.
+
+STYLESHEET_LINK_RE = re.compile(r'<link rel="stylesheet"[^>]*?href="(/assets/[^"]+\.css)"[^>]*>')
+# Nested at-rules whose children are filtered; other block at-rules are
+# dropped (@font-face/@keyframes) or kept whole (@property, @layer order).
+CSS_GROUP_RULES = ('@media', '@supports', '@layer', '@container')
+CSS_KEEP_RULES = ('@property', '@charset', '@import', '@namespace')
+
+# route type -> {'tokens': set, 'css': str}; 'bundle' -> (href, css text)
+CRITICAL_CSS = {}
+CRITICAL_CSS_LOCK = threading.Lock()  # render-server.py renders from several threads
+
+
+def route_type(path):
+    """Route family for per-type stages: home, city, club, event, promoter or static."""
+    parts = path.strip('/').split('/')
+    if parts == ['']:
+        return 'home'
+    if parts[0] == 'clubs' and len(parts) == 2 or parts[0] == 'clubs' and len(parts) >= 3 and parts[2] == 'page':
+        return 'city'
+    if parts[0] == 'clubs' and len(parts) >= 3 or parts[0] == 'c':
+        return 'club'
+    if parts[0] in ('events', 'e'):
+        return 'event'
+    if parts[0] == 'promoters':
+        return 'promoter'
+    return 'static'
+
+
+def split_css_blocks(css):
+    """Top-level (prelude, body) pairs of a stylesheet; body is None for `@x ...;` statements."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        start = i
+        quote = None
+        while i < n and (quote or css[i] not in '{;'):
+            if css[i] == '\\':
+                i += 1
+            elif quote:
+                if css[i] == quote:
+                    quote = None
+            elif css[i] in '"\'':
+                quote = css[i]
+            i += 1
+        prelude = css[start:i].strip()
+        if i >= n:
+            break
+        if css[i] == ';':
+            if prelude:
+                blocks.append((prelude, None))
+            i += 1
+            continue
+        depth, i, body_start, quote = 1, i + 1, i + 1, None
+        while i < n and depth:
+            c = css[i]
+            if c == '\\':
+                i += 1
+            elif quote:
+                if c == quote:
+                    quote = None
+            elif c in '"\'':
+                quote = c
+            elif c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+            i += 1
+        blocks.append((prelude, css[body_start:i - 1]))
+    return blocks
+
+
+def page_tokens(html):
+    """Tags, .classes and #ids present in the page body (what the static markup can match)."""
+    body = html.split('<body', 1)[-1]
+    tokens = {'html', 'body'}
+    tokens.update(t.lower() for t in re.findall(r'<([a-zA-Z][a-zA-Z0-9-]*)', body))
+    for classes in re.findall(r'\bclass="([^"]*)"', body):
+        tokens.update('.' + c for c in classes.split())
+    tokens.update('#' + i for i in re.findall(r'\bid="([^"]*)"', body))
+    return tokens
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas (not the ones inside :is(...)/:not(...))."""
+    parts, depth, start = [], 0, 0
+    escaped = False
+    for i, c in enumerate(prelude):
+        if escaped:
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return [p for p in parts if p]
+
+
+def selector_matches(selector, tokens):
+    """True when every tag/class/id a selector names exists on the page (conservative match)."""
+    # Drop functional pseudos (:not(.x), :is(...), :where(...)) and attribute
+    # selectors; what remains must all be present for the rule to apply. An
+    # escaped colon is part of a class name (Tailwind's .md\:flex), not a pseudo.
+    sel = re.sub(r'(?<!\\):{1,2}[a-zA-Z-]+\([^)]*\)', '', selector)
+    sel = re.sub(r'\[[^\]]*\]', '', sel)
+    sel = re.sub(r'(?<!\\):{1,2}[a-zA-Z-]+', '', sel)
+    for tok in re.findall(r'[.#]?(?:\\.|[a-zA-Z0-9_-])+', sel):
+        tok = tok.replace('\\', '')
+        if tok[0] in '.#':
+            if tok not in tokens:
+                return False
+        elif not tok[0].isdigit() and tok.lower() not in tokens:
+            return False
+    return True
+
+
+def prune_css(css, tokens):
+    """Subset of a stylesheet whose selectors can match the given page tokens."""
+    out = []
+    for prelude, body in split_css_blocks(css):
+        if body is None:
+            if prelude.startswith(('@layer', '@charset', '@import', '@namespace')):
+                out.append(prelude + ';')
+            continue
+        if prelude.startswith(CSS_GROUP_RULES):
+            inner = prune_css(body, tokens)
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+            continue
+        if prelude.startswith(CSS_KEEP_RULES):
+            out.append(f'{prelude}{{{body}}}')
+            continue
+        if prelude.startswith('@'):
+            continue
+        kept = [s for s in split_selectors(prelude) if selector_matches(s, tokens)]
+        if kept:
+            out.append(f'{",".join(kept)}{{{body}}}')
+    return ''.join(out)
+
+
+def load_main_stylesheet(html):
+    """(href, css) of the Vite bundle linked from the template, cached for the run."""
+    if 'bundle' not in CRITICAL_CSS:
+        m = STYLESHEET_LINK_RE.search(html)
+        css_path = DIST_DIR / m.group(1).lstrip('/') if m else None
+        if css_path and css_path.exists():
+            CRITICAL_CSS['bundle'] = (m.group(1), css_path.read_text(encoding='utf-8'))
+        else:
+            CRITICAL_CSS['bundle'] = (None, '')
+    return CRITICAL_CSS['bundle']
+
+
+def inline_critical_css(html, kind):
+    """Inline the route type's critical CSS and make the main stylesheet non-blocking."""
+    if '--no-critical-css' in sys.argv:
+        return html
+    m = STYLESHEET_LINK_RE.search(html)
+    if not m:
+        return html  # already rewritten (same HTML written to several routes)
+    tokens = page_tokens(html)
+    with CRITICAL_CSS_LOCK:
+        href, bundle = load_main_stylesheet(html)
+        if not bundle:
+            return html
+        entry = CRITICAL_CSS.get(kind)
+        # Computed once per route type; only re-pruned if a page uses markup the
+        # type's first page didn't (e.g. an event with an image after one without)
+        if entry is None or not tokens <= entry['tokens']:
+            pages = entry['pages'] if entry else 0
+            tokens = tokens | (entry['tokens'] if entry else set())
+            entry = CRITICAL_CSS[kind] = {'tokens': tokens, 'css': prune_css(bundle, tokens), 'pages': pages}
+        entry['pages'] += 1
+        css = entry['css']
+    deferred = (
+        f'<style>{css}</style>\n'
+        f'  <link rel="stylesheet" crossorigin href="{href}" media="print" onload="this.media=\'all\'" />\n'
+        f'  <noscript><link rel="stylesheet" crossorigin href="{href}" /></noscript>'
+    )
+    return html[:m.start()] + deferred + html[m.end():]
+
+
+def critical_css_report():
+    """Per route type: inlined critical CSS vs. the render-blocking bundle it replaces."""
+    _href, bundle = CRITICAL_CSS.get('bundle', (None, ''))
+    kinds = [k for k in CRITICAL_CSS if k != 'bundle']
+    if not bundle or not kinds:
+        return
+    bundle_bytes = len(bundle.encode('utf-8'))
+    print(f'  Critical CSS (render-blocking bundle was {bundle_bytes / 1024:.1f} KB):')
+    for kind in sorted(kinds):
+        entry = CRITICAL_CSS[kind]
+        inline_bytes = len(entry['css'].encode('utf-8'))
+        print(f'    {kind:<9} {entry["pages"]:>6} pages  inline {inline_bytes / 1024:6.1f} KB  '
+              f'first-paint CSS saved {(bundle_bytes - inline_bytes) / 1024:6.1f} KB/page')
+
+
+# ─── Speculation rules (next-route prefetch hints) ────────────────────────────
+#
+# A page's edges in the internal link graph are the links it emits between the
+# sitewide nav and footer that body_wrap puts on every page. They are ranked in
+# the order the page presents them (listings are already in the order the UI
+# sorts them), with detail pages ahead of the hubs a breadcrumb points back to.
+# The top SPECULATION_LIMIT become a speculationrules prefetch list: the first
+# SPECULATION_IMMEDIATE are fetched as soon as the page is idle, the rest on
+# hover/pointerdown ("moderate"). Browsers without speculation rules ignore the
+# tag, and client-side (React Router) navigations never need it.
+
+SPECULATION_LIMIT = 4  # targets per page; override with --speculation-limit=N (0 = off)
+SPECULATION_IMMEDIATE = 2
+SPECULATION = defaultdict(lambda: [0, 0, 0])  # route type -> [pages, hints, bytes]
+SPECULATION_LOCK = threading.Lock()
+INTERNAL_HREF_RE = re.compile(r'<a href="(/[^"?#]*)"')
+CANONICAL_PATH_RE = re.compile(r'<link rel="canonical" href="' + re.escape(SITE_URL) + r'(/[^"]*)"')
+
+
+def content_links(html):
+    """Internal hrefs of a page's own content (not the sitewide nav/footer), in order, deduplicated."""
+    start = html.find('<div class="seo-static">')
+    if start < 0:
+        return []
+    start = html.find('</nav>', start)
+    end = html.find(SITE_FOOTER_START, start)
+    if start < 0 or end < 0:
+        return []
+    return list(dict.fromkeys(INTERNAL_HREF_RE.findall(html, start, end)))
+
+
+def inject_speculation_rules(html, path):
+    """Add a speculationrules prefetch list for the page's most likely next routes."""
+    limit = int(cli_option('speculation-limit', SPECULATION_LIMIT))
+    if limit <= 0 or '<script type="speculationrules">' in html:
+        return html
+    m = CANONICAL_PATH_RE.search(html)
+    own = {route_path(path), m.group(1) if m else None}
+    # Detail pages before hubs, and the city hub before /clubs/ (the sort is stable)
+    targets = sorted((href for href in content_links(html) if href not in own),
+                     key=lambda href: (route_type(href) in ('home', 'city', 'static'), -href.count('/')))[:limit]
+    if not targets:
+        return html
+    rules = [{'source': 'list', 'urls': urls, 'eagerness': eagerness}
+             for urls, eagerness in ((targets[:SPECULATION_IMMEDIATE], 'immediate'),
+                                     (targets[SPECULATION_IMMEDIATE:], 'moderate')) if urls]
+    tag = f'<script type="speculationrules">{json.dumps({"prefetch": rules}, separators=(",", ":"))}</script>'
+    with SPECULATION_LOCK:
+        stats = SPECULATION[route_type(path)]
+        stats[0] += 1
+        stats[1] += len(targets)
+        stats[2] += len(tag.encode('utf-8'))
+    return html.replace('</body>', tag + '</body>', 1)
+
+
+def speculation_report():
+    """Per route type: pages carrying prefetch hints, hints per page and the bytes they add."""
+    if not SPECULATION:
+        return
+    print(f'  Speculation rules (up to {int(cli_option("speculation-limit", SPECULATION_LIMIT))} prefetch targets/page):')
+    for kind in sorted(SPECULATION):
+        pages, hints, size = SPECULATION[kind]
+        print(f'    {kind:<9} {pages:>6} pages  {hints / pages:4.1f} hints/page  +{size / pages:5.0f} B/page  '
+              f'({size / 1024:.1f} KB total)')
+
+
+# ─── Client-side search index (dist/data/search/) ─────────────────────────────
+#
+# One compact shard per city/sub-area (plus 'all') so ClubsListPage and
+# ExplorePage can list and search from the CDN without an API round-trip.
+# No timestamps, so a shard whose data didn't change is byte-identical.
+# Shape (MUST match src/lib/searchIndex.ts):
+#   {"v": 1, "city": slug,
+#    "clubs":  [[id, name, location, imageUrl, upcomingEventCount], ...],
+#    "events": [[id, title, club, location, genre, "YYYY-MM-DD"], ...],
+#    "terms":  {token: [doc, ...]}}   doc < len(clubs) is a club, else events[doc - len(clubs)]
+
+SEARCH_INDEX_DIR = DIST_DIR / 'data' / 'search'
+SEARCH_INDEX_VERSION = 1
+SEARCH_INDEX_BUDGET = 200_000  # bytes per shard; override with --search-index-budget=300KB
+
+
+def search_tokens(*texts):
+    """Lowercase alphanumeric runs. MUST match tokenize() in src/lib/searchIndex.ts."""
+    tokens = set()
+    for text in texts:
+        tokens.update(re.findall(r'[a-z0-9]+', (text or '').lower()))
+    return tokens
+
+
+def build_search_index(slug, shard_clubs, shard_events, events_by_club):
+    clubs_rows, events_rows, terms = [], [], defaultdict(list)
+    for c in shard_clubs:
+        doc = len(clubs_rows)
+        clubs_rows.append([c['id'], c['name'], c.get('location', ''), c.get('imageUrl') or '',
+                           len(events_by_club.get(c['id'], []))])
+        for tok in search_tokens(c['name'], c.get('location')):
+            terms[tok].append(doc)
+    for e in sorted(shard_events, key=event_date_str):
+        date_str = event_date_str(e)
+        events_rows.append([e['id'], e['title'], e.get('club', ''), e.get('location', ''), e.get('genre') or '', date_str])
+    for j, e in enumerate(events_rows):
+        day = ''
+        try:
+            day = datetime.strptime(e[5], '%Y-%m-%d').strftime('%B %A')  # 'October Saturday'
+        except ValueError:
+            pass
+        for tok in search_tokens(e[1], e[2], e[3], e[4], day):
+            terms[tok].append(len(clubs_rows) + j)
+    return {
+        'v': SEARCH_INDEX_VERSION,
+        'city': slug,
+        'clubs': clubs_rows,
+        'events': events_rows,
+        'terms': dict(sorted(terms.items())),
+    }
 
-    # Fetch data
-    print('Fetching API data...')
-    clubs = fetch_json_cached(f'{API_BASE}/clubs', CACHE_DIR / 'clubs.json') or []
-    events = fetch_json_cached(f'{API_BASE}/events', CACHE_DIR / 'events.json') or []
 
-    # Collect promoters
+def write_search_indexes(shards, events_by_club):
+    """Write one shard per (slug, clubs, events); returns {slug: bytes}."""
+    SEARCH_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for slug, shard_clubs, shard_events in shards:
+        data = json.dumps(build_search_index(slug, shard_clubs, shard_events, events_by_club),
+                          separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        (SEARCH_INDEX_DIR / f'{slug}.json').write_bytes(data)
+        sizes[slug] = len(data)
+    budget = parse_size(cli_option('search-index-budget', str(SEARCH_INDEX_BUDGET)))
+    print(f'  Search index: {len(sizes)} shards, {fmt_size(sum(sizes.values()))} total, '
+          f'largest {fmt_size(max(sizes.values(), default=0))} (budget {fmt_size(budget)}/shard)')
+    for slug, size in sizes.items():
+        if size > budget:
+            print(f'::warning::Search index shard {slug}.json is {fmt_size(size)}, budget {fmt_size(budget)}')
+    return sizes
+
+
+# ─── Static JSON data shards (dist/data/v1/) ─────────────────────────────────
+#
+# The API data this build already fetched, as static files the SPA reads from
+# the CDN before falling back to api.clubin.info (see src/api.ts):
+#   clubs/<city|sub-area|all>.json   clubs
+#   events/<city|sub-area|all>.json  upcoming events
+#   club-events/<clubId>.json        every event of a club (past ones too)
+#   club/<id>.json, event/<id>.json  single records
+# Files are written with sorted keys and no timestamps, so unchanged data is
+# byte-identical between builds (stable ETags → 304s). Each directory has a
+# manifest.json of {name: content hash}; data/v1/manifest.json summarises them.
+
+DATA_VERSION = 'v1'
+DATA_DIR = DIST_DIR / 'data' / DATA_VERSION
+SAFE_DATA_NAME_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def write_data_shards(shards):
+    """
+    Write {kind: {name: payload}} under dist/data/v1/<kind>/<name>.json plus
+    the per-kind and top-level manifests. Returns {kind: (files, bytes)}.
+    """
+    summary, kinds = {}, {}
+    for kind, files in shards.items():
+        kind_dir = DATA_DIR / kind
+        kind_dir.mkdir(parents=True, exist_ok=True)
+        manifest, total = {}, 0
+        for name, payload in files.items():
+            if not SAFE_DATA_NAME_RE.fullmatch(name or '') or name == 'manifest':
+                continue
+            data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False, sort_keys=True).encode('utf-8')
+            (kind_dir / f'{name}.json').write_bytes(data)
+            manifest[name] = content_hash(data)
+            total += len(data)
+        manifest_bytes = json.dumps(manifest, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        (kind_dir / 'manifest.json').write_bytes(manifest_bytes)
+        kinds[kind] = {'files': len(manifest), 'bytes': total, 'hash': content_hash(manifest_bytes)}
+        summary[kind] = (len(manifest), total)
+    (DATA_DIR / 'manifest.json').write_text(
+        json.dumps({'version': DATA_VERSION, 'kinds': kinds},
+                   separators=(',', ':'), sort_keys=True),
+        encoding='utf-8')
+    print('  Data shards: ' + ', '.join(f'{kind} {n} ({fmt_size(b)})' for kind, (n, b) in summary.items()))
+    return summary
+
+
+# ─── Route size report & budgets ──────────────────────────────────────────────
+
+# Bytes written per route ('/clubs/goa/'), filled in by write_route/write_home.
+ROUTE_SIZES = {}
+# Previous run's sizes, for the regression diff. Lives in .api-cache so
+# actions/cache carries it to the next build.
+ROUTE_SIZES_MANIFEST = CACHE_DIR / 'route-sizes.json'
+REPORT_TOP_N = 10
+# '<type>' caps the largest single page of a route type, '<type>_total' all of
+# its pages together, 'dist' the whole uploaded artifact.
+# Override with --budgets=event=150KB,event_total=300MB,dist=400MB.
+ROUTE_BUDGETS = {
+    'home': 250_000,
+    'static': 150_000,
+    'static_total': 2_000_000,
+    'city': 400_000,
+    'city_total': 20_000_000,
+    'club': 150_000,
+    'club_total': 50_000_000,
+    'event': 120_000,
+    'event_total': 250_000_000,
+    'promoter': 200_000,
+    'promoter_total': 20_000_000,
+    'dist': 500_000_000,
+}
+
+
+def parse_size(text):
+    """'150KB' / '1.5MB' / '2000' -> bytes."""
+    m = re.fullmatch(r'\s*([\d.]+)\s*([KMG]?)B?\s*', text, flags=re.I)
+    if not m:
+        raise ValueError(f'bad size: {text!r}')
+    return int(float(m.group(1)) * {'': 1, 'K': 1_000, 'M': 1_000_000, 'G': 1_000_000_000}[m.group(2).upper()])
+
+
+def fmt_size(n):
+    for unit, scale in (('MB', 1_000_000), ('KB', 1_000)):
+        if abs(n) >= scale:
+            return f'{n / scale:.1f} {unit}'
+    return f'{n} B'
+
+
+def route_budgets():
+    budgets = dict(ROUTE_BUDGETS)
+    for item in filter(None, (cli_option('budgets') or '').split(',')):
+        kind, _, size = item.partition('=')
+        budgets[kind.strip()] = parse_size(size)
+    return budgets
+
+
+def dist_size():
+    """Total bytes of every file in dist/ (the uploaded Pages artifact)."""
+    return sum(f.stat().st_size for f in DIST_DIR.rglob('*') if f.is_file())
+
+
+def route_size_report():
+    """
+    Print bytes per route type, the top-N largest routes and the artifact
+    total, diffed against the previous run. Returns the list of budget
+    violations (empty when everything fits).
+    """
+    by_type = defaultdict(lambda: [0, 0, 0])  # pages, total bytes, largest page
+    for path, size in ROUTE_SIZES.items():
+        t = by_type[route_type(path)]
+        t[0] += 1
+        t[1] += size
+        t[2] = max(t[2], size)
+    total_dist = dist_size()
+
+    previous = {}
+    try:
+        with open(ROUTE_SIZES_MANIFEST) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        pass
+    prev_routes = previous.get('routes', {})
+    prev_by_type = defaultdict(int)
+    for path, size in prev_routes.items():
+        prev_by_type[route_type(path)] += size
+
+    def delta(now, before):
+        return f' ({"+" if now > before else "-"}{fmt_size(abs(now - before))})' if before and now != before else ''
+
+    print(f'  Route sizes ({len(ROUTE_SIZES)} routes, HTML {fmt_size(sum(ROUTE_SIZES.values()))}, '
+          f'dist/ {fmt_size(total_dist)}{delta(total_dist, previous.get("dist", 0))}):')
+    for kind in sorted(by_type):
+        pages, total, largest = by_type[kind]
+        print(f'    {kind:<9} {pages:>6} pages  {fmt_size(total):>10}{delta(total, prev_by_type.get(kind, 0))}  '
+              f'avg {fmt_size(total // pages)}  max {fmt_size(largest)}')
+    print(f'  Largest {REPORT_TOP_N} routes:')
+    for path, size in sorted(ROUTE_SIZES.items(), key=lambda kv: -kv[1])[:REPORT_TOP_N]:
+        print(f'    {fmt_size(size):>10}{delta(size, prev_routes.get(path, 0))}  {path}')
+    if prev_routes:
+        grown = sorted(
+            ((size - prev_routes[p], p) for p, size in ROUTE_SIZES.items() if p in prev_routes),
+            reverse=True,
+        )[:REPORT_TOP_N]
+        grown = [(d, p) for d, p in grown if d > 0]
+        added = len(ROUTE_SIZES.keys() - prev_routes.keys())
+        removed = len(prev_routes.keys() - ROUTE_SIZES.keys())
+        print(f'  Since last build: {added} routes added, {removed} removed')
+        for d, p in grown:
+            print(f'    +{fmt_size(d):>9}  {p}')
+
+    try:
+        os.makedirs(os.path.dirname(ROUTE_SIZES_MANIFEST), exist_ok=True)
+        with open(ROUTE_SIZES_MANIFEST, 'w') as f:
+            json.dump({'generatedAt': datetime.now(timezone.utc).isoformat(), 'dist': total_dist,
+                       'routes': ROUTE_SIZES}, f)
+    except OSError as e:
+        print(f'  Warning: could not write {ROUTE_SIZES_MANIFEST}: {e}')
+
+    violations = []
+    for name, limit in route_budgets().items():
+        kind, _, total = name.partition('_')
+        if name == 'dist':
+            actual, what = total_dist, 'dist/ total'
+        elif total == 'total':
+            actual, what = by_type.get(kind, [0, 0, 0])[1], f'all {kind} pages'
+        else:
+            actual, what = by_type.get(kind, [0, 0, 0])[2], f'largest {kind} page'
+        if actual > limit:
+            violations.append(f'{what} is {fmt_size(actual)}, budget {fmt_size(limit)}')
+    return violations
+
+
+# ─── Page builders ────────────────────────────────────────────────────────────
+#
+# Each builder renders one "key" of the site — 'static', 'hubs', 'city:<slug>',
+# 'club:<id>', 'event:<id>', 'archived:<id>', 'promoter:<id>' — to a list of
+# (route path, html) without touching disk, from the indexes in index_site().
+# main() renders every key once; --watch re-renders only the keys a change
+# affects.
+
+def index_site(clubs, events, image_dims=None):
+    """Lookup tables the page builders share, built once per API snapshot."""
     promoter_map = {}
     for e in events:
         ref = e.get('promoterRef')
@@ -515,8 +1631,6 @@ def main():
             if p.get('id'):
                 promoter_map[p['id']] = p
 
-    # Index data for cross-linking
-    club_by_id = {c['id']: c for c in clubs}
     upcoming = [e for e in events if is_upcoming(e)]
     clubs_by_city = defaultdict(list)
     for c in clubs:
@@ -533,29 +1647,57 @@ def main():
         ref = e.get('promoterRef')
         if ref and ref.get('id'):
             events_by_promoter[ref['id']].append(e)
+    all_events_by_club = defaultdict(list)
+    for e in events:
+        if e.get('clubId'):
+            all_events_by_club[e['clubId']].append(e)
 
-    # Sub-area landing pages — only generated where real venues match (no thin pages)
-    subcity_pages = []
+    # Landing areas in render order: curated cities, then sub-areas — only
+    # generated where real venues match (no thin pages)
+    areas = {}
+    for city in CITIES:
+        slug = city.lower().replace(' ', '-')
+        areas[slug] = (city, clubs_by_city.get(slug, []), events_by_city.get(slug, []))
     for sub_slug, sub_name, needles in SUBCITIES:
         sc_clubs = [c for c in clubs if location_matches(c.get('location', ''), needles)]
         sc_events = [e for e in upcoming if location_matches(e.get('location') or e.get('region', ''), needles)]
         if sc_clubs or sc_events:
-            subcity_pages.append((sub_slug, sub_name, sc_clubs, sc_events))
+            areas[sub_slug] = (sub_name, sc_clubs, sc_events)
 
-    count = 0
+    return {
+        'clubs': clubs,
+        'events': events,
+        'upcoming': upcoming,
+        'club_by_id': {c['id']: c for c in clubs},
+        'event_by_id': {e['id']: e for e in events},
+        'promoter_map': promoter_map,
+        'clubs_by_city': clubs_by_city,
+        'events_by_city': events_by_city,
+        'events_by_club': events_by_club,
+        'events_by_promoter': events_by_promoter,
+        'all_events_by_club': all_events_by_club,
+        'areas': areas,
+        'image_dims': image_dims if image_dims is not None else {},
+        # Set by update_event_archive(); until then every event is live
+        'archive': {},
+        'live_events': events,
+    }
 
-    # 0a. Home page — inject static crawlable content into dist/index.html
-    #     (meta tags in the template are already correct for the home page)
-    home_body = body_wrap(
-        '<h1>Clubin — India’s Nightclub &amp; Party Event Entry App</h1>'
-        '<p>Skip the queue at the best clubs in Bengaluru, Mumbai, Delhi NCR, Pune, Goa, Hyderabad, Chennai, Jaipur and Chandigarh. '
-        'Get free guestlist entry, book VIP tables, and discover the hottest parties near you — all on Clubin.</p>'
-        + event_list_html(upcoming, heading='Trending Parties &amp; Events', limit=10)
-        + club_list_html(clubs[:12], heading='Featured Nightclubs')
-        + f'<p>Own a venue? {link("/list-your-club/", "List your club on Clubin")} and reach thousands of nightlife lovers.</p>'
-    )
-    write_home(inject_body(template, home_body))
-    count += 1
+
+def site_image_urls(site):
+    """
+    Hero/og images a rendered page uses, worth probing for width/height.
+    Archived events are re-templated from their frozen record without a hero,
+    so call this after update_event_archive() has set site['live_events'].
+    """
+    return ([c.get('imageUrl') for c in site['clubs']]
+            + [e.get('imageUrl') for e in site['live_events']]
+            + [p.get('logoUrl') for p in site['promoter_map'].values()])
+
+
+def static_routes(template):
+    """Pages that don't depend on API data: partner pages, legal stubs, support."""
+    routes = []
 
     # 0b. /list-your-club (static page)
     lyc_url = page_url('/list-your-club')
@@ -594,8 +1736,7 @@ def main():
             },
         ]
     )
-    write_route('/list-your-club', inject_body(html, lyc_body))
-    count += 1
+    routes.append(('/list-your-club', inject_body(html, lyc_body)))
 
     # 0c. /list-your-club/schedule (booking page)
     sched_url = page_url('/list-your-club/schedule')
@@ -627,8 +1768,7 @@ def main():
             },
         ]
     )
-    write_route('/list-your-club/schedule', inject_body(html, sched_body))
-    count += 1
+    routes.append(('/list-your-club/schedule', inject_body(html, sched_body)))
 
     # 0d. Legal pages (content is client-rendered; static meta + stub so they index)
     for path, title, description, h1 in [
@@ -644,8 +1784,7 @@ def main():
     ]:
         html = inject_meta(template, title=title, description=description, url=page_url(path),
             structured_data={'@context': 'https://schema.org', '@type': 'WebPage', 'name': h1, 'url': page_url(path)})
-        write_route(path, inject_body(html, body_wrap(f'<h1>{esc(h1)}</h1><p>{esc(description)}</p>')))
-        count += 1
+        routes.append((path, inject_body(html, body_wrap(f'<h1>{esc(h1)}</h1><p>{esc(description)}</p>'))))
 
     # 0e. Support page — FAQs rendered visibly AND as FAQPage JSON-LD (must match
     #     src/pages/SupportPage.tsx so the structured data reflects what users see)
@@ -685,8 +1824,31 @@ def main():
             {'@context': 'https://schema.org', '@type': 'WebPage', 'name': 'Help & Support', 'url': support_url},
             faq_schema(support_faqs),
         ])
-    write_route(support_path, inject_body(html, support_body))
-    count += 1
+    routes.append((support_path, inject_body(html, support_body)))
+
+    return routes
+
+
+def hub_routes(template, site):
+    """Home, /clubs and /explore — the pages that summarise the whole catalog."""
+    clubs, upcoming = site['clubs'], site['upcoming']
+    clubs_by_city, events_by_city = site['clubs_by_city'], site['events_by_city']
+    # areas lists the curated cities first, then the sub-areas
+    subcity_pages = [(slug, name, a_clubs, a_events)
+                     for slug, (name, a_clubs, a_events) in list(site['areas'].items())[len(CITIES):]]
+    routes = []
+
+    # 0a. Home page — inject static crawlable content into dist/index.html
+    #     (meta tags in the template are already correct for the home page)
+    home_body = body_wrap(
+        '<h1>Clubin — India’s Nightclub &amp; Party Event Entry App</h1>'
+        '<p>Skip the queue at the best clubs in Bengaluru, Mumbai, Delhi NCR, Pune, Goa, Hyderabad, Chennai, Jaipur and Chandigarh. '
+        'Get free guestlist entry, book VIP tables, and discover the hottest parties near you — all on Clubin.</p>'
+        + event_list_html(upcoming, heading='Trending Parties &amp; Events', limit=10)
+        + club_list_html(clubs[:12], heading='Featured Nightclubs')
+        + f'<p>Own a venue? {link("/list-your-club/", "List your club on Clubin")} and reach thousands of nightlife lovers.</p>'
+    )
+    routes.append(('/', inject_body(template, home_body)))
 
     # 1. /clubs (city select)
     clubs_url = page_url('/clubs')
@@ -737,8 +1899,7 @@ def main():
             },
         ]
     )
-    write_route('/clubs', inject_body(html, clubs_body))
-    count += 1
+    routes.append(('/clubs', inject_body(html, clubs_body)))
 
     # 1b. /explore — internal-linking hub indexing every city, club and event
     explore_url = page_url('/explore')
@@ -769,277 +1930,840 @@ def main():
             ]},
         ]
     )
-    write_route('/explore', inject_body(html, explore_body))
-    count += 1
+    routes.append(('/explore', inject_body(html, explore_body)))
 
-    # 2. City pages — curated cities + sub-area landing pages (Gurgaon/Noida/Lucknow)
-    for city in CITIES:
-        slug = city.lower().replace(' ', '-')
-        render_city_page(template, clubs_url, slug, city,
-                         clubs_by_city.get(slug, []), events_by_city.get(slug, []))
-        count += 1
-    for sub_slug, sub_name, sc_clubs, sc_events in subcity_pages:
-        render_city_page(template, clubs_url, sub_slug, sub_name, sc_clubs, sc_events)
-        count += 1
-
-    # 3. Club detail pages (+ short link pages /c/:code)
-    for club in clubs:
-        city_slug = get_city_slug(club.get('location', 'india'))
-        city = city_name_from_slug(city_slug)
-        club_seg = slug_id(club['name'], club['id'])
-        club_url = page_url(f'/clubs/{city_slug}/{club_seg}')
-        club_events = events_by_club.get(club['id'], [])
-
-        nightclub_sd = {
-            '@context': 'https://schema.org',
-            '@type': 'NightClub',
-            'name': club['name'],
-            'image': [u for u in [club.get('imageUrl')] + (club.get('venueImages') or [])[:3] if u] or None,
-            'description': club.get('description', ''),
-            'address': {'@type': 'PostalAddress', 'streetAddress': club.get('address', ''), 'addressLocality': club.get('location', ''), 'addressCountry': 'IN'},
-            'url': club_url,
+    return routes
+
+
+def club_routes(template, site, club):
+    """Club detail page at its slug URL, the legacy bare-UUID URL and /c/:code."""
+    events_by_club, image_dims = site['events_by_club'], site['image_dims']
+    clubs_url = page_url('/clubs')
+    routes = []
+    city_slug = get_city_slug(club.get('location', 'india'))
+    city = city_name_from_slug(city_slug)
+    club_seg = slug_id(club['name'], club['id'])
+    club_url = page_url(f'/clubs/{city_slug}/{club_seg}')
+    club_events = events_by_club.get(club['id'], [])
+
+    nightclub_sd = {
+        '@context': 'https://schema.org',
+        '@type': 'NightClub',
+        'name': club['name'],
+        'image': [u for u in [club.get('imageUrl')] + (club.get('venueImages') or [])[:3] if u] or None,
+        'description': club.get('description', ''),
+        'address': {'@type': 'PostalAddress', 'streetAddress': club.get('address', ''), 'addressLocality': club.get('location', ''), 'addressCountry': 'IN'},
+        'url': club_url,
+    }
+    if club.get('latitude') and club.get('longitude'):
+        nightclub_sd['geo'] = {'@type': 'GeoCoordinates', 'latitude': club['latitude'], 'longitude': club['longitude']}
+    if club.get('mapUrl'):
+        nightclub_sd['hasMap'] = club['mapUrl']
+    if club.get('instagramUrl'):
+        nightclub_sd['sameAs'] = [club['instagramUrl']]
+    # Only include ratings when real reviews exist (fake markup risks a manual action)
+    if club.get('totalReviews') and club.get('averageRating'):
+        nightclub_sd['aggregateRating'] = {
+            '@type': 'AggregateRating',
+            'ratingValue': club['averageRating'],
+            'reviewCount': club['totalReviews'],
         }
-        if club.get('latitude') and club.get('longitude'):
-            nightclub_sd['geo'] = {'@type': 'GeoCoordinates', 'latitude': club['latitude'], 'longitude': club['longitude']}
-        if club.get('mapUrl'):
-            nightclub_sd['hasMap'] = club['mapUrl']
-        if club.get('instagramUrl'):
-            nightclub_sd['sameAs'] = [club['instagramUrl']]
-        # Only include ratings when real reviews exist (fake markup risks a manual action)
-        if club.get('totalReviews') and club.get('averageRating'):
-            nightclub_sd['aggregateRating'] = {
-                '@type': 'AggregateRating',
-                'ratingValue': club['averageRating'],
-                'reviewCount': club['totalReviews'],
-            }
-        nightclub_sd = {k: v for k, v in nightclub_sd.items() if v is not None}
-
-        img_html = ''
-        if club.get('imageUrl'):
-            img_html = f'<img src="{esc(club["imageUrl"])}" alt="{esc(club["name"])} - nightclub in {esc(club.get("location", ""))}" loading="lazy" />'
-        club_body = body_wrap(
-            f'<p class="muted">{link("/clubs/", "Clubs")} / {link(f"/clubs/{city_slug}/", city)}</p>'
-            f'<h1>{esc(club["name"])}</h1>'
-            f'<p class="muted">{esc(club.get("address") or club.get("location", ""))}</p>'
-            + img_html
-            + (f'<p>{esc(club.get("description", ""))}</p>' if club.get('description') else '')
-            + event_list_html(club_events, heading=f'Upcoming Events at {club["name"]}')
-            + f'<p>Book free guestlist entry and VIP tables at {esc(club["name"])} on the Clubin app — '
-              f'skip the queue and walk in stress-free.</p>'
-            + f'<p>{link(f"/clubs/{city_slug}/", f"More nightclubs in {city}")}</p>'
-        )
-        html = inject_meta(template,
-            title=f'{club["name"]} - Nightclub in {club.get("location", "")} | Guestlist & Tables | Clubin',
-            description=f'{club["name"]} in {club.get("location", "")}. {club.get("description", "Book guestlists and VIP tables on Clubin.")[:160]}',
-            image=club.get('imageUrl', OG_IMAGE),
-            url=club_url,
-            structured_data=[
-                nightclub_sd,
-                {
-                    '@context': 'https://schema.org',
-                    '@type': 'BreadcrumbList',
-                    'itemListElement': [
-                        {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
-                        {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
-                        {'@type': 'ListItem', 'position': 3, 'name': city, 'item': page_url(f'/clubs/{city_slug}')},
-                        {'@type': 'ListItem', 'position': 4, 'name': club['name']},
-                    ],
-                },
-            ]
-        )
-        html = inject_body(html, club_body)
-        write_route(f'/clubs/{city_slug}/{club_seg}', html)
-        count += 1
-        # Legacy bare-UUID path: same HTML (its canonical already points to the
-        # slug URL), so Google consolidates and previously-indexed links never 404.
-        if club_seg != club['id']:
-            write_route(f'/clubs/{city_slug}/{club["id"]}', html)
-            count += 1
-
-        # Also create a short link and pre-render /c/:code for club sharing
-        # (canonical inside points to the full club URL, so no duplicate-content risk)
-        result = post_json(f'{API_BASE}/shortlinks', {'type': 'club', 'targetId': club['id']})
-        if result and result.get('code'):
-            write_route(f'/c/{result["code"]}', html)
-            count += 1
-
-    # 4. Event pages (+ short link pages /e/:code)
-    #    Enriched Event schema with all Google-recommended fields
-    shortlink_count = 0
-    for event in events:
-        date_str = event_date_str(event)
-        event_seg = slug_id(event['title'], event['id'])
-        event_url = page_url(f'/events/{event_seg}')
-        event_location = event.get('location', '')
-        city_slug = event_city_slug(event)
-        city = city_name_from_slug(city_slug) if city_slug else ''
-        is_open = event.get('guestlistStatus') in ('open', 'closing')
-        club = club_by_id.get(event.get('clubId') or '')
-        club_ref = event.get('clubRef') or {}
-        nice_date = fmt_date(date_str)
-
-        start_dt, end_dt = event_times_iso(event)
-
-        # Build offers array with all recommended fields
-        # (`or` fallback: a 0 stag/couple/ladies price means "use the cover price")
-        offers = []
-        for label, price_key in [('Stag Entry', 'stagPrice'), ('Couple Entry', 'couplePrice'), ('Ladies Entry', 'ladiesPrice')]:
-            price = event.get(price_key) or event.get('price') or 0
-            offers.append({
-                '@type': 'Offer',
-                'name': label,
-                'price': price,
-                'priceCurrency': 'INR',
-                'availability': 'https://schema.org/InStock' if is_open else 'https://schema.org/SoldOut',
-                'url': event_url,
-                'validFrom': event.get('createdAt', date_str)[:10],
-            })
-
-        # Build Event structured data
-        event_sd = {
-            '@context': 'https://schema.org',
-            '@type': 'Event',
-            'name': event['title'],
-            'startDate': start_dt,
-            'endDate': end_dt,
-            'eventStatus': 'https://schema.org/EventScheduled',
-            'eventAttendanceMode': 'https://schema.org/OfflineEventAttendanceMode',
-            'image': event.get('imageUrl'),
-            'description': event.get('description', ''),
-            'location': {
-                '@type': 'Place',
-                'name': event.get('club', ''),
-                'address': {
-                    '@type': 'PostalAddress',
-                    'streetAddress': (club or club_ref).get('address', ''),
-                    'addressLocality': event_location,
-                    'addressCountry': 'IN',
-                },
+    nightclub_sd = {k: v for k, v in nightclub_sd.items() if v is not None}
+
+    img_html = ''
+    if club.get('imageUrl'):
+        img_html = (f'<img src="{esc(club["imageUrl"])}" alt="{esc(club["name"])} - nightclub in {esc(club.get("location", ""))}"'
+                    f'{img_size_attrs(image_dims.get(club["imageUrl"]))} fetchpriority="high" />')
+    club_body = body_wrap(
+        f'<p class="muted">{link("/clubs/", "Clubs")} / {link(f"/clubs/{city_slug}/", city)}</p>'
+        f'<h1>{esc(club["name"])}</h1>'
+        f'<p class="muted">{esc(club.get("address") or club.get("location", ""))}</p>'
+        + img_html
+        + (f'<p>{esc(club.get("description", ""))}</p>' if club.get('description') else '')
+        + event_list_html(club_events, heading=f'Upcoming Events at {club["name"]}')
+        + f'<p>Book free guestlist entry and VIP tables at {esc(club["name"])} on the Clubin app — '
+          f'skip the queue and walk in stress-free.</p>'
+        + f'<p>{link(f"/clubs/{city_slug}/", f"More nightclubs in {city}")}</p>'
+    )
+    html = inject_meta(template,
+        title=f'{club["name"]} - Nightclub in {club.get("location", "")} | Guestlist & Tables | Clubin',
+        description=f'{club["name"]} in {club.get("location", "")}. {club.get("description", "Book guestlists and VIP tables on Clubin.")[:160]}',
+        image=club.get('imageUrl', OG_IMAGE),
+        image_size=image_dims.get(club.get('imageUrl')),
+        preload_image=club.get('imageUrl'),
+        url=club_url,
+        structured_data=[
+            nightclub_sd,
+            {
+                '@context': 'https://schema.org',
+                '@type': 'BreadcrumbList',
+                'itemListElement': [
+                    {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
+                    {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
+                    {'@type': 'ListItem', 'position': 3, 'name': city, 'item': page_url(f'/clubs/{city_slug}')},
+                    {'@type': 'ListItem', 'position': 4, 'name': club['name']},
+                ],
             },
+        ]
+    )
+    html = inject_body(html, club_body, route_data={
+        'type': 'club',
+        'id': club['id'],
+        'club': pick_fields(club, CLUB_PAYLOAD_FIELDS),
+        'events': [pick_fields(e, CLUB_EVENT_PAYLOAD_FIELDS) for e in sorted(club_events, key=event_date_str)],
+    })
+    routes.append((f'/clubs/{city_slug}/{club_seg}', html))
+    # Legacy bare-UUID path: same HTML (its canonical already points to the
+    # slug URL), so Google consolidates and previously-indexed links never 404.
+    if club_seg != club['id']:
+        routes.append((f'/clubs/{city_slug}/{club["id"]}', html))
+
+    # Also create a short link and pre-render /c/:code for club sharing
+    # (canonical inside points to the full club URL, so no duplicate-content risk)
+    code = shortlink_code('club', club['id'])
+    if code:
+        routes.append((f'/c/{code}', html))
+    return routes
+
+
+def event_routes(template, site, event):
+    """Live event page at its slug URL, the legacy bare-UUID URL and /e/:code."""
+    club_by_id, image_dims = site['club_by_id'], site['image_dims']
+    clubs_url = page_url('/clubs')
+    routes = []
+    date_str = event_date_str(event)
+    event_seg = slug_id(event['title'], event['id'])
+    event_url = page_url(f'/events/{event_seg}')
+    event_location = event.get('location', '')
+    city_slug = event_city_slug(event)
+    city = city_name_from_slug(city_slug) if city_slug else ''
+    is_open = event.get('guestlistStatus') in ('open', 'closing')
+    club = club_by_id.get(event.get('clubId') or '')
+    club_ref = event.get('clubRef') or {}
+    nice_date = fmt_date(date_str)
+
+    start_dt, end_dt = event_times_iso(event)
+
+    # Build offers array with all recommended fields
+    # (`or` fallback: a 0 stag/couple/ladies price means "use the cover price")
+    offers = []
+    for label, price_key in [('Stag Entry', 'stagPrice'), ('Couple Entry', 'couplePrice'), ('Ladies Entry', 'ladiesPrice')]:
+        price = event.get(price_key) or event.get('price') or 0
+        offers.append({
+            '@type': 'Offer',
+            'name': label,
+            'price': price,
+            'priceCurrency': 'INR',
+            'availability': 'https://schema.org/InStock' if is_open else 'https://schema.org/SoldOut',
             'url': event_url,
-            'offers': offers,
-            'performer': {'@type': 'PerformingGroup', 'name': event.get('genre', event['title'])},
-            'isAccessibleForFree': False,
+            'validFrom': event.get('createdAt', date_str)[:10],
+        })
+
+    # Build Event structured data
+    event_sd = {
+        '@context': 'https://schema.org',
+        '@type': 'Event',
+        'name': event['title'],
+        'startDate': start_dt,
+        'endDate': end_dt,
+        'eventStatus': 'https://schema.org/EventScheduled',
+        'eventAttendanceMode': 'https://schema.org/OfflineEventAttendanceMode',
+        'image': event.get('imageUrl'),
+        'description': event.get('description', ''),
+        'location': {
+            '@type': 'Place',
+            'name': event.get('club', ''),
+            'address': {
+                '@type': 'PostalAddress',
+                'streetAddress': (club or club_ref).get('address', ''),
+                'addressLocality': event_location,
+                'addressCountry': 'IN',
+            },
+        },
+        'url': event_url,
+        'offers': offers,
+        'performer': {'@type': 'PerformingGroup', 'name': event.get('genre', event['title'])},
+        'isAccessibleForFree': False,
+    }
+
+    # Add organizer if promoter is available
+    promoter_ref = event.get('promoterRef')
+    if promoter_ref and promoter_ref.get('name'):
+        event_sd['organizer'] = {
+            '@type': 'Organization',
+            'name': promoter_ref['name'],
+            'url': page_url(f'/promoters/{promoter_ref["id"]}'),
         }
 
-        # Add organizer if promoter is available
-        promoter_ref = event.get('promoterRef')
-        if promoter_ref and promoter_ref.get('name'):
-            event_sd['organizer'] = {
+    # Static crawlable body: full event details + links to club/city/promoter
+    club_link_html = ''
+    if club:
+        club_city_slug = get_city_slug(club.get('location', 'india'))
+        club_link_html = f'<p>Venue: {link(route_path("/clubs/" + club_city_slug + "/" + slug_id(club["name"], club["id"])), club["name"])}</p>'
+    elif event.get('club'):
+        club_link_html = f'<p>Venue: {esc(event["club"])}</p>'
+    promoter_html = ''
+    if promoter_ref and promoter_ref.get('name'):
+        promoter_html = f'<p>Organised by {link(route_path("/promoters/" + promoter_ref["id"]), promoter_ref["name"])}</p>'
+    img_html = ''
+    if event.get('imageUrl'):
+        img_html = (f'<img src="{esc(event["imageUrl"])}" alt="{esc(event["title"])} at {esc(event.get("club", ""))}"'
+                    f'{img_size_attrs(image_dims.get(event["imageUrl"]))} fetchpriority="high" />')
+    time_text = nice_date
+    if event.get('startTime'):
+        time_text += f', {event["startTime"]}'
+        if event.get('endTime'):
+            time_text += f' – {event["endTime"]}'
+    event_body = body_wrap(
+        (f'<p class="muted">{link("/clubs/", "Clubs")} / {link(f"/clubs/{city_slug}/", city)}</p>' if city_slug else '')
+        + f'<h1>{esc(event["title"])}</h1>'
+        + f'<p class="muted">{esc(time_text)} · {esc(event.get("club", ""))}, {esc(event_location)}</p>'
+        + img_html
+        + (f'<p><strong>Entry:</strong> {esc(event_price_text(event))}</p>')
+        + (f'<p><strong>Genre:</strong> {esc(event["genre"])}</p>' if event.get('genre') else '')
+        + (f'<p>{esc(event.get("description", ""))}</p>' if event.get('description') else '')
+        + (f'<p class="muted">Rules: {esc(event["rules"])}</p>' if event.get('rules') else '')
+        + club_link_html
+        + promoter_html
+        + '<p>Book your guestlist spot or tickets for this party on Clubin — instant confirmation, QR entry, no queues.</p>'
+    )
+
+    html = inject_meta(template,
+        title=f'{event["title"]} at {event.get("club", "")} - {nice_date} | Guestlist & Tickets | Clubin',
+        description=f'{event["title"]} at {event.get("club", "")}, {event_location} on {nice_date}. Entry: {event_price_text(event)}. {event.get("description", "Book your spot on Clubin!")[:110]}',
+        image=event.get('imageUrl', OG_IMAGE),
+        image_size=image_dims.get(event.get('imageUrl')),
+        preload_image=event.get('imageUrl'),
+        url=event_url,
+        structured_data=[
+            event_sd,
+            {
+                '@context': 'https://schema.org',
+                '@type': 'BreadcrumbList',
+                'itemListElement': [
+                    {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
+                    {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
+                    *([{'@type': 'ListItem', 'position': 3, 'name': event.get('club', ''), 'item': page_url(f'/clubs/{city_slug}')}] if city_slug else []),
+                    {'@type': 'ListItem', 'position': 4 if city_slug else 3, 'name': event['title']},
+                ],
+            },
+        ]
+    )
+    html = inject_body(html, event_body, route_data={
+        'type': 'event',
+        'id': event['id'],
+        'event': pick_fields(event, EVENT_PAYLOAD_FIELDS),
+    })
+    routes.append((f'/events/{event_seg}', html))
+    # Legacy bare-UUID path → same content, canonical points to the slug URL.
+    if event_seg != event['id']:
+        routes.append((f'/events/{event["id"]}', html))
+
+    # Also create a short link and pre-render /e/:code so social media crawlers
+    # see OG tags when short links are shared (crawlers don't execute JS)
+    code = shortlink_code('event', event['id'])
+    if code:
+        routes.append((f'/e/{code}', html))
+    return routes
+
+
+def promoter_routes(template, site, pid):
+    """Promoter profile page with their upcoming events."""
+    promoter = site['promoter_map'][pid]
+    events_by_promoter, image_dims = site['events_by_promoter'], site['image_dims']
+    clubs_url = page_url('/clubs')
+    routes = []
+    name = promoter.get('name', 'Promoter')
+    region = promoter.get('region', '')
+    promoter_url = page_url(f'/promoters/{pid}')
+    promoter_events = events_by_promoter.get(pid, [])
+    promoter_body = body_wrap(
+        f'<h1>{esc(name)}</h1>'
+        + (f'<p class="muted">Event promoter in {esc(region)}</p>' if region else '<p class="muted">Event promoter</p>')
+        + event_list_html(promoter_events, heading=f'Upcoming Events by {name}')
+        + f'<p>Browse parties and nightclub events by {esc(name)} and book guestlist entry on Clubin.</p>'
+    )
+    html = inject_meta(template,
+        title=f'{name} - Event Promoter{f" in {region}" if region else ""} | Clubin',
+        description=f'{name} is an event promoter{f" based in {region}" if region else ""}. Browse their upcoming nightclub events and parties on Clubin.',
+        image=promoter.get('logoUrl', OG_IMAGE),
+        image_size=image_dims.get(promoter.get('logoUrl')),
+        url=promoter_url,
+        structured_data=[
+            {
+                '@context': 'https://schema.org',
                 '@type': 'Organization',
-                'name': promoter_ref['name'],
-                'url': page_url(f'/promoters/{promoter_ref["id"]}'),
-            }
-
-        # Static crawlable body: full event details + links to club/city/promoter
-        club_link_html = ''
-        if club:
-            club_city_slug = get_city_slug(club.get('location', 'india'))
-            club_link_html = f'<p>Venue: {link(route_path("/clubs/" + club_city_slug + "/" + slug_id(club["name"], club["id"])), club["name"])}</p>'
-        elif event.get('club'):
-            club_link_html = f'<p>Venue: {esc(event["club"])}</p>'
-        promoter_html = ''
-        if promoter_ref and promoter_ref.get('name'):
-            promoter_html = f'<p>Organised by {link(route_path("/promoters/" + promoter_ref["id"]), promoter_ref["name"])}</p>'
-        img_html = ''
-        if event.get('imageUrl'):
-            img_html = f'<img src="{esc(event["imageUrl"])}" alt="{esc(event["title"])} at {esc(event.get("club", ""))}" loading="lazy" />'
-        time_text = nice_date
-        if event.get('startTime'):
-            time_text += f', {event["startTime"]}'
-            if event.get('endTime'):
-                time_text += f' – {event["endTime"]}'
-        event_body = body_wrap(
-            (f'<p class="muted">{link("/clubs/", "Clubs")} / {link(f"/clubs/{city_slug}/", city)}</p>' if city_slug else '')
-            + f'<h1>{esc(event["title"])}</h1>'
-            + f'<p class="muted">{esc(time_text)} · {esc(event.get("club", ""))}, {esc(event_location)}</p>'
-            + img_html
-            + (f'<p><strong>Entry:</strong> {esc(event_price_text(event))}</p>')
-            + (f'<p><strong>Genre:</strong> {esc(event["genre"])}</p>' if event.get('genre') else '')
-            + (f'<p>{esc(event.get("description", ""))}</p>' if event.get('description') else '')
-            + (f'<p class="muted">Rules: {esc(event["rules"])}</p>' if event.get('rules') else '')
-            + club_link_html
-            + promoter_html
-            + '<p>Book your guestlist spot or tickets for this party on Clubin — instant confirmation, QR entry, no queues.</p>'
-        )
+                'name': name,
+                'url': promoter_url,
+                'image': promoter.get('logoUrl'),
+            },
+            {
+                '@context': 'https://schema.org',
+                '@type': 'BreadcrumbList',
+                'itemListElement': [
+                    {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
+                    {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
+                    {'@type': 'ListItem', 'position': 3, 'name': name},
+                ],
+            },
+        ]
+    )
+    routes.append((f'/promoters/{pid}', inject_body(html, promoter_body)))
+    return routes
+
+
+def render_key(template, site, key):
+    """[(path, html)] for one site key; [] when the entity no longer exists."""
+    kind, _, ident = key.partition(':')
+    if kind == 'static':
+        return static_routes(template)
+    if kind == 'hubs':
+        return hub_routes(template, site)
+    if kind == 'city' and ident in site['areas']:
+        display, area_clubs, area_events = site['areas'][ident]
+        page_size = city_page_size()
+        return city_routes(template, ident, display, area_clubs, area_events, page_size)
+    if kind == 'club' and ident in site['club_by_id']:
+        return club_routes(template, site, site['club_by_id'][ident])
+    if kind == 'archived' and ident in site['archive']:
+        return archived_event_routes(template, site['archive'][ident])
+    if kind == 'event' and ident in site['event_by_id'] and ident not in site['archive']:
+        return event_routes(template, site, site['event_by_id'][ident])
+    if kind == 'promoter' and ident in site['promoter_map']:
+        return promoter_routes(template, site, ident)
+    return []
+
+
+def site_keys(site):
+    """Every key of the site, in render order."""
+    return (['static', 'hubs']
+            + [f'city:{slug}' for slug in site['areas']]
+            + [f'club:{c["id"]}' for c in site['clubs']]
+            + [f'archived:{eid}' for eid in site['archive']]
+            + [f'event:{e["id"]}' for e in site['live_events']]
+            + [f'promoter:{pid}' for pid in site['promoter_map']])
+
+
+def write_routes(routes):
+    for path, html in routes:
+        if path == '/':
+            write_home(html)
+        else:
+            write_route(path, html)
+    return len(routes)
+
+
+def remove_route(path):
+    """Delete a route's index.html (and its directory, once empty)."""
+    out = DIST_DIR / path.strip('/') / 'index.html'
+    try:
+        out.unlink()
+        out.parent.rmdir()
+    except OSError:
+        pass
+    ROUTE_SIZES.pop(route_path(path), None)
+
+
+def render_keys(template, site, keys, rendered):
+    """
+    Render and write every key in keys. rendered ({key: [paths]}) is updated in
+    place; routes a key used to produce but no longer does (renamed slug,
+    deleted entity) are removed unless another key now owns them.
+    Returns the number of routes written.
+    """
+    count = 0
+    stale = set()
+    for key in keys:
+        routes = checkpoint_routes(key)
+        if routes is None:
+            routes = render_key(template, site, key)
+            checkpoint_key(key, routes)
+        paths = [path for path, _html in routes]
+        stale.update(set(rendered.get(key, ())) - set(paths))
+        count += write_routes(routes)
+        if paths:
+            rendered[key] = paths
+        else:
+            rendered.pop(key, None)
+    if stale:
+        owned = {path for paths in rendered.values() for path in paths}
+        for path in stale - owned:
+            remove_route(path)
+    return count
+
+
+def write_site_data(site):
+    """Search index shards and static JSON data shards for the SPA."""
+    area_shards = ([(slug, area_clubs, area_events) for slug, (_name, area_clubs, area_events) in site['areas'].items()]
+                   + [('all', site['clubs'], site['upcoming'])])
+    # Client-side search index shards (per city, per sub-area, and 'all')
+    write_search_indexes(area_shards, site['events_by_club'])
+    # Static JSON data shards the SPA reads before hitting the API
+    write_data_shards({
+        'clubs': {slug: area_clubs for slug, area_clubs, _e in area_shards},
+        'events': {slug: sorted(area_events, key=event_date_str) for slug, _c, area_events in area_shards},
+        'club-events': {cid: sorted(evts, key=event_date_str) for cid, evts in site['all_events_by_club'].items()},
+        'club': {c['id']: c for c in site['clubs']},
+        'event': {e['id']: e for e in site['events']},
+    })
+
+
+# ─── Service worker precache manifest (dist/sw-manifest.json) ─────────────────
+#
+# public/sw.js serves the entries below cache-first for repeat visitors:
+#   {"v": 1, "version": <digest of all entries>, "generatedAt": iso,
+#    "assets": {"/assets/...": hash}, "routes": {"/clubs/goa/": hash, ...}}
+# Assets are the Vite shell the template references; routes are the hot
+# landing pages (home, hubs, city pages, the clubs with most upcoming events).
+# Hashes are of the bytes written to dist/, so when the worker syncs to a new
+# version it keeps every entry whose hash is unchanged and refetches only the
+# rest. --watch removes the manifest, which makes an installed worker
+# unregister itself (it would otherwise hide re-rendered pages).
+
+SW_MANIFEST = DIST_DIR / 'sw-manifest.json'
+SW_MANIFEST_VERSION = 1
+SW_TOP_CLUBS = 12  # club pages precached, by upcoming event count
+SHELL_ASSET_RE = re.compile(r'(?:src|href)="(/assets/[^"]+)"')
+
+
+def hot_routes(site, rendered):
+    """Landing routes worth precaching, most visited first."""
+    routes = ['/', '/clubs/', '/explore/']
+    routes += [route_path(f'/clubs/{city.lower().replace(" ", "-")}') for city in CITIES]
+    top = sorted(site['clubs'], key=lambda c: -len(site['events_by_club'].get(c['id'], [])))[:SW_TOP_CLUBS]
+    routes += [route_path(rendered[f'club:{c["id"]}'][0]) for c in top if rendered.get(f'club:{c["id"]}')]
+    return [r for r in dict.fromkeys(routes) if r in ROUTE_SIZES]
+
+
+def write_sw_manifest(template, site, rendered):
+    """Versioned precache manifest of the shell assets and hot routes, with content hashes."""
+    assets = {}
+    for href in dict.fromkeys(SHELL_ASSET_RE.findall(template)):
+        path = DIST_DIR / href.lstrip('/')
+        if path.is_file():
+            assets[href] = content_hash(path.read_bytes())
+    routes = {r: content_hash((DIST_DIR / r.strip('/') / 'index.html').read_bytes()) for r in hot_routes(site, rendered)}
+    version = hashlib.sha256(json.dumps([assets, routes], sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    manifest = {'v': SW_MANIFEST_VERSION, 'version': version,
+                'generatedAt': datetime.now(timezone.utc).isoformat(), 'assets': assets, 'routes': routes}
+    SW_MANIFEST.write_text(json.dumps(manifest, separators=(',', ':')), encoding='utf-8')
+    size = sum((DIST_DIR / href.lstrip('/')).stat().st_size for href in assets) + sum(ROUTE_SIZES[r] for r in routes)
+    print(f'  Service worker precache: {len(routes)} routes + {len(assets)} assets, '
+          f'{size / 1024:.1f} KB (version {version})')
+
+
+# ─── Render checkpoints (resumable builds) ────────────────────────────────────
+#
+# deploy.yml cancels an in-progress build when a newer content-update arrives,
+# so a burst of dispatches can kill a prerender repeatedly near the end. Every
+# rendered key is appended to .api-cache/render-checkpoint.bin (which the
+# workflow saves even for cancelled runs) together with the short link codes
+# obtained so far:
+#
+#   header line: {"v": 2, "hash": <digest of this script, template, render options, UTC date>}
+#   records:     >I length + zlib JSON (the template as preset dictionary, so
+#                each record only costs what its pages add to the shell)
+#     first:     {"inputs": {"clubs", "events", "archive": {id: record digest}, "image_dims"},
+#                 "shortlinks": [[type, id, code], ...]}
+#     then:      {"key", "routes": [[path, html index], ...], "html": [html, ...],
+#                 "shortlinks": [[type, id, code], ...]}
+#
+# A run with the same header hash compares its data with the checkpoint's
+# inputs: keys whose pages can differ (affected_keys(), plus pages whose image
+# size or archive record changed) are rendered again, every other finished key
+# is replayed as is. The file is then rewritten with the new inputs and the
+# kept records, so a later resume compares against the data those were
+# rendered from. A torn last record is simply dropped. The file is removed once
+# a build completes, and --no-checkpoint / --watch never use it.
+
+CHECKPOINT_FILE = CACHE_DIR / 'render-checkpoint.bin'
+CHECKPOINT_VERSION = 2
+CHECKPOINT_RECORD = struct.Struct('>I')
+CHECKPOINT = {'file': None, 'done': {}, 'saved_codes': set(), 'zdict': b''}
+
+
+def checkpoint_hash(template):
+    """Digest of what shapes every page: code, template, render options and the date."""
+    options = sorted(arg for arg in sys.argv[1:] if arg not in ('--cached', '--no-checkpoint'))
+    h = hashlib.sha256()
+    for part in (Path(__file__).read_bytes(), template.encode('utf-8'),
+                 json.dumps([options, datetime.now(timezone.utc).strftime('%Y-%m-%d')]).encode('utf-8')):
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
+def checkpoint_inputs(site):
+    """The data a checkpoint's pages were rendered from (archive records as digests)."""
+    return {
+        'clubs': site['clubs'],
+        'events': site['events'],
+        'archive': {i: content_hash(json.dumps(r, sort_keys=True).encode('utf-8')) for i, r in site['archive'].items()},
+        'image_dims': site['image_dims'],
+    }
 
-        html = inject_meta(template,
-            title=f'{event["title"]} at {event.get("club", "")} - {nice_date} | Guestlist & Tickets | Clubin',
-            description=f'{event["title"]} at {event.get("club", "")}, {event_location} on {nice_date}. Entry: {event_price_text(event)}. {event.get("description", "Book your spot on Clubin!")[:110]}',
-            image=event.get('imageUrl', OG_IMAGE),
-            url=event_url,
-            structured_data=[
-                event_sd,
-                {
-                    '@context': 'https://schema.org',
-                    '@type': 'BreadcrumbList',
-                    'itemListElement': [
-                        {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
-                        {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
-                        *([{'@type': 'ListItem', 'position': 3, 'name': event.get('club', ''), 'item': page_url(f'/clubs/{city_slug}')}] if city_slug else []),
-                        {'@type': 'ListItem', 'position': 4 if city_slug else 3, 'name': event['title']},
-                    ],
-                },
-            ]
-        )
-        html = inject_body(html, event_body)
-        write_route(f'/events/{event_seg}', html)
-        count += 1
-        # Legacy bare-UUID path → same content, canonical points to the slug URL.
-        if event_seg != event['id']:
-            write_route(f'/events/{event["id"]}', html)
-            count += 1
-
-        # Also create a short link and pre-render /e/:code so social media crawlers
-        # see OG tags when short links are shared (crawlers don't execute JS)
-        result = post_json(f'{API_BASE}/shortlinks', {'type': 'event', 'targetId': event['id']})
-        if result and result.get('code'):
-            write_route(f'/e/{result["code"]}', html)
-            shortlink_count += 1
-            count += 1
-
-    # 5. Promoter pages
-    for pid, promoter in promoter_map.items():
-        name = promoter.get('name', 'Promoter')
-        region = promoter.get('region', '')
-        promoter_url = page_url(f'/promoters/{pid}')
-        promoter_events = events_by_promoter.get(pid, [])
-        promoter_body = body_wrap(
-            f'<h1>{esc(name)}</h1>'
-            + (f'<p class="muted">Event promoter in {esc(region)}</p>' if region else '<p class="muted">Event promoter</p>')
-            + event_list_html(promoter_events, heading=f'Upcoming Events by {name}')
-            + f'<p>Browse parties and nightclub events by {esc(name)} and book guestlist entry on Clubin.</p>'
-        )
-        html = inject_meta(template,
-            title=f'{name} - Event Promoter{f" in {region}" if region else ""} | Clubin',
-            description=f'{name} is an event promoter{f" based in {region}" if region else ""}. Browse their upcoming nightclub events and parties on Clubin.',
-            image=promoter.get('logoUrl', OG_IMAGE),
-            url=promoter_url,
-            structured_data=[
-                {
-                    '@context': 'https://schema.org',
-                    '@type': 'Organization',
-                    'name': name,
-                    'url': promoter_url,
-                    'image': promoter.get('logoUrl'),
-                },
-                {
-                    '@context': 'https://schema.org',
-                    '@type': 'BreadcrumbList',
-                    'itemListElement': [
-                        {'@type': 'ListItem', 'position': 1, 'name': 'Home', 'item': f'{SITE_URL}/'},
-                        {'@type': 'ListItem', 'position': 2, 'name': 'Clubs', 'item': clubs_url},
-                        {'@type': 'ListItem', 'position': 3, 'name': name},
-                    ],
-                },
-            ]
-        )
-        write_route(f'/promoters/{pid}', inject_body(html, promoter_body))
-        count += 1
+
+def checkpoint_stale_keys(inputs, site):
+    """Keys whose pages can differ between the checkpoint's inputs and site."""
+    old = index_site(inputs['clubs'], inputs['events'])
+    stale = set(affected_keys(old, site))
+    new = checkpoint_inputs(site)
+    stale |= {f'archived:{i}' for i in inputs['archive'].keys() | new['archive'].keys()
+              if inputs['archive'].get(i) != new['archive'].get(i)}
+    old_dims, dims = inputs['image_dims'], json.loads(json.dumps(site['image_dims']))
+    resized = {url for url in old_dims.keys() | dims.keys() if old_dims.get(url) != dims.get(url)}
+    if resized:
+        stale |= {f'club:{c["id"]}' for c in site['clubs'] if c.get('imageUrl') in resized}
+        stale |= {f'event:{e["id"]}' for e in site['events'] if e.get('imageUrl') in resized}
+        stale |= {f'promoter:{pid}' for pid, p in site['promoter_map'].items() if p.get('logoUrl') in resized}
+    return stale
+
+
+def pack_checkpoint_record(record):
+    c = zlib.compressobj(1, zdict=CHECKPOINT['zdict'])
+    data = c.compress(json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')) + c.flush()
+    return CHECKPOINT_RECORD.pack(len(data)) + data
+
+
+def unpack_checkpoint_record(data):
+    d = zlib.decompressobj(zdict=CHECKPOINT['zdict'])
+    return json.loads(d.decompress(data) + d.flush())
+
+
+def read_checkpoint(digest):
+    """(inputs, {key: packed record}, {(type, id): code}) from a checkpoint for digest; inputs None if unusable."""
+    done, codes = {}, {}
+    try:
+        with open(CHECKPOINT_FILE, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('v') != CHECKPOINT_VERSION or header.get('hash') != digest:
+                return None, {}, {}
+            inputs = None
+            while True:
+                prefix = f.read(CHECKPOINT_RECORD.size)
+                if len(prefix) < CHECKPOINT_RECORD.size:
+                    break
+                (length,) = CHECKPOINT_RECORD.unpack(prefix)
+                data = f.read(length)
+                if len(data) < length:
+                    break  # torn write from a killed run
+                record = unpack_checkpoint_record(data)
+                if inputs is None:
+                    inputs = record['inputs']
+                else:
+                    done[record['key']] = prefix + data  # unpacked again only if replayed
+                codes.update(((kind, ident), code) for kind, ident, code in record['shortlinks'])
+    except (OSError, ValueError, KeyError, zlib.error):
+        return None, {}, {}
+    return inputs, done, codes
+
+
+def open_checkpoint(template, site):
+    """
+    Load a matching checkpoint (preloading its short link codes), drop the keys
+    the data changed since, and rewrite it for this run's inputs to append to.
+    """
+    digest = checkpoint_hash(template)
+    CHECKPOINT['zdict'] = template.encode('utf-8')
+    inputs, done, codes = read_checkpoint(digest)
+    SHORTLINK_CODES.update(codes)
+    stale = checkpoint_stale_keys(inputs, site) if inputs is not None else set()
+    kept = {key: data for key, data in done.items() if key not in stale}
+    if inputs is not None:
+        print(f'  Resuming from checkpoint: {len(kept)} of {len(done)} keys unchanged, {len(codes)} short link codes')
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = CHECKPOINT_FILE.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(json.dumps({'v': CHECKPOINT_VERSION, 'hash': digest}).encode('utf-8') + b'\n')
+        f.write(pack_checkpoint_record({'inputs': checkpoint_inputs(site),
+                                        'shortlinks': [[kind, ident, code] for (kind, ident), code in codes.items()]}))
+        for data in kept.values():
+            f.write(data)
+    os.replace(tmp, CHECKPOINT_FILE)
+    CHECKPOINT.update(done=kept, saved_codes=set(codes), file=open(CHECKPOINT_FILE, 'ab'))
+
+
+def checkpoint_routes(key):
+    """Routes a resumed checkpoint already holds for key (used once), or None."""
+    data = CHECKPOINT['done'].pop(key, None)
+    if data is None:
+        return None
+    record = unpack_checkpoint_record(data[CHECKPOINT_RECORD.size:])
+    return [(path, record['html'][i]) for path, i in record['routes']]
+
+
+def checkpoint_key(key, routes):
+    """Append a rendered key, plus any short link codes obtained since the last record."""
+    f = CHECKPOINT['file']
+    if f is None:
+        return
+    fresh = [(kind, ident, code) for (kind, ident), code in SHORTLINK_CODES.items()
+             if code and (kind, ident) not in CHECKPOINT['saved_codes']]
+    html = {}  # alias routes (legacy bare-UUID paths) share their page's HTML
+    paths = [(path, html.setdefault(route_html, len(html))) for path, route_html in routes]
+    f.write(pack_checkpoint_record({'key': key, 'routes': paths, 'html': list(html), 'shortlinks': fresh}))
+    f.flush()
+    CHECKPOINT['saved_codes'].update((kind, ident) for kind, ident, _code in fresh)
+
+
+def close_checkpoint(complete):
+    """Stop checkpointing; a completed build has nothing left to resume."""
+    f = CHECKPOINT['file']
+    if f is None:
+        return
+    f.close()
+    CHECKPOINT.update(file=None, done={})
+    if complete:
+        CHECKPOINT_FILE.unlink(missing_ok=True)
+
+
+# ─── Watch mode (local iteration) ─────────────────────────────────────────────
+#
+# `--watch` does one normal render, then keeps the template, data and indexes in
+# memory, serves dist/ on http://127.0.0.1:4173/ and polls for changes:
+#   .api-cache/clubs.json, events.json  -> re-render only the affected keys
+#   dist/index.html (fresh `vite build`) -> re-render everything, no refetch
+#   scripts/prerender.py                -> reload the builders, re-render everything
+# No network in the loop: no API fetches, no shortlink POSTs, no image probes,
+# and the event archive is only updated in memory.
+
+WATCH_PORT = 4173
+WATCH_POLL_SECONDS = 0.3
+
+
+def entity_areas(site, location, city_slug):
+    """Area keys (city + matching sub-areas) a club/event at location is listed under."""
+    keys = {f'city:{city_slug}'} if city_slug in site['areas'] else set()
+    for sub_slug, _name, needles in SUBCITIES:
+        if sub_slug in site['areas'] and location_matches(location or '', needles):
+            keys.add(f'city:{sub_slug}')
+    return keys
+
+
+def affected_keys(old, new):
+    """Keys whose pages can differ between two snapshots (same template and code)."""
+    def changed(a, b):
+        return {i for i in a.keys() | b.keys()
+                if json.dumps(a.get(i), sort_keys=True) != json.dumps(b.get(i), sort_keys=True)}
+
+    keys = {'hubs'}
+    for cid in changed(old['club_by_id'], new['club_by_id']):
+        keys.add(f'club:{cid}')
+        for site in (old, new):
+            club = site['club_by_id'].get(cid)
+            if not club:
+                continue
+            keys |= entity_areas(site, club.get('location', ''), get_city_slug(club.get('location', 'india')))
+            keys |= {f'promoter:{pc["promoter"]["id"]}' for pc in club.get('promoterClubs', [])
+                     if (pc.get('promoter') or {}).get('id')}
+            # Event pages link to the club by name and show its address
+            keys |= {f'event:{e["id"]}' for e in site['all_events_by_club'].get(cid, [])}
+    for eid in changed(old['event_by_id'], new['event_by_id']):
+        keys |= {f'event:{eid}', f'archived:{eid}'}
+        for site in (old, new):
+            event = site['event_by_id'].get(eid)
+            if not event:
+                continue
+            keys |= entity_areas(site, event.get('location') or event.get('region', ''), event_city_slug(event))
+            if event.get('clubId'):
+                keys.add(f'club:{event["clubId"]}')
+            if (event.get('promoterRef') or {}).get('id'):
+                keys.add(f'promoter:{event["promoterRef"]["id"]}')
+    order = {key: n for n, key in enumerate(site_keys(new))}
+    return sorted(keys, key=lambda k: order.get(k, len(order)))
+
+
+def is_vite_template(html):
+    """A fresh `vite build` output (empty #root), as opposed to a page we rendered."""
+    return re.search(r'<div id="root">\s*</div>', html) is not None
+
+
+def read_cached_snapshot():
+    """(clubs, events) from .api-cache, or None while a file is missing or half-written."""
+    try:
+        return load_snapshot(CACHE_DIR / 'clubs.json'), load_snapshot(CACHE_DIR / 'events.json')
+    except (OSError, ValueError):
+        return None
+
+
+def load_builders():
+    """A fresh copy of this script's code, or None (with the error printed) if it doesn't import."""
+    spec = importlib.util.spec_from_file_location('prerender_watch', Path(__file__).resolve())
+    mod = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(mod)
+    except Exception:
+        traceback.print_exc()
+        return None
+    return mod
+
+
+def serve_dist(port):
+    """Serve dist/ like GitHub Pages (dir/index.html, 404.html for misses) on a background thread."""
+    not_found = DIST_DIR / '404.html'
+
+    class DistHandler(SimpleHTTPRequestHandler):
+        def send_error(self, code, message=None, explain=None):
+            if code != 404 or not not_found.exists():
+                return super().send_error(code, message, explain)
+            body = not_found.read_bytes()
+            self.send_response(404)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(DistHandler, directory=str(DIST_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch_stamps():
+    """{path: (what, mtime)} for every file --watch reacts to."""
+    watched = {
+        'data': [CACHE_DIR / 'clubs.json', CACHE_DIR / 'events.json'],
+        'template': [DIST_DIR / 'index.html'],
+        'code': [Path(__file__).resolve()],
+    }
+    stamps = {}
+    for what, paths in watched.items():
+        for path in paths:
+            try:
+                stamps[path] = (what, path.stat().st_mtime_ns)
+            except OSError:
+                stamps[path] = (what, None)
+    return stamps
+
+
+def watch(template, site, archive, rendered, retention_days, seen):
+    """Poll for changes and re-render; seen is watch_stamps() from before the first render."""
+    port = int(cli_option('port', WATCH_PORT))
+    server = serve_dist(port)
+    print(f'\nWatching .api-cache/, dist/index.html and {Path(__file__).name} — serving http://127.0.0.1:{port}/ (Ctrl+C to stop)')
+
+    mod = sys.modules[__name__]
+    try:
+        while True:
+            time.sleep(WATCH_POLL_SECONDS)
+            now = watch_stamps()
+            changed = {what for path, (what, stamp) in now.items() if seen.get(path) != (what, stamp)}
+            if not changed:
+                continue
+            seen = now
+            started = time.perf_counter()
+
+            if 'template' in changed:
+                html = (DIST_DIR / 'index.html').read_text(encoding='utf-8')
+                if is_vite_template(html):
+                    template = html
+                    mod.CRITICAL_CSS.clear()  # the CSS bundle may have changed too
+                else:
+                    changed.discard('template')  # our own write_home(), or a non-Vite edit
+            if 'code' in changed:
+                fresh = load_builders()
+                if fresh is None:
+                    changed.discard('code')
+                else:
+                    mod = fresh
+            if not changed:
+                continue
+
+            if 'data' in changed:
+                snapshot = read_cached_snapshot()
+                if snapshot is None:
+                    continue  # retried on the next poll
+            else:
+                snapshot = site['clubs'], site['events']
+            new_site = mod.index_site(*snapshot, image_dims=site['image_dims'])
+            mod.update_event_archive(new_site, archive, retention_days)
+
+            if changed & {'template', 'code'}:
+                reason = ' + '.join(sorted(changed))
+                keys = mod.site_keys(new_site)
+            else:
+                reason = 'data'
+                keys = mod.affected_keys(site, new_site)
+            count = mod.render_keys(template, new_site, keys, rendered)
+            if 'data' in changed:
+                mod.write_site_data(new_site)
+            site = new_site
+            print(f'  [{time.strftime("%H:%M:%S")}] {reason} changed: re-rendered {count} route(s) '
+                  f'for {len(keys)} key(s) in {(time.perf_counter() - started) * 1000:.0f} ms')
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+# ─── Main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    print('Pre-rendering pages for GitHub Pages SEO...')
+    check_sitemap_page_size()  # validates CITY_PAGE_SIZE before any network or render work
+    stamps = watch_stamps()
+    template = read_template()
+    if is_vite_template(template):
+        save_template_snapshot(template)
+    elif '--watch' in sys.argv:
+        print(f'Error: {DIST_DIR / "index.html"} is already pre-rendered. Run `npm run build` first.')
+        sys.exit(1)
+
+    # Fetch data
+    print('Fetching API data...')
+    start_network_phase()
+    clubs = fetch_json_cached(f'{API_BASE}/clubs', CACHE_DIR / 'clubs.json') or []
+    events = fetch_json_cached(f'{API_BASE}/events', CACHE_DIR / 'events.json') or []
+
+    # Index data for cross-linking
+    site = index_site(clubs, events)
+
+    # Past events — frozen once into the archive, then only re-templated
+    retention_days = int(cli_option('event-retention-days', EVENT_RETENTION_DAYS))
+    archive = load_event_archive()
+    newly_archived = update_event_archive(site, archive, retention_days)
+    if '--watch' not in sys.argv:
+        save_event_archive(archive)
+
+    # Probe hero/og image sizes once (cached across builds) for CLS/LCP hints
+    start_network_phase()
+    site['image_dims'] = probe_image_dims(site_image_urls(site))
+
+    # Every page: static, hubs, city pages (paginated), clubs, archived events,
+    # live events, promoters — plus /c/ and /e/ short link pages
+    rendered = {}
+    if '--watch' not in sys.argv and '--no-checkpoint' not in sys.argv:
+        open_checkpoint(template, site)
+    start_network_phase()  # shortlink POSTs
+    count = render_keys(template, site, site_keys(site), rendered)
+    close_checkpoint(complete=True)
+    shortlink_count = sum(path.startswith('/e/') for key, paths in rendered.items()
+                          if key.startswith('event:') for path in paths)
+
+    write_site_data(site)
 
     print(f'Pre-rendered {count} pages into {DIST_DIR}/')
-    print(f'  Cities: {len(CITIES)}, Clubs: {len(clubs)}, Events: {len(events)} ({len(upcoming)} upcoming), Promoters: {len(promoter_map)}')
+    print(f'  Cities: {len(CITIES)}, Clubs: {len(clubs)}, Events: {len(events)} ({len(site["upcoming"])} upcoming), Promoters: {len(site["promoter_map"])}')
     print(f'  Short links (events): {shortlink_count}')
+    print(f'  Archived events: {len(archive)} carried forward ({newly_archived} newly frozen, retention {retention_days} days)')
+    network_report()
+    critical_css_report()
+    speculation_report()
+
+    if '--watch' in sys.argv:
+        SW_MANIFEST.unlink(missing_ok=True)
+        watch(template, site, archive, rendered, retention_days, stamps)
+        return
+    write_sw_manifest(template, site, rendered)
+
+    # Budgets warn by default (never break the deploy over page weight);
+    # --budget-mode=fail turns an overrun into a failed build.
+    violations = route_size_report()
+    for v in violations:
+        print(f'::warning::Route size budget exceeded: {v}')
+    if violations and cli_option('budget-mode', 'warn') == 'fail':
+        print(f'Error: {len(violations)} route size budget(s) exceeded.')
+        sys.exit(1)
 
 
 if __name__ == '__main__':
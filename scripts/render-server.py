@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+On-demand renderer for routes the last build didn't pre-render.
+
+The cron build pre-renders every club and event that existed at build time;
+anything created since 404s for crawlers until the next deploy. This service
+renders such routes on request with prerender.py's own page builders
+(render_key -> club_routes / event_routes / promoter_routes / city_routes ...),
+so its HTML is identical to what the next build will write:
+
+  1. rendered HTML is served from an in-memory LRU cache, each entry with a TTL
+  2. on a miss the route is rendered from the .api-cache snapshot; clubs and
+     events missing from it are fetched from the API (and re-fetched once
+     their TTL has passed), and the cached pages they affect are dropped
+  3. unknown ids, and paths that aren't a route of the site, are cached as
+     404s for a shorter TTL (without rendering anything)
+  4. --warm pre-renders the last build's routes (.api-cache/route-sizes.json),
+     hub and city pages first
+
+Usage:
+  python3 scripts/render-server.py [--port=8788] [--cache-size=2000] [--ttl=300]
+                                   [--warm[=N]] [--api-base=URL]
+  GET  /<route>/                 rendered HTML (X-Render-Cache: hit | miss)
+  GET  /__render/stats           cache, snapshot and network counters (JSON)
+  POST /__render/invalidate      drop every cached route (?path=/events/x/ for one)
+
+Against the mock API:
+  python3 scripts/dev/mock-api-server.py &
+  python3 scripts/render-server.py --api-base=http://127.0.0.1:5175/api
+  curl -X POST localhost:5175/__mock/events -d '{"id": "...", "title": "...", "date": "..."}'
+  curl localhost:8788/events/<id>/
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import prerender  # noqa: E402
+
+RENDER_PORT = 8788
+RENDER_CACHE_SIZE = 2000  # rendered routes kept in memory
+RENDER_TTL = 300  # seconds a rendered route (and an API-fetched entity) stays fresh
+NOT_FOUND_TTL = 30  # seconds an unknown route is remembered as a 404
+BREAKER_COOLDOWN = 30  # seconds before retrying an API whose circuit opened
+SNAPSHOT_CHECK_SECONDS = 5  # how often to look for a newer .api-cache snapshot
+# A trailing UUID, e.g. "kitty-su-72c91c8c-...". MUST match extractId() in src/lib/urls.ts.
+TRAILING_UUID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+WARM_ORDER = ('home', 'city', 'club', 'promoter', 'static', 'event')
+NOT_FOUND_HTML = '<!doctype html><title>Not found | Clubin</title><h1>Page not found</h1>'
+
+
+def extract_id(segment):
+    m = TRAILING_UUID.search(segment)
+    return m.group(0) if m else segment
+
+
+class RenderCache:
+    """LRU of rendered HTML (None marks a known 404) with a per-entry expiry."""
+
+    def __init__(self, max_entries, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()  # path -> (expires, site key, html)
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, path):
+        """(True, html) for a fresh entry, else (False, None)."""
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry[0] > self.clock():
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return True, entry[2]
+            if entry:
+                del self.entries[path]
+            self.misses += 1
+            return False, None
+
+    def put(self, path, html, ttl, key=None):
+        with self.lock:
+            self.entries[path] = (self.clock() + ttl, key, html)
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path=None, keys=None):
+        """Drop one path, every route rendered from one of keys, or (no arguments) everything."""
+        with self.lock:
+            if path is None and keys is None:
+                dropped = len(self.entries)
+                self.entries.clear()
+                return dropped
+            drop = [p for p, (_expires, key, _html) in self.entries.items() if p == path or (keys and key in keys)]
+            for p in drop:
+                del self.entries[p]
+            return len(drop)
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'maxEntries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class RenderService:
+    """The build's site index plus entities fetched since, rendered through an LRU cache."""
+
+    def __init__(self, cache_size=RENDER_CACHE_SIZE, ttl=RENDER_TTL, not_found_ttl=NOT_FOUND_TTL):
+        self.cache = RenderCache(cache_size)
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.retention_days = int(prerender.cli_option('event-retention-days', prerender.EVENT_RETENTION_DAYS))
+        self.lock = threading.RLock()  # guards template/site/archive/fetched swaps
+        self.fetched = {}  # (kind, id) -> time.monotonic() it was fetched from the API
+        self.checked_at = 0.0
+        self.stamps = None
+        self.load_snapshot()
+
+    # ── Snapshot ────────────────────────────────────────────────────
+
+    def snapshot_stamps(self):
+        stamps = []
+        for path in (prerender.CACHE_DIR / 'clubs.json', prerender.CACHE_DIR / 'events.json', prerender.TEMPLATE_SNAPSHOT):
+            try:
+                stamps.append(path.stat().st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def load_snapshot(self):
+        """(Re)build the site index from .api-cache; every cached route is dropped."""
+        stamps = self.snapshot_stamps()
+        try:
+            template = prerender.TEMPLATE_SNAPSHOT.read_text(encoding='utf-8')
+        except OSError:
+            template = prerender.read_template()
+            if not prerender.is_vite_template(template):
+                raise SystemExit(f'Error: no Vite shell — run `npm run build` once to write {prerender.TEMPLATE_SNAPSHOT}')
+        snapshot = prerender.read_cached_snapshot()
+        if snapshot is None:
+            raise SystemExit(f'Error: no API snapshot in {prerender.CACHE_DIR} — run `npm run build` once')
+        site = prerender.index_site(*snapshot, image_dims=prerender.probe_image_dims([]))
+        archive = prerender.load_event_archive()
+        prerender.update_event_archive(site, archive, self.retention_days)
+        static_paths = {prerender.route_path(path) for path, _html in prerender.static_routes(template)}
+        with self.lock:
+            self.template, self.site, self.archive = template, site, archive
+            self.static_paths = static_paths
+            self.fetched = {}
+            self.stamps = stamps
+            with prerender.CRITICAL_CSS_LOCK:
+                prerender.CRITICAL_CSS.clear()
+        self.cache.invalidate()
+        print(f'  Snapshot: {len(site["clubs"])} clubs, {len(site["events"])} events, {len(archive)} archived')
+
+    def maybe_reload(self):
+        """Pick up a newer snapshot (a fresh build) at most every SNAPSHOT_CHECK_SECONDS."""
+        now = time.monotonic()
+        if now - self.checked_at < SNAPSHOT_CHECK_SECONDS:
+            return
+        self.checked_at = now
+        if self.snapshot_stamps() != self.stamps:
+            self.load_snapshot()
+
+    # ── Entities newer than the snapshot ────────────────────────────
+
+    def fetch_entity(self, kind, ident):
+        """A club/event from the API, or None (unknown id, or API unavailable)."""
+        if not prerender.SAFE_DATA_NAME_RE.fullmatch(ident):
+            return None
+        prerender.close_cooled_circuits(BREAKER_COOLDOWN)
+        record = prerender.fetch_json(f'{prerender.API_BASE}/{kind}s/{quote(ident)}', retries=1, timeout=5)
+        return record if isinstance(record, dict) and record.get('id') == ident else None
+
+    def add_entity(self, kind, record):
+        """Index a fetched club/event and drop the cached pages it changes."""
+        with self.lock:
+            old = self.site
+            clubs, events = dict(old['club_by_id']), dict(old['event_by_id'])
+            (clubs if kind == 'club' else events)[record['id']] = record
+            site = prerender.index_site(list(clubs.values()), list(events.values()), image_dims=old['image_dims'])
+            prerender.update_event_archive(site, self.archive, self.retention_days)
+            self.site = site
+            self.fetched[(kind, record['id'])] = time.monotonic()
+        self.cache.invalidate(keys=set(prerender.affected_keys(old, site)))
+
+    def ensure_entity(self, kind, ident):
+        """Make sure a club/event is indexed, fetching it (again, after its TTL) if needed."""
+        with self.lock:
+            table = self.site['club_by_id' if kind == 'club' else 'event_by_id']
+            fetched_at = self.fetched.get((kind, ident))
+            if ident in self.archive or (ident in table and (fetched_at is None or time.monotonic() - fetched_at < self.ttl)):
+                return
+        record = self.fetch_entity(kind, ident)
+        if record:
+            self.add_entity(kind, record)
+
+    # ── Rendering ───────────────────────────────────────────────────
+
+    def route_key(self, parts):
+        """The site key (see prerender.render_key) a request path belongs to, or None."""
+        if parts in ([], ['clubs'], ['explore']):
+            return 'hubs'
+        if parts[0] == 'clubs' and (len(parts) == 2 or len(parts) == 4 and parts[2] == 'page'):
+            return f'city:{parts[1]}'
+        if parts[0] == 'clubs' and len(parts) == 3:
+            return f'club:{extract_id(parts[2])}'
+        if parts[0] == 'events' and len(parts) == 2:
+            ident = extract_id(parts[1])
+            return f'archived:{ident}' if ident in self.archive else f'event:{ident}'
+        if parts[0] == 'promoters' and len(parts) == 2:
+            return f'promoter:{parts[1]}'
+        with self.lock:
+            static = '/' + '/'.join(parts) + '/' in self.static_paths
+        return 'static' if static else None
+
+    def shortlink_key(self, prefix, code):
+        """Site key behind /c/:code or /e/:code, resolved through the API."""
+        kind = 'club' if prefix == 'c' else 'event'
+        if not prerender.SAFE_DATA_NAME_RE.fullmatch(code):
+            return None
+        prerender.close_cooled_circuits(BREAKER_COOLDOWN)
+        result = prerender.fetch_json(f'{prerender.API_BASE}/shortlinks/{quote(code)}', retries=1, timeout=5)
+        record = (result or {}).get('data')
+        if not result or result.get('type') != kind or not isinstance(record, dict) or not record.get('id'):
+            return None
+        with self.lock:
+            known = record['id'] in self.site[f'{kind}_by_id'] or record['id'] in self.archive
+        if not known:
+            self.add_entity(kind, record)
+        return f'archived:{record["id"]}' if record['id'] in self.archive else f'{kind}:{record["id"]}'
+
+    def render_route(self, path):
+        """Render the key behind path, cache every route it produced; html for path or None."""
+        parts = path.strip('/').split('/') if path != '/' else []
+        if len(parts) == 2 and parts[0] in ('c', 'e'):
+            key = self.shortlink_key(parts[0], parts[1])
+            if key is None:
+                self.cache.put(path, None, self.not_found_ttl)
+                return None
+        else:
+            key = self.route_key(parts)
+            if key is None:
+                self.cache.put(path, None, self.not_found_ttl)
+                return None
+            kind, _, ident = key.partition(':')
+            if kind in ('club', 'event'):
+                self.ensure_entity(kind, ident)
+        with self.lock:
+            template, site = self.template, self.site
+        html = None
+        for route, route_html in prerender.render_key(template, site, key):
+            route = prerender.route_path(route)
+            route_html = prerender.inline_critical_css(route_html, prerender.route_type(route))
+            route_html = prerender.inject_speculation_rules(route_html, route)
+            self.cache.put(route, route_html, self.ttl, key)
+            # /c/ and /e/ serve the entity's canonical page (short link POSTs are off here)
+            if route == path or html is None and parts[:1] in (['c'], ['e']):
+                html = route_html
+        if html is None:
+            self.cache.put(path, None, self.not_found_ttl, key)
+        elif parts[:1] in (['c'], ['e']):
+            self.cache.put(path, html, self.ttl, key)
+        return html
+
+    def render(self, path):
+        """(html or None, 'hit' | 'miss') for a normalised route path."""
+        self.maybe_reload()
+        hit, html = self.cache.get(path)
+        if hit:
+            return html, 'hit'
+        return self.render_route(path), 'miss'
+
+    def warm(self, limit):
+        """Render up to limit routes of the last build, hubs and city pages first."""
+        try:
+            with open(prerender.ROUTE_SIZES_MANIFEST) as f:
+                routes = json.load(f)['routes']
+        except (OSError, ValueError, KeyError) as e:
+            print(f'  Warning: cannot warm from {prerender.ROUTE_SIZES_MANIFEST}: {e}')
+            return 0
+        order = {kind: n for n, kind in enumerate(WARM_ORDER)}
+        # Short links need an API round-trip each; they're in the static build anyway
+        paths = [p for p in routes if not p.startswith(('/c/', '/e/'))]
+        paths.sort(key=lambda p: order.get(prerender.route_type(p), len(order)))
+        started = time.perf_counter()
+        warmed = 0
+        for path in paths[:limit]:
+            hit, _html = self.cache.get(path)
+            if not hit:
+                self.render_route(path)
+            warmed += 1
+        print(f'  Warmed {warmed} route(s) in {time.perf_counter() - started:.1f}s '
+              f'({self.cache.stats()["entries"]} cached)')
+        return warmed
+
+    def stats(self):
+        with self.lock:
+            site = self.site
+            fetched = len(self.fetched)
+        return {
+            'cache': self.cache.stats(),
+            'snapshot': {'clubs': len(site['clubs']), 'events': len(site['events']),
+                         'archived': len(site['archive']), 'fetchedSinceBuild': fetched},
+            'network': {'requests': prerender.NETWORK['requests'], 'failed': prerender.NETWORK['failed'],
+                        'circuitOpen': sorted(prerender.NETWORK['open'])},
+        }
+
+
+def make_handler(service):
+    class RenderHandler(BaseHTTPRequestHandler):
+        def send_body(self, status, body, content_type, headers=()):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == '/__render/stats':
+                return self.send_body(200, json.dumps(service.stats()).encode('utf-8'), 'application/json')
+            if '.' in path.rsplit('/', 1)[-1]:
+                # Assets, sitemap, robots: the static host serves those
+                return self.send_body(404, NOT_FOUND_HTML.encode('utf-8'), 'text/html; charset=utf-8')
+            canonical = prerender.route_path(path)
+            if canonical != path:
+                # Same as GitHub Pages: the trailing-slash form is the real URL
+                self.send_response(301)
+                self.send_header('Location', canonical)
+                self.send_header('Content-Length', '0')
+                return self.end_headers()
+            html, state = service.render(path)
+            if html is None:
+                return self.send_body(404, NOT_FOUND_HTML.encode('utf-8'), 'text/html; charset=utf-8',
+                                      [('X-Render-Cache', state), ('Cache-Control', f'max-age={service.not_found_ttl}')])
+            self.send_body(200, html.encode('utf-8'), 'text/html; charset=utf-8',
+                           [('X-Render-Cache', state), ('Cache-Control', f'public, max-age={service.ttl}')])
+
+        do_HEAD = do_GET
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path != '/__render/invalidate':
+                return self.send_body(404, b'{}', 'application/json')
+            path = parse_qs(url.query).get('path', [None])[0]
+            dropped = service.cache.invalidate(path=prerender.route_path(path)) if path else service.cache.invalidate()
+            self.send_body(200, json.dumps({'dropped': dropped}).encode('utf-8'), 'application/json')
+
+        def log_message(self, fmt, *args):
+            print(f'  {self.command} {self.path} -> {args[1] if len(args) > 1 else ""}')
+
+    return RenderHandler
+
+
+def main():
+    api_base = prerender.cli_option('api-base')
+    if api_base:
+        prerender.API_BASE = api_base.rstrip('/')
+    prerender.SHORTLINK_POSTS = False
+    prerender.NETWORK['deadline'] = float('inf')  # a long-running service has no build deadline
+
+    print('Starting on-demand renderer...')
+    service = RenderService(
+        cache_size=int(prerender.cli_option('cache-size', RENDER_CACHE_SIZE)),
+        ttl=float(prerender.cli_option('ttl', RENDER_TTL)),
+    )
+    if '--warm' in sys.argv or prerender.cli_option('warm'):
+        service.warm(int(prerender.cli_option('warm', service.cache.max_entries)))
+
+    port = int(prerender.cli_option('port', RENDER_PORT))
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(service))
+    print(f'Rendering on http://127.0.0.1:{port}/ (API {prerender.API_BASE}, '
+          f'LRU {service.cache.max_entries} routes, TTL {service.ttl:g}s)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
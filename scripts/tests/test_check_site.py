@@ -0,0 +1,79 @@
+"""
+Tests for scripts/check-site.py on a tiny hand-written dist/.
+
+Run:
+  python3 -m unittest discover scripts/tests
+"""
+
+import contextlib
+import importlib.util
+import io
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+import prerender  # noqa: E402
+
+# check-site.py isn't importable by name (dash); load it like a module
+_spec = importlib.util.spec_from_file_location('check_site', SCRIPTS / 'check-site.py')
+check_site = importlib.util.module_from_spec(_spec)
+sys.modules['check_site'] = check_site
+_spec.loader.exec_module(check_site)
+
+
+def page(canonical=None, links=()):
+    head = f'<link rel="canonical" href="{prerender.SITE_URL}{canonical}" />' if canonical else ''
+    body = ''.join(f'<a href="{href}">{href}</a>' for href in links)
+    return f'<!doctype html><html><head>{head}</head><body>{body}</body></html>'
+
+
+class CheckSiteTest(unittest.TestCase):
+    def setUp(self):
+        self.dist = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dist, ignore_errors=True)
+        pages = {
+            '/': page('/', ['/clubs/goa/', '/about/', '/events/missing/']),  # last one: dangling
+            '/clubs/goa/': page('/clubs/goa/', ['/', '/clubs/goa/club-1/']),
+            '/clubs/goa/club-1/': page('/clubs/goa/club-1/', ['/']),
+            '/about/': page(None, ['/']),  # missing canonical
+            '/c/abc/': page('/c/def/'),  # an alias whose canonical is another alias
+            '/c/def/': page('/clubs/goa/club-1/'),
+            '/promoters/p1/': page('/promoters/p1/', ['/']),  # nothing links here: orphan
+        }
+        for path, html in pages.items():
+            out = self.dist / path.strip('/') / 'index.html'
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(html, encoding='utf-8')
+
+    def test_reports_each_planted_problem(self):
+        report = check_site.check_site(self.dist, workers=1)
+        self.assertEqual(report['routes'], 7)
+        self.assertEqual([target for target, _ in report['dangling']], ['/events/missing/'])
+        self.assertEqual(report['dangling'][0][1], [1, '/'])
+        self.assertCountEqual(report['canonical'], [
+            ('/about/', 'no canonical'),
+            ('/c/abc/', 'canonical /c/def/ is itself canonicalised to /clubs/goa/club-1/'),
+        ])
+        self.assertEqual(report['orphans'], ['/promoters/p1/'])
+
+    def run_main(self, *args):
+        out = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['check-site.py', f'--dist={self.dist}', '--workers=1', *args]), \
+                contextlib.redirect_stdout(out):
+            check_site.main()
+        return out.getvalue()
+
+    def test_fail_mode_exits_1(self):
+        with self.assertRaises(SystemExit) as exit_:
+            self.run_main('--mode=fail')
+        self.assertEqual(exit_.exception.code, 1)
+        self.assertIn('::warning::1 internal link target(s)', self.run_main())  # warn mode only warns
+
+
+if __name__ == '__main__':
+    unittest.main()
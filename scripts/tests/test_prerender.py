@@ -0,0 +1,300 @@
+"""
+Tests for scripts/prerender.py stages that don't need a Vite build.
+
+Run:
+  python3 -m unittest discover scripts/tests
+"""
+
+import functools
+import json
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import prerender  # noqa: E402
+
+
+def png_bytes(width, height):
+    header = struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + b'\x08\x06\x00\x00\x00'
+    return b'\x89PNG\r\n\x1a\n' + header + b'\x00' * 4 + b'\x00' * 200_000  # past IMAGE_PROBE_BYTES
+
+
+def day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime('%Y-%m-%dT00:00:00.000Z')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+
+class StaticServerTestCase(unittest.TestCase):
+    """A local static file server (no Range support, like a misbehaving CDN)."""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=str(self.root)))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        prerender.NETWORK.update(deadline=None, requests=0, failed=0, open={})
+        prerender.NETWORK['failures'].clear()
+        prerender.NETWORK['skipped'].clear()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class ImageProbeTest(StaticServerTestCase):
+    def test_probe_reads_size_from_header(self):
+        (self.root / 'hero.png').write_bytes(png_bytes(1200, 630))
+        (self.root / 'logo.gif').write_bytes(b'GIF89a' + struct.pack('<HH', 64, 32) + b'\x00' * 32)
+        self.assertEqual(prerender.probe_image_size(f'{self.base}/hero.png'), (1200, 630))
+        self.assertEqual(prerender.probe_image_size(f'{self.base}/logo.gif'), (64, 32))
+
+    def test_probe_dims_caches_hits_and_retries_misses(self):
+        (self.root / 'hero.png').write_bytes(png_bytes(800, 600))
+        cache = self.root / 'image-dims.json'
+        hero, missing = f'{self.base}/hero.png', f'{self.base}/missing.png'
+        self.assertEqual(prerender.probe_image_dims([hero, missing, None], cache_path=cache), {hero: (800, 600)})
+        (self.root / 'hero.png').unlink()  # a cached size must not be probed again
+        self.assertEqual(prerender.probe_image_dims([hero], cache_path=cache), {hero: (800, 600)})
+
+    @mock.patch.object(prerender, 'SHORTLINK_POSTS', False)
+    def test_only_rendered_images_are_probed(self):
+        clubs = [{'id': 'c1', 'name': 'Club', 'location': 'Goa', 'imageUrl': f'{self.base}/club.png'}]
+        events = [
+            {'id': 'e1', 'title': 'Live', 'clubId': 'c1', 'date': day(3), 'imageUrl': f'{self.base}/live.png'},
+            {'id': 'e2', 'title': 'Past', 'clubId': 'c1', 'date': day(-90), 'imageUrl': f'{self.base}/past.png'},
+        ]
+        site = prerender.index_site(clubs, events)
+        prerender.update_event_archive(site, {}, retention_days=30)
+        urls = prerender.site_image_urls(site)
+        self.assertIn(f'{self.base}/live.png', urls)
+        self.assertNotIn(f'{self.base}/past.png', urls)
+
+
+class NetworkBudgetTest(StaticServerTestCase):
+    def test_only_outages_trip_the_breaker(self):
+        (self.root / 'broken.json').write_text('{not json')
+        url = f'{self.base}/broken.json'
+        with mock.patch.object(prerender, 'cli_option', side_effect=lambda name, default: '2' if name == 'breaker-threshold' else default), \
+                mock.patch('time.sleep'):
+            for _ in range(3):
+                self.assertIsNone(prerender.fetch_json(url, retries=1))
+            self.assertNotIn(urlsplit(url).netloc, prerender.NETWORK['open'])  # the host answered
+            for _ in range(2):
+                prerender.network_result(url, socket.timeout('timed out'))
+        self.assertIn(urlsplit(url).netloc, prerender.NETWORK['open'])
+
+    def test_each_phase_gets_a_fresh_deadline(self):
+        prerender.NETWORK['deadline'] = time.monotonic() - 1  # an earlier phase used up its time
+        self.assertFalse(prerender.network_gate('GET /a', f'{self.base}/a'))
+        prerender.start_network_phase()
+        self.assertTrue(prerender.network_gate('GET /a', f'{self.base}/a'))
+
+
+class EventArchiveTest(unittest.TestCase):
+    def setUp(self):
+        prerender.SHORTLINK_CODES.clear()
+        self.addCleanup(prerender.SHORTLINK_CODES.clear)
+        self.addCleanup(prerender.SHORTLINK_REFUSED.clear)
+
+    def test_archived_event_without_short_link_gets_one_later(self):
+        clubs = [{'id': 'c1', 'name': 'Club', 'location': 'Goa'}]
+        events = [{'id': 'e1', 'title': 'Past', 'clubId': 'c1', 'location': 'Goa', 'date': day(-90)}]
+        archive = {}
+        with mock.patch.object(prerender, 'post_json', return_value=(None, 503)):  # short link API down
+            prerender.update_event_archive(prerender.index_site(clubs, events), archive, retention_days=30)
+        self.assertFalse(any(path.startswith('/e/') for path in archive['e1']['routes']))
+
+        # Next run: the API no longer returns the event, but the short link API is back
+        prerender.SHORTLINK_CODES.clear()
+        with mock.patch.object(prerender, 'post_json', return_value=({'code': 'abc123'}, None)) as post:
+            site = prerender.index_site(clubs, [])
+            self.assertEqual(prerender.update_event_archive(site, archive, retention_days=30), 0)
+        post.assert_called_once_with(f'{prerender.API_BASE}/shortlinks', {'type': 'event', 'targetId': 'e1'})
+        self.assertEqual(archive['e1']['routes'][-1], '/e/abc123')
+        self.assertIn('/e/abc123', [path for path, _html in prerender.archived_event_routes('<div id="root"></div>', site['archive']['e1'])])
+
+        # Once it has a code, later runs don't ask again
+        prerender.SHORTLINK_CODES.clear()
+        with mock.patch.object(prerender, 'post_json') as post:
+            prerender.update_event_archive(prerender.index_site(clubs, []), archive, retention_days=30)
+        post.assert_not_called()
+        self.assertEqual(sum(path.startswith('/e/') for path in archive['e1']['routes']), 1)
+
+    def test_event_refused_with_4xx_is_not_asked_again(self):
+        clubs = [{'id': 'c1', 'name': 'Club', 'location': 'Goa'}]
+        events = [{'id': 'e1', 'title': 'Past', 'clubId': 'c1', 'location': 'Goa', 'date': day(-90)}]
+        archive = {}
+        with mock.patch.object(prerender, 'post_json', return_value=(None, 404)) as post:  # deleted upstream
+            prerender.update_event_archive(prerender.index_site(clubs, events), archive, retention_days=30)
+        post.assert_called_once()
+        self.assertTrue(archive['e1']['shortlinkRefused'])
+
+        # Next run (fresh process): no POST, and the record still renders without /e/
+        prerender.SHORTLINK_CODES.clear()
+        prerender.SHORTLINK_REFUSED.clear()
+        with mock.patch.object(prerender, 'post_json') as post:
+            site = prerender.index_site(clubs, [])
+            prerender.update_event_archive(site, archive, retention_days=30)
+        post.assert_not_called()
+        self.assertFalse(any(path.startswith('/e/') for path, _html in
+                             prerender.archived_event_routes('<div id="root"></div>', site['archive']['e1'])))
+
+
+class CriticalCssTest(unittest.TestCase):
+    TOKENS = {'html', 'body', 'div', 'a', '.card', '#root', '.md:flex', '.w-1/2'}
+
+    def test_selector_matches(self):
+        for selector, expected in [
+            ('div', True),
+            ('span', False),
+            ('div.card > a', True),
+            ('#root .card', True),
+            ('#app .card', False),
+            ('a:hover', True),
+            ('.card::before', True),
+            (':not(.missing) .card', True),
+            ('a[href^="/"]', True),
+            ('*', True),
+            ('.md\\:flex', True),  # escaped colon: Tailwind's md:flex class, not a pseudo
+            ('.md\\:flex:hover', True),
+            ('.lg\\:grid', False),
+            ('.w-1\\/2', True),
+        ]:
+            with self.subTest(selector=selector):
+                self.assertIs(prerender.selector_matches(selector, self.TOKENS), expected)
+
+    def test_prune_css(self):
+        for css, expected in [
+            ('.card{color:red}.missing{color:blue}', '.card{color:red}'),
+            ('.card,.missing{margin:0}', '.card{margin:0}'),
+            ('@media (min-width:768px){.md\\:flex{display:flex}.lg\\:grid{display:grid}}',
+             '@media (min-width:768px){.md\\:flex{display:flex}}'),
+            ('@media print{.missing{display:none}}', ''),
+            ('@charset "utf-8";@layer base,components;', '@charset "utf-8";@layer base,components;'),
+            ('@font-face{font-family:x}@keyframes spin{to{transform:rotate(1turn)}}', ''),
+            ('@property --x{syntax:"*";inherits:false}', '@property --x{syntax:"*";inherits:false}'),
+            ('/* .card{} */a{color:inherit}', 'a{color:inherit}'),
+        ]:
+            with self.subTest(css=css):
+                self.assertEqual(prerender.prune_css(css, self.TOKENS), expected)
+
+
+class SpeculationRulesTest(unittest.TestCase):
+    def page(self, canonical, hrefs):
+        content = ''.join(f'<a href="{href}">{href}</a>' for href in hrefs)
+        return (f'<html><head><link rel="canonical" href="{prerender.SITE_URL}{canonical}" /></head><body>'
+                f'<div id="root"><div class="seo-static"><nav><a href="/">Home</a><a href="/clubs/">Clubs</a></nav>'
+                f'{content}{prerender.SITE_FOOTER_START}<a href="/about/">About</a></div></div></body></html>')
+
+    def prefetch(self, html, path, limit):
+        with mock.patch.object(sys, 'argv', ['prerender.py', f'--speculation-limit={limit}']):
+            html = prerender.inject_speculation_rules(html, path)
+        if '<script type="speculationrules">' not in html:
+            return None
+        rules = json.loads(html.split('<script type="speculationrules">', 1)[1].split('</script>', 1)[0])
+        return [(rule['eagerness'], rule['urls']) for rule in rules['prefetch']]
+
+    def test_content_links_skip_nav_and_footer(self):
+        html = self.page('/clubs/goa/', ['/events/a/', '/clubs/goa/club-1/', '/events/a/', 'https://example.com/'])
+        self.assertEqual(prerender.content_links(html), ['/events/a/', '/clubs/goa/club-1/'])
+        self.assertEqual(prerender.content_links('<body><a href="/events/a/">a</a></body>'), [])
+
+    def test_ranks_detail_pages_before_hubs(self):
+        links = ['/clubs/', '/clubs/pune/', '/events/a/', '/clubs/goa/club-1/', '/promoters/p1/', '/clubs/goa/', '/events/a/']
+        for path, hrefs, limit, expected in [
+            # deepest detail pages first (stable among equals), then the city hub, then /clubs/; never the page itself
+            ('/clubs/goa/', links, 4, [('immediate', ['/clubs/goa/club-1/', '/events/a/']),
+                                       ('moderate', ['/promoters/p1/', '/clubs/pune/'])]),
+            ('/clubs/goa/', links, 6, [('immediate', ['/clubs/goa/club-1/', '/events/a/']),
+                                       ('moderate', ['/promoters/p1/', '/clubs/pune/', '/clubs/'])]),
+            ('/clubs/goa/', links, 1, [('immediate', ['/clubs/goa/club-1/'])]),
+            ('/clubs/goa/', ['/clubs/', '/clubs/goa/'], 4, [('immediate', ['/clubs/'])]),
+            ('/clubs/goa/', ['/clubs/goa/'], 4, None),
+            ('/clubs/goa/', links, 0, None),
+        ]:
+            with self.subTest(hrefs=hrefs, limit=limit):
+                self.assertEqual(self.prefetch(self.page(path, hrefs), path, limit), expected)
+
+
+class RouteDataTest(unittest.TestCase):
+    def test_payload_cannot_close_its_script_tag(self):
+        payload = {'type': 'event', 'id': 'e1', 'event': {
+            'title': '</script><script>alert(1)</script>',
+            'description': 'Line\u2028separator\u2029and <!-- & -->',
+        }}
+        text = prerender.route_data_json(payload)
+        for raw in ('<', '>', '&', '\u2028', '\u2029'):
+            self.assertNotIn(raw, text)
+        self.assertEqual(json.loads(text), payload)
+
+        html = prerender.inject_body('<body><div id="root"></div></body>', '<h1>Event</h1>', payload)
+        self.assertEqual(html.count('</script>'), 1)
+        embedded = html.split('<script type="application/json" id="route-data">', 1)[1].split('</script>', 1)[0]
+        self.assertEqual(json.loads(embedded), dict(payload, v=prerender.ROUTE_DATA_VERSION))
+
+
+class RenderCheckpointTest(unittest.TestCase):
+    TEMPLATE = ('<!doctype html><html><head><title>Clubin</title><meta name="description" content="" />'
+                '</head><body><div id="root"></div></body></html>')
+
+    def setUp(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        for patch in (mock.patch.object(prerender, 'CACHE_DIR', tmp),
+                      mock.patch.object(prerender, 'CHECKPOINT_FILE', tmp / 'render-checkpoint.bin'),
+                      mock.patch.object(prerender, 'SHORTLINK_POSTS', False),
+                      mock.patch.object(sys, 'argv', ['prerender.py'])):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(prerender.close_checkpoint, False)
+
+    def site(self, clubs, events):
+        site = prerender.index_site(clubs, events)
+        prerender.update_event_archive(site, {}, retention_days=30)
+        return site
+
+    def test_resume_rerenders_only_keys_whose_data_changed(self):
+        clubs = [{'id': 'c1', 'name': 'Goa Club', 'location': 'Baga, Goa'},
+                 {'id': 'c2', 'name': 'Pune Club', 'location': 'Koregaon Park, Pune'}]
+        events = [{'id': 'e1', 'title': 'Goa Night', 'clubId': 'c1', 'location': 'Baga, Goa', 'date': day(3)},
+                  {'id': 'e2', 'title': 'Pune Night', 'clubId': 'c2', 'location': 'Koregaon Park, Pune', 'date': day(3)}]
+        site = self.site(clubs, events)
+        prerender.open_checkpoint(self.TEMPLATE, site)
+        for key in prerender.site_keys(site):
+            prerender.checkpoint_key(key, prerender.render_key(self.TEMPLATE, site, key))
+        prerender.close_checkpoint(complete=False)  # cancelled after every key was rendered
+
+        clubs[0] = dict(clubs[0], description='Now with a rooftop')  # a content update for one club
+        site = self.site(clubs, events)
+        prerender.open_checkpoint(self.TEMPLATE, site)
+        for key in ('club:c1', 'city:goa', 'hubs'):
+            self.assertIsNone(prerender.checkpoint_routes(key), key)
+        for key in ('static', 'club:c2', 'event:e2', 'city:pune'):
+            self.assertEqual(prerender.checkpoint_routes(key), prerender.render_key(self.TEMPLATE, site, key), key)
+        prerender.checkpoint_key('club:c1', prerender.render_key(self.TEMPLATE, site, 'club:c1'))
+        prerender.close_checkpoint(complete=False)
+
+        # Resuming again compares against the data the kept records were rendered from
+        prerender.open_checkpoint(self.TEMPLATE, site)
+        self.assertEqual(prerender.checkpoint_routes('club:c1'), prerender.render_key(self.TEMPLATE, site, 'club:c1'))
+        self.assertIsNotNone(prerender.checkpoint_routes('event:e2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
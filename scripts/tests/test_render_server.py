@@ -0,0 +1,135 @@
+"""
+Tests for scripts/render-server.py: the LRU/TTL cache and on-demand renders
+against scripts/dev/mock-api-server.py.
+
+Run:
+  python3 -m unittest discover scripts/tests
+"""
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+import prerender  # noqa: E402
+
+
+def load_script(name, path):
+    """Import a script whose file name isn't a valid module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+render_server = load_script('render_server', SCRIPTS / 'render-server.py')
+mock_api = load_script('mock_api_server', SCRIPTS / 'dev' / 'mock-api-server.py')
+
+TEMPLATE = ('<!doctype html><html><head><title>Clubin</title><meta name="description" content="" />'
+            '</head><body><div id="root"></div></body></html>')
+CLUB_ID = '11111111-1111-4111-8111-111111111111'
+NEW_EVENT_ID = '22222222-2222-4222-8222-222222222222'
+
+
+def day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime('%Y-%m-%dT00:00:00.000Z')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = render_server.RenderCache(2)
+        cache.put('/a/', 'A', ttl=60)
+        cache.put('/b/', 'B', ttl=60)
+        self.assertEqual(cache.get('/a/'), (True, 'A'))  # /a/ is now the most recent
+        cache.put('/c/', 'C', ttl=60)
+        self.assertEqual(cache.get('/b/'), (False, None))
+        self.assertEqual(cache.get('/a/'), (True, 'A'))
+        self.assertEqual(cache.get('/c/'), (True, 'C'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_entries_expire_after_their_ttl(self):
+        clock = FakeClock()
+        cache = render_server.RenderCache(10, clock=clock)
+        cache.put('/page/', '<html>', ttl=300)
+        cache.put('/gone/', None, ttl=30)  # a cached 404
+        clock.now += 29
+        self.assertEqual(cache.get('/gone/'), (True, None))
+        clock.now += 1
+        self.assertEqual(cache.get('/gone/'), (False, None))
+        self.assertEqual(cache.get('/page/'), (True, '<html>'))
+        clock.now += 270
+        self.assertEqual(cache.get('/page/'), (False, None))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+class RenderServiceTest(unittest.TestCase):
+    """RenderService over a one-club snapshot, with the mock API serving newer data."""
+
+    def setUp(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        club = {'id': CLUB_ID, 'name': 'Goa Club', 'location': 'Baga, Goa'}
+        prerender.save_snapshot(tmp / 'clubs.json', [club])
+        prerender.save_snapshot(tmp / 'events.json', [])
+        (tmp / 'index.template.html').write_text(TEMPLATE, encoding='utf-8')
+
+        mock_api.STATE.update(clubs={CLUB_ID: club}, events={}, shortlinks={}, fail=0, latency=0.0)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), mock_api.MockApiHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        for patch in (mock.patch.object(prerender, 'CACHE_DIR', tmp),
+                      mock.patch.object(prerender, 'TEMPLATE_SNAPSHOT', tmp / 'index.template.html'),
+                      mock.patch.object(prerender, 'EVENT_ARCHIVE', tmp / 'event-archive.json'),
+                      mock.patch.object(prerender, 'API_BASE', f'http://127.0.0.1:{server.server_address[1]}/api'),
+                      mock.patch.object(prerender, 'SHORTLINK_POSTS', False),
+                      mock.patch.object(mock_api.MockApiHandler, 'log_message', lambda *args: None),
+                      mock.patch.object(sys, 'argv', ['render-server.py', '--no-image-probe'])):
+            patch.start()
+            self.addCleanup(patch.stop)
+        prerender.NETWORK.update(deadline=None, requests=0, failed=0, open={})
+        prerender.NETWORK['failures'].clear()
+        self.service = render_server.RenderService(cache_size=50, ttl=300, not_found_ttl=30)
+
+    def test_miss_renders_an_event_newer_than_the_snapshot(self):
+        mock_api.STATE['events'][NEW_EVENT_ID] = {
+            'id': NEW_EVENT_ID, 'title': 'Sunset Session', 'clubId': CLUB_ID,
+            'location': 'Baga, Goa', 'date': day(3),
+        }
+        path = f'/events/sunset-session-{NEW_EVENT_ID}/'
+        html, status = self.service.render(path)
+        self.assertEqual(status, 'miss')
+        self.assertIn('Sunset Session', html)
+        self.assertEqual(prerender.NETWORK['requests'], 1)  # one GET /api/events/:id
+
+        self.assertEqual(self.service.render(path), (html, 'hit'))
+        self.assertEqual(prerender.NETWORK['requests'], 1)
+
+    def test_unknown_path_is_a_cached_404_without_rendering(self):
+        with mock.patch.object(prerender, 'render_key') as render_key:
+            self.assertEqual(self.service.render('/no/such/page/'), (None, 'miss'))
+            self.assertEqual(self.service.render('/no/such/page/'), (None, 'hit'))
+        render_key.assert_not_called()
+        self.assertEqual(prerender.NETWORK['requests'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
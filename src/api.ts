@@ -11,10 +11,38 @@ const API_BASE = 'https://api.clubin.info/api';
 const ENV = import.meta.env as unknown as { DEV?: boolean; VITE_PAYMENTS_API_BASE?: string };
 const PAYMENTS_API_BASE = ENV.DEV && ENV.VITE_PAYMENTS_API_BASE ? ENV.VITE_PAYMENTS_API_BASE : API_BASE;
 
+// Build-time JSON snapshots written by scripts/prerender.py (dist/data/v1/).
+// Reads go to these CDN files first and only fall back to the live API when a
+// file is missing (entity newer than the last build, local dev without a
+// prerender). They are at most one build (~12h) old.
+const STATIC_DATA_BASE = '/data/v1';
+
+/** A static data file, or null when it is missing/unreadable (never throws). */
+async function fetchStaticData<T>(path: string): Promise<T | null> {
+    try {
+        const response = await fetch(`${STATIC_DATA_BASE}/${path}.json`);
+        if (!response.ok) return null;
+        return (await response.json()) as T;
+    } catch {
+        // Dev server answers unknown paths with index.html → JSON parse error.
+        return null;
+    }
+}
+
+/** Static shards hold events that were upcoming at build time; drop any that have passed since. */
+function stillUpcoming(events: Event[]): Event[] {
+    const today = new Date().toISOString().slice(0, 10);
+    return events.filter((e) => (e.date || '').slice(0, 10) >= today);
+}
+
 /**
  * Fetch all clubs, optionally filtered by city
  */
 export async function fetchClubs(city?: string): Promise<Club[]> {
+    if (!city) {
+        const cached = await fetchStaticData<Club[]>('clubs/all');
+        if (cached) return cached;
+    }
     const url = city
         ? `${API_BASE}/clubs?city=${encodeURIComponent(city)}`
         : `${API_BASE}/clubs`;
@@ -30,6 +58,16 @@ export async function fetchClubs(city?: string): Promise<Club[]> {
  * Fetch a single club by ID
  */
 export async function fetchClubDetails(id: string): Promise<Club> {
+    const cached = await fetchStaticData<Club>(`club/${encodeURIComponent(id)}`);
+    if (cached) return cached;
+    return fetchClubDetailsLive(id);
+}
+
+/**
+ * Fetch a single club by ID from the live API, skipping the build-time
+ * snapshot (for refreshing a prerendered page, which already shows it).
+ */
+export async function fetchClubDetailsLive(id: string): Promise<Club> {
     const response = await fetch(`${API_BASE}/clubs/${id}`);
     if (!response.ok) {
         throw new Error('Failed to fetch club details');
@@ -42,6 +80,13 @@ export async function fetchClubDetails(id: string): Promise<Club> {
  * The /api/clubs/:id endpoint does not reliably include events.
  */
 export async function fetchEventsByClubId(clubId: string): Promise<Event[]> {
+    const cached = await fetchStaticData<Event[]>(`club-events/${encodeURIComponent(clubId)}`);
+    if (cached) return cached;
+    return fetchEventsByClubIdLive(clubId);
+}
+
+/** fetchEventsByClubId() from the live API only, skipping the build-time snapshot. */
+export async function fetchEventsByClubIdLive(clubId: string): Promise<Event[]> {
     const response = await fetch(`${API_BASE}/events`);
     if (!response.ok) {
         throw new Error('Failed to fetch events');
@@ -54,6 +99,10 @@ export async function fetchEventsByClubId(clubId: string): Promise<Event[]> {
  * Fetch all events, optionally filtered by city
  */
 export async function fetchEvents(city?: string, upcoming: boolean = true): Promise<Event[]> {
+    if (!city && upcoming) {
+        const cached = await fetchStaticData<Event[]>('events/all');
+        if (cached) return stillUpcoming(cached);
+    }
     const params = new URLSearchParams();
     if (city) params.set('city', city);
     if (upcoming) params.set('upcoming', 'true');
@@ -67,9 +116,23 @@ export async function fetchEvents(city?: string, upcoming: boolean = true): Prom
 }
 
 /**
- * Fetch a single event by ID
+ * Fetch a single event by ID.
+ * Live API first: guestlist status, spots and tables drive booking and must be
+ * current. The build-time snapshot is only the fallback when the API fails.
  */
 export async function fetchEventDetails(id: string): Promise<Event> {
+    const response = await fetch(`${API_BASE}/events/${id}`).catch(() => null);
+    if (response?.ok) return response.json();
+    // Outage (network error / 5xx) only — a 4xx means the event is really gone.
+    if (!response || response.status >= 500) {
+        const cached = await fetchStaticData<Event>(`event/${encodeURIComponent(id)}`);
+        if (cached) return cached;
+    }
+    throw new Error('Failed to fetch event details');
+}
+
+/** fetchEventDetails() without the snapshot fallback — a prerendered page already shows it. */
+export async function fetchEventDetailsLive(id: string): Promise<Event> {
     const response = await fetch(`${API_BASE}/events/${id}`);
     if (!response.ok) {
         throw new Error('Failed to fetch event details');
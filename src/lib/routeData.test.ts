@@ -0,0 +1,43 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+
+// routeData.ts parses #route-data once per page load, so every case imports a
+// fresh copy of the module against its own stubbed document.
+async function withPayload(text: string | null) {
+    vi.resetModules();
+    vi.stubGlobal('document', {
+        getElementById: (id: string) => (id === 'route-data' && text !== null ? { textContent: text } : null),
+    });
+    return import('./routeData');
+}
+
+const CLUB = { v: 1, type: 'club', id: 'c1', club: { id: 'c1', name: 'Kitty Su' }, events: [] };
+
+describe('readRouteData', () => {
+    afterEach(() => {
+        vi.unstubAllGlobals();
+    });
+
+    it('returns the payload when version, type and id all match', async () => {
+        const { readRouteData } = await withPayload(JSON.stringify(CLUB));
+        expect(readRouteData('club', 'c1')?.club.name).toBe('Kitty Su');
+    });
+
+    it.each([
+        ['another id (client-side navigation)', JSON.stringify(CLUB), 'club', 'c2'],
+        ['another type', JSON.stringify(CLUB), 'event', 'c1'],
+        ['an older payload version', JSON.stringify({ ...CLUB, v: 0 }), 'club', 'c1'],
+        ['malformed JSON', '{"v":1,"type":"club"', 'club', 'c1'],
+        ['no #route-data element', null, 'club', 'c1'],
+    ] as const)('ignores %s', async (_name, text, type, id) => {
+        const { readRouteData } = await withPayload(text);
+        const read = readRouteData as (type: 'club' | 'event', id: string) => unknown;
+        expect(read(type, id)).toBeNull();
+    });
+
+    it('parses the escaped JSON prerender.py writes', async () => {
+        // route_data_json() output for a title that tries to close the script tag
+        const text = '{"v":1,"type":"event","id":"e1","event":{"id":"e1","title":"\\u003c/script\\u003e\\u2028"}}';
+        const { readRouteData } = await withPayload(text);
+        expect(readRouteData('event', 'e1')?.event.title).toBe('</script>\u2028');
+    });
+});
@@ -0,0 +1,57 @@
+// Per-route entity payload that scripts/prerender.py embeds after #root as
+// <script type="application/json" id="route-data"> (see inject_body there).
+// Detail pages render from it on first paint and refresh from the API in the
+// background instead of showing a skeleton while they refetch.
+//
+// The payload describes the URL the HTML was generated for, so it is only used
+// when its type and id match what the page is about to show — after client-side
+// navigation to another club/event it is simply ignored.
+
+// Records are trimmed to the fields the pages render (CLUB_PAYLOAD_FIELDS,
+// CLUB_EVENT_PAYLOAD_FIELDS and EVENT_PAYLOAD_FIELDS in prerender.py); the
+// background refresh brings in the full API records.
+
+import type { Club, Event } from '../types';
+
+export const ROUTE_DATA_VERSION = 1;
+
+export interface ClubRouteData {
+    type: 'club';
+    id: string;
+    club: Club;
+    /** Upcoming events only. */
+    events: Event[];
+}
+
+export interface EventRouteData {
+    type: 'event';
+    id: string;
+    event: Event;
+}
+
+type RouteData = ClubRouteData | EventRouteData;
+
+let parsed: RouteData | null | undefined;
+
+function loadRouteData(): RouteData | null {
+    if (parsed === undefined) {
+        parsed = null;
+        const text = document.getElementById('route-data')?.textContent;
+        if (text) {
+            try {
+                const data = JSON.parse(text);
+                if (data?.v === ROUTE_DATA_VERSION) parsed = data as RouteData;
+            } catch {
+                // Malformed payload → behave as if there were none.
+            }
+        }
+    }
+    return parsed;
+}
+
+export function readRouteData(type: 'club', id: string): ClubRouteData | null;
+export function readRouteData(type: 'event', id: string): EventRouteData | null;
+export function readRouteData(type: RouteData['type'], id: string): RouteData | null {
+    const data = loadRouteData();
+    return data && data.type === type && data.id === id ? data : null;
+}
@@ -0,0 +1,50 @@
+// Lookup benchmark for the client-side search index: `npm run bench`.
+// Builds a shard at the scale of a large metro (2k clubs, 10k upcoming events)
+// the same way prerender.py does, then times typical queries.
+import { bench, describe } from 'vitest';
+import { tokenize, parseSearchIndex, querySearchIndex, type SearchIndexShard } from './searchIndex';
+
+const AREAS = ['Indiranagar', 'Koramangala', 'MG Road', 'Whitefield', 'HSR Layout', 'UB City', 'Church Street'];
+const GENRES = ['Techno', 'Bollywood', 'Hip Hop', 'House', 'EDM', 'Commercial'];
+const WORDS = ['Kitty', 'Skyye', 'Loft', 'Social', 'Vault', 'Arbor', 'Toit', 'Bflat', 'Pebble', 'Zero', 'Gravity', 'Monkey'];
+
+function syntheticShard(nClubs: number, nEvents: number): SearchIndexShard {
+    const terms: Record<string, number[]> = {};
+    const add = (doc: number, ...texts: string[]) => {
+        for (const tok of new Set(texts.flatMap(tokenize))) (terms[tok] ??= []).push(doc);
+    };
+    const clubs: SearchIndexShard['clubs'] = [];
+    for (let i = 0; i < nClubs; i++) {
+        const name = `${WORDS[i % WORDS.length]} ${WORDS[(i * 7) % WORDS.length]} ${i}`;
+        const location = `${AREAS[i % AREAS.length]}, Bengaluru`;
+        clubs.push([`c${i}`, name, location, '', 0]);
+        add(i, name, location);
+    }
+    const events: SearchIndexShard['events'] = [];
+    for (let j = 0; j < nEvents; j++) {
+        const club = clubs[j % nClubs];
+        const genre = GENRES[j % GENRES.length];
+        const date = `2026-${String(10 + (j % 3)).padStart(2, '0')}-${String(1 + (j % 28)).padStart(2, '0')}`;
+        events.push([`e${j}`, `${genre} Night ${j}`, club[1], club[2], genre, date]);
+        add(nClubs + j, `${genre} Night ${j}`, club[1], club[2], genre, ['October', 'November', 'December'][j % 3]);
+    }
+    return { v: 1, city: 'bengaluru', clubs, events, terms };
+}
+
+const shard = syntheticShard(2_000, 10_000);
+const index = parseSearchIndex(shard);
+
+describe('search index (2k clubs, 10k events)', () => {
+    bench('parse shard', () => {
+        parseSearchIndex(shard);
+    });
+    bench('single-token prefix query', () => {
+        querySearchIndex(index, 'kit');
+    });
+    bench('multi-token AND query', () => {
+        querySearchIndex(index, 'techno indira oct');
+    });
+    bench('no-match query', () => {
+        querySearchIndex(index, 'zzzz');
+    });
+});
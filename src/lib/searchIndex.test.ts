@@ -0,0 +1,68 @@
+import { describe, it, expect } from 'vitest';
+import { tokenize, parseSearchIndex, querySearchIndex, type SearchIndexShard } from './searchIndex';
+
+// Mirrors what scripts/prerender.py build_search_index() emits for a tiny city.
+const SHARD: SearchIndexShard = {
+    v: 1,
+    city: 'bengaluru',
+    clubs: [
+        ['c1', 'Kitty Su', 'Indiranagar, Bengaluru', 'https://img/c1.webp', 2],
+        ['c2', 'Skyye', 'UB City, Bengaluru', 'https://img/c2.webp', 0],
+    ],
+    events: [
+        ['e1', 'Techno Tuesday', 'Kitty Su', 'Indiranagar, Bengaluru', 'Techno', '2026-10-20'],
+        ['e2', 'Bollywood Night 2026', 'Skyye', 'UB City, Bengaluru', 'Bollywood', '2026-10-24'],
+    ],
+    terms: {
+        '2026': [3],
+        bengaluru: [0, 1, 2, 3],
+        bollywood: [3],
+        city: [1, 3],
+        indiranagar: [0, 2],
+        kitty: [0, 2],
+        night: [3],
+        october: [2, 3],
+        saturday: [3],
+        skyye: [1, 3],
+        su: [0, 2],
+        techno: [2],
+        tuesday: [2],
+        ub: [1, 3],
+    },
+};
+
+const index = parseSearchIndex(SHARD);
+const ids = (r: { clubs: { id: string }[]; events: { id: string }[] }) =>
+    [...r.clubs.map((c) => c.id), ...r.events.map((e) => e.id)];
+
+describe('tokenize', () => {
+    it('lowercases and splits on non-alphanumerics (matches prerender.py)', () => {
+        expect(tokenize('Kitty Su, Bengaluru — 2026!')).toEqual(['kitty', 'su', 'bengaluru', '2026']);
+        expect(tokenize('')).toEqual([]);
+    });
+});
+
+describe('parseSearchIndex', () => {
+    it('expands rows and sorts terms (integer-like keys included)', () => {
+        expect(index.clubs[0]).toEqual({
+            id: 'c1', name: 'Kitty Su', location: 'Indiranagar, Bengaluru',
+            imageUrl: 'https://img/c1.webp', _count: { events: 2 },
+        });
+        expect(index.events[1].date).toBe('2026-10-24');
+        expect(index.terms).toEqual([...index.terms].sort());
+    });
+});
+
+describe('querySearchIndex', () => {
+    it('returns everything for an empty query', () => {
+        expect(ids(querySearchIndex(index, '  '))).toEqual(['c1', 'c2', 'e1', 'e2']);
+    });
+    it('prefix-matches and ANDs query tokens', () => {
+        expect(ids(querySearchIndex(index, 'kit'))).toEqual(['c1', 'e1']);
+        expect(ids(querySearchIndex(index, 'sky boll'))).toEqual(['e2']);
+        expect(ids(querySearchIndex(index, 'sat'))).toEqual(['e2']);
+    });
+    it('returns nothing when a token has no match', () => {
+        expect(ids(querySearchIndex(index, 'kitty zzz'))).toEqual([]);
+    });
+});
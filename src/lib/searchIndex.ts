@@ -0,0 +1,127 @@
+// Client-side search over the per-city index shards that scripts/prerender.py
+// writes to /data/search/<city>.json (plus /data/search/all.json). Listing and
+// search pages read these straight from the CDN and only fall back to the live
+// API when a shard is missing (a city with no shard, or `npm run dev` without a
+// prerendered dist/).
+//
+// tokenize() MUST match search_tokens() in scripts/prerender.py, and the shard
+// shape MUST match build_search_index() there.
+
+import type { Club, Event } from '../types';
+
+export const SEARCH_INDEX_VERSION = 1;
+
+/** [id, name, location, imageUrl, upcomingEventCount] */
+type ClubRow = [string, string, string, string, number];
+/** [id, title, club, location, genre, 'YYYY-MM-DD'] */
+type EventRow = [string, string, string, string, string, string];
+
+export interface SearchIndexShard {
+    v: number;
+    city: string;
+    clubs: ClubRow[];
+    events: EventRow[];
+    /** token → doc numbers; doc < clubs.length is a club, else events[doc - clubs.length] */
+    terms: Record<string, number[]>;
+}
+
+export type ClubSummary = Pick<Club, 'id' | 'name' | 'location' | 'imageUrl' | '_count'>;
+export type EventSummary = Pick<Event, 'id' | 'title' | 'club' | 'location' | 'genre' | 'date'>;
+
+export interface SearchIndex {
+    city: string;
+    clubs: ClubSummary[];
+    events: EventSummary[];
+    /** Sorted tokens (for prefix binary search) with postings in the same order. */
+    terms: string[];
+    postings: number[][];
+}
+
+export interface SearchResults {
+    clubs: ClubSummary[];
+    events: EventSummary[];
+}
+
+/** Lowercase alphanumeric runs: "Kitty Su, Bengaluru" → ['kitty', 'su', 'bengaluru']. */
+export function tokenize(text: string): string[] {
+    return (text || '').toLowerCase().match(/[a-z0-9]+/g) ?? [];
+}
+
+export function parseSearchIndex(shard: SearchIndexShard): SearchIndex {
+    // Re-sort: JSON object key order puts integer-like tokens ("2026") first.
+    const terms = Object.keys(shard.terms).sort();
+    return {
+        city: shard.city,
+        clubs: shard.clubs.map(([id, name, location, imageUrl, events]) => ({
+            id, name, location, imageUrl, _count: { events },
+        })),
+        events: shard.events.map(([id, title, club, location, genre, date]) => ({
+            id, title, club, location, genre, date,
+        })),
+        terms,
+        postings: terms.map((t) => shard.terms[t]),
+    };
+}
+
+/** First index in sorted `terms` that is >= `value`. */
+function lowerBound(terms: string[], value: string): number {
+    let lo = 0;
+    let hi = terms.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (terms[mid] < value) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+/**
+ * Prefix AND-search: every query token must prefix-match some token of a
+ * club/event ("kit ben" finds "Kitty Su, Bengaluru"). An empty query returns
+ * everything. Results keep the shard order (clubs as listed, events by date).
+ */
+export function querySearchIndex(index: SearchIndex, query: string): SearchResults {
+    const tokens = [...new Set(tokenize(query))];
+    if (!tokens.length) return { clubs: index.clubs, events: index.events };
+
+    let matched: Set<number> | null = null;
+    for (const token of tokens) {
+        const hits = new Set<number>();
+        const end = lowerBound(index.terms, token + '\uffff');
+        for (let i = lowerBound(index.terms, token); i < end; i++) {
+            for (const doc of index.postings[i]) {
+                if (!matched || matched.has(doc)) hits.add(doc);
+            }
+        }
+        matched = hits;
+        if (!matched.size) break;
+    }
+
+    const nClubs = index.clubs.length;
+    const docs = [...(matched ?? [])].sort((a, b) => a - b);
+    return {
+        clubs: docs.filter((d) => d < nClubs).map((d) => index.clubs[d]),
+        events: docs.filter((d) => d >= nClubs).map((d) => index.events[d - nClubs]),
+    };
+}
+
+const shardCache = new Map<string, Promise<SearchIndex | null>>();
+
+/**
+ * Load (once per session) the index shard for a city slug, a sub-area slug or
+ * 'all'. Resolves null — never rejects — when there is no usable shard, so
+ * callers can fall back to the API.
+ */
+export function loadSearchIndex(city: string): Promise<SearchIndex | null> {
+    let pending = shardCache.get(city);
+    if (!pending) {
+        pending = fetch(`/data/search/${encodeURIComponent(city)}.json`)
+            .then((res) => (res.ok ? res.json() : null))
+            .then((shard: SearchIndexShard | null) =>
+                shard && shard.v === SEARCH_INDEX_VERSION ? parseSearchIndex(shard) : null)
+            // Dev server answers unknown paths with index.html → JSON parse error.
+            .catch(() => null);
+        shardCache.set(city, pending);
+    }
+    return pending;
+}
@@ -95,3 +95,12 @@ export function locationInCity(location: string, slug: string): boolean {
     if (sub) return sub.needles.some((n) => loc.includes(n));
     return getCitySlug(location) === slug;
 }
+
+// Clubs per /clubs/<slug>/page/<n> listing. Comes from the CITY_PAGE_SIZE env
+// var at build time (exposed via envPrefix in vite.config.ts), the same one
+// scripts/prerender.py and scripts/generate-sitemap.mjs paginate with.
+export const CITY_PAGE_SIZE = Number(import.meta.env.CITY_PAGE_SIZE) || 50;
+
+export function cityPagePath(slug: string, page: number): string {
+    return page > 1 ? `/clubs/${slug}/page/${page}` : `/clubs/${slug}`;
+}
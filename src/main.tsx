@@ -7,7 +7,36 @@ import { LocationSelectPage, ExplorePage, ClubsListPage, ClubDetailPage, EventDe
 import { ScrollToTop } from './components/ScrollToTop.tsx'
 import { AuthProvider } from './lib/auth'
 
-createRoot(document.getElementById('root')!).render(
+// Repeat-visit cache for the shell and hot landing pages (public/sw.js). Only
+// production builds: prerender.py writes the /sw-manifest.json it relies on.
+if (import.meta.env.PROD && 'serviceWorker' in navigator) {
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register('/sw.js').catch(() => {})
+  })
+}
+
+// prerender.py inlines only the CSS the static #root markup needs and loads the
+// Vite stylesheet with the media="print" swap, so it doesn't block first paint.
+// React replaces that markup, so mount once the full stylesheet applies;
+// otherwise the app paints unstyled and reflows (CLS) when it lands.
+function whenStylesheetReady(): Promise<void> {
+  const link = document.querySelector<HTMLLinkElement>('link[rel="stylesheet"][href^="/assets/"][media="print"]')
+  if (!link) return Promise.resolve()
+  if (link.sheet) {
+    link.media = 'all'
+    return Promise.resolve()
+  }
+  return new Promise((resolve) => {
+    link.addEventListener('load', () => {
+      link.media = 'all'
+      resolve()
+    }, { once: true })
+    link.addEventListener('error', () => resolve(), { once: true })
+  })
+}
+
+const root = createRoot(document.getElementById('root')!)
+whenStylesheetReady().then(() => root.render(
   <StrictMode>
     <BrowserRouter>
       <AuthProvider>
@@ -20,6 +49,7 @@ createRoot(document.getElementById('root')!).render(
         <Route path="/explore" element={<ExplorePage />} />
         <Route path="/clubs" element={<LocationSelectPage />} />
         <Route path="/clubs/:city" element={<ClubsListPage />} />
+        <Route path="/clubs/:city/page/:page" element={<ClubsListPage />} />
         <Route path="/clubs/:city/:clubId" element={<ClubDetailPage />} />
 
         {/* Event routes */}
@@ -56,4 +86,4 @@ createRoot(document.getElementById('root')!).render(
       </AuthProvider>
     </BrowserRouter>
   </StrictMode>,
-)
+))
@@ -3,8 +3,9 @@ import { Skeleton } from '../components/Skeleton';
 import { VenueImageSlideshow } from '../components/VenueImageSlideshow';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import type { Club, Event } from '../types';
-import { fetchClubDetails, fetchEventsByClubId, resolveShortLink, createShortLink, formatDate, formatTime, isMobileDevice, APP_STORE_URL, PLAY_STORE_URL } from '../api';
+import { fetchClubDetails, fetchClubDetailsLive, fetchEventsByClubId, fetchEventsByClubIdLive, resolveShortLink, createShortLink, formatDate, formatTime, isMobileDevice, APP_STORE_URL, PLAY_STORE_URL } from '../api';
 import { extractId, clubUrl as buildClubUrl, eventPath, getCitySlug } from '../lib/urls';
+import { readRouteData } from '../lib/routeData';
 import { useSEO } from '../hooks/useSEO';
 import { AccountButton } from '../components/AccountButton';
 import { MapPin, ArrowLeft, Calendar, Clock, ExternalLink, Share2, Check, Copy, ChevronDown, ChevronUp, Instagram, User, Music } from 'lucide-react';
@@ -48,9 +49,21 @@ export function ClubDetailPage() {
 
     useEffect(() => {
         async function loadClub() {
+            // Prerendered page: show the embedded club + upcoming events right
+            // away and refresh them from the live API in the background (the
+            // static data files are as old as the page); a failed refresh keeps
+            // what is shown.
+            const embedded = !code && clubId ? readRouteData('club', extractId(clubId)) : null;
             try {
-                setLoading(true);
-                setError(null);
+                if (embedded) {
+                    setClub(embedded.club);
+                    setEvents(embedded.events);
+                    setError(null);
+                    setLoading(false);
+                } else {
+                    setLoading(true);
+                    setError(null);
+                }
 
                 let clubData: Club;
 
@@ -58,6 +71,8 @@ export function ClubDetailPage() {
                     const data = await resolveShortLink(code);
                     if (data.type !== 'club') throw new Error('Invalid link');
                     clubData = data.data as Club;
+                } else if (embedded) {
+                    clubData = await fetchClubDetailsLive(embedded.id);
                 } else if (clubId) {
                     clubData = await fetchClubDetails(extractId(clubId));
                 } else {
@@ -67,10 +82,15 @@ export function ClubDetailPage() {
                 setClub(clubData);
 
                 // Fetch events separately since /api/clubs/:id returns empty events
-                const clubEvents = await fetchEventsByClubId(clubData.id);
-                setEvents(clubEvents);
+                if (embedded) {
+                    const todayStr = getTodayDateString();
+                    const clubEvents = await fetchEventsByClubIdLive(clubData.id);
+                    setEvents(clubEvents.filter((e) => e.date.substring(0, 10) >= todayStr));
+                } else {
+                    setEvents(await fetchEventsByClubId(clubData.id));
+                }
             } catch (err) {
-                setError('Failed to load club details. Please try again.');
+                if (!embedded) setError('Failed to load club details. Please try again.');
                 console.error(err);
             } finally {
                 setLoading(false);
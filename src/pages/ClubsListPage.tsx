@@ -1,18 +1,19 @@
 import { useEffect, useState } from 'react';
 import { Skeleton } from '../components/Skeleton';
 import { useParams, Link, useNavigate } from 'react-router-dom';
-import type { Club } from '../types';
 import { CITIES } from '../types';
 import { fetchClubs, APP_STORE_URL, PLAY_STORE_URL, isMobileDevice } from '../api';
-import { clubPath, locationInCity, SUBCITIES } from '../lib/urls';
+import { CITY_PAGE_SIZE, cityPagePath, clubPath, locationInCity, SUBCITIES } from '../lib/urls';
+import { loadSearchIndex, querySearchIndex, type ClubSummary, type SearchIndex } from '../lib/searchIndex';
 import { useSEO } from '../hooks/useSEO';
 import { AccountButton } from '../components/AccountButton';
 import { MapPin, Calendar, ArrowLeft, Search, X, Download } from 'lucide-react';
 
 export function ClubsListPage() {
-    const { city } = useParams<{ city: string }>();
+    const { city, page } = useParams<{ city: string; page?: string }>();
     const navigate = useNavigate();
-    const [clubs, setClubs] = useState<Club[]>([]);
+    const [clubs, setClubs] = useState<ClubSummary[]>([]);
+    const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [searchQuery, setSearchQuery] = useState('');
@@ -36,19 +37,23 @@ export function ClubsListPage() {
         subCity?.label ||
         (city ? city.replace(/-/g, ' ').replace(/\b\w/g, (m) => m.toUpperCase()) : 'All Cities');
 
-    // SEO — emit BreadcrumbList as standalone JSON-LD, use URL slug for canonical
+    // SEO — emit BreadcrumbList as standalone JSON-LD, use URL slug for canonical.
+    // /clubs/:city/page/:n is self-canonical and lists the same CITY_PAGE_SIZE
+    // slice of clubs as the pre-rendered page.
     const citySlug = city || '';
+    const pageNum = Number(page) > 1 ? Math.floor(Number(page)) : 1;
+    const pageUrl = `https://clubin.co.in${cityPagePath(citySlug, pageNum)}`;
     useSEO({
-        title: `Best Nightclubs in ${displayCity} - Guestlist, Events & VIP Tables | Clubin`,
+        title: `Best Nightclubs in ${displayCity}${pageNum > 1 ? ` (Page ${pageNum})` : ''} - Guestlist, Events & VIP Tables | Clubin`,
         description: `Discover the hottest nightclubs and party venues in ${displayCity}. Book guestlists and get VIP table reservations on Clubin.`,
-        url: `https://clubin.co.in/clubs/${citySlug}`,
+        url: pageUrl,
         structuredData: [
             {
                 '@context': 'https://schema.org',
                 '@type': 'CollectionPage',
                 name: `Best Nightclubs in ${displayCity}`,
                 description: `Discover the hottest nightclubs and party venues in ${displayCity}.`,
-                url: `https://clubin.co.in/clubs/${citySlug}`,
+                url: pageUrl,
             },
             {
                 '@context': 'https://schema.org',
@@ -67,6 +72,14 @@ export function ClubsListPage() {
             try {
                 setLoading(true);
                 setError(null);
+                // Prefer the build-time search index shard for this city (served
+                // from the CDN, no API round-trip); fall back to the live API.
+                const index = city ? await loadSearchIndex(city) : null;
+                setSearchIndex(index);
+                if (index) {
+                    setClubs(index.clubs);
+                    return;
+                }
                 // Fetch all clubs and filter client-side so the live page matches the
                 // pre-rendered one for every city/sub-area slug (incl. Gurgaon, Noida, Lucknow).
                 const data = await fetchClubs();
@@ -81,11 +94,19 @@ export function ClubsListPage() {
         loadClubs();
     }, [city]);
 
-    // Filter clubs by search query
-    const filteredClubs = clubs.filter((club) =>
-        club.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        club.location.toLowerCase().includes(searchQuery.toLowerCase())
-    );
+    // Filter clubs by search query (token-prefix lookup when the index is loaded)
+    const filteredClubs = searchIndex
+        ? querySearchIndex(searchIndex, searchQuery).clubs
+        : clubs.filter((club) =>
+            club.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
+            club.location.toLowerCase().includes(searchQuery.toLowerCase())
+        );
+
+    // Paginate the full listing like the pre-rendered pages; a search spans every page.
+    const pageCount = Math.max(1, Math.ceil(filteredClubs.length / CITY_PAGE_SIZE));
+    const shownClubs = searchQuery
+        ? filteredClubs
+        : filteredClubs.slice((pageNum - 1) * CITY_PAGE_SIZE, pageNum * CITY_PAGE_SIZE);
 
     return (
         <div className="min-h-screen bg-[#0a0a0a] text-white font-manrope">
@@ -177,7 +198,7 @@ export function ClubsListPage() {
                             Retry
                         </button>
                     </div>
-                ) : filteredClubs.length === 0 ? (
+                ) : shownClubs.length === 0 ? (
                     <div className="text-center py-20">
                         <div className="w-16 h-16 mx-auto mb-4 rounded-full bg-white/5 flex items-center justify-center">
                             <Search className="w-7 h-7 text-white/20" />
@@ -185,8 +206,18 @@ export function ClubsListPage() {
                         <p className="text-white/50 text-lg">
                             {searchQuery
                                 ? 'No clubs match your search'
-                                : 'No clubs available in this city yet'}
+                                : filteredClubs.length > 0
+                                    ? 'No more clubs on this page'
+                                    : 'No clubs available in this city yet'}
                         </p>
+                        {!searchQuery && filteredClubs.length > 0 && (
+                            <Link
+                                to={cityPagePath(citySlug, 1)}
+                                className="mt-4 inline-block text-purple-400 hover:text-purple-300 text-sm font-medium"
+                            >
+                                Back to page 1
+                            </Link>
+                        )}
                         {searchQuery && (
                             <button
                                 onClick={() => setSearchQuery('')}
@@ -197,48 +228,74 @@ export function ClubsListPage() {
                         )}
                     </div>
                 ) : (
-                    <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 2xl:grid-cols-5 gap-4 sm:gap-6">
-                        {filteredClubs.map((club) => (
-                            <Link
-                                key={club.id}
-                                to={clubPath(city || '', club)}
-                                className="group block overflow-hidden rounded-2xl bg-[#1e1b2e]/90 backdrop-blur-xl border border-white/5 transition-all duration-500 hover:bg-[#252139]/90 hover:border-purple-500/30 hover:shadow-2xl hover:shadow-purple-500/10 hover:-translate-y-1"
-                            >
-                                {/* Club Image */}
-                                <div className="relative aspect-[16/10] overflow-hidden">
-                                    <img
-                                        src={club.imageUrl}
-                                        alt={club.name}
-                                        className="w-full h-full object-cover transition-transform duration-700 group-hover:scale-110"
-                                    />
-                                    {/* Glass Overlay on Image */}
-                                    <div className="absolute inset-0 bg-gradient-to-t from-[#0a0a0a] via-transparent to-transparent opacity-80" />
+                    <>
+                        <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 2xl:grid-cols-5 gap-4 sm:gap-6">
+                            {shownClubs.map((club) => (
+                                <Link
+                                    key={club.id}
+                                    to={clubPath(city || '', club)}
+                                    className="group block overflow-hidden rounded-2xl bg-[#1e1b2e]/90 backdrop-blur-xl border border-white/5 transition-all duration-500 hover:bg-[#252139]/90 hover:border-purple-500/30 hover:shadow-2xl hover:shadow-purple-500/10 hover:-translate-y-1"
+                                >
+                                    {/* Club Image */}
+                                    <div className="relative aspect-[16/10] overflow-hidden">
+                                        <img
+                                            src={club.imageUrl}
+                                            alt={club.name}
+                                            className="w-full h-full object-cover transition-transform duration-700 group-hover:scale-110"
+                                        />
+                                        {/* Glass Overlay on Image */}
+                                        <div className="absolute inset-0 bg-gradient-to-t from-[#0a0a0a] via-transparent to-transparent opacity-80" />
 
-                                    {/* Event count badge - Glass Style */}
-                                    {club._count && club._count.events > 0 && (
-                                        <div className="absolute top-3 right-3 flex items-center gap-1.2 px-2.5 py-1 bg-white/10 backdrop-blur-md border border-white/10 rounded-full text-[10px] font-bold uppercase tracking-wider text-purple-300">
-                                            <Calendar className="w-3 h-3" />
-                                            {club._count.events} {club._count.events === 1 ? 'event' : 'events'}
+                                        {/* Event count badge - Glass Style */}
+                                        {club._count && club._count.events > 0 && (
+                                            <div className="absolute top-3 right-3 flex items-center gap-1.2 px-2.5 py-1 bg-white/10 backdrop-blur-md border border-white/10 rounded-full text-[10px] font-bold uppercase tracking-wider text-purple-300">
+                                                <Calendar className="w-3 h-3" />
+                                                {club._count.events} {club._count.events === 1 ? 'event' : 'events'}
+                                            </div>
+                                        )}
+                                    </div>
+
+                                    {/* Club Info */}
+                                    <div className="p-4 sm:p-5 relative">
+                                        <h3 className="text-base sm:text-lg font-bold mb-1.5 group-hover:text-purple-400 transition-colors leading-tight">
+                                            {club.name}
+                                        </h3>
+                                        <div className="flex items-center gap-1.5 text-white/40 text-xs sm:text-sm">
+                                            <MapPin className="w-3.5 h-3.5 flex-shrink-0 text-purple-500/50" />
+                                            <span className="truncate">{club.location}</span>
                                         </div>
-                                    )}
-                                </div>
 
-                                {/* Club Info */}
-                                <div className="p-4 sm:p-5 relative">
-                                    <h3 className="text-base sm:text-lg font-bold mb-1.5 group-hover:text-purple-400 transition-colors leading-tight">
-                                        {club.name}
-                                    </h3>
-                                    <div className="flex items-center gap-1.5 text-white/40 text-xs sm:text-sm">
-                                        <MapPin className="w-3.5 h-3.5 flex-shrink-0 text-purple-500/50" />
-                                        <span className="truncate">{club.location}</span>
+                                        {/* Subtle bottom glow on hover */}
+                                        <div className="absolute bottom-0 left-0 right-0 h-px bg-gradient-to-r from-transparent via-purple-500/0 to-transparent group-hover:via-purple-500/40 transition-all duration-700" />
                                     </div>
-
-                                    {/* Subtle bottom glow on hover */}
-                                    <div className="absolute bottom-0 left-0 right-0 h-px bg-gradient-to-r from-transparent via-purple-500/0 to-transparent group-hover:via-purple-500/40 transition-all duration-700" />
-                                </div>
-                            </Link>
-                        ))}
-                    </div>
+                                </Link>
+                            ))}
+                        </div>
+                        {!searchQuery && pageCount > 1 && (
+                            <nav className="flex items-center justify-center gap-2 mt-10 text-sm" aria-label="Pagination">
+                                {pageNum > 1 && (
+                                    <Link to={cityPagePath(citySlug, pageNum - 1)} rel="prev" className="px-3 py-2 rounded-lg bg-white/5 hover:bg-white/10 transition-colors">
+                                        Previous
+                                    </Link>
+                                )}
+                                {Array.from({ length: pageCount }, (_, i) => i + 1).map((n) => (
+                                    <Link
+                                        key={n}
+                                        to={cityPagePath(citySlug, n)}
+                                        aria-current={n === pageNum ? 'page' : undefined}
+                                        className={`px-3 py-2 rounded-lg transition-colors ${n === pageNum ? 'bg-purple-600 text-white' : 'bg-white/5 hover:bg-white/10'}`}
+                                    >
+                                        {n}
+                                    </Link>
+                                ))}
+                                {pageNum < pageCount && (
+                                    <Link to={cityPagePath(citySlug, pageNum + 1)} rel="next" className="px-3 py-2 rounded-lg bg-white/5 hover:bg-white/10 transition-colors">
+                                        Next
+                                    </Link>
+                                )}
+                            </nav>
+                        )}
+                    </>
                 )}
             </main>
 
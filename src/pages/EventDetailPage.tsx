@@ -3,8 +3,9 @@ import { useParams, useNavigate, Link } from 'react-router-dom';
 import { Skeleton } from '../components/Skeleton';
 import { VenueImageSlideshow } from '../components/VenueImageSlideshow';
 import type { Event } from '../types';
-import { fetchEventDetails, formatDate, formatTime, createShortLink, isMobileDevice, APP_STORE_URL, PLAY_STORE_URL } from '../api';
+import { fetchEventDetails, fetchEventDetailsLive, formatDate, formatTime, createShortLink, isMobileDevice, APP_STORE_URL, PLAY_STORE_URL } from '../api';
 import { extractId, eventUrl as buildEventUrl } from '../lib/urls';
+import { readRouteData } from '../lib/routeData';
 import { BookingModal } from '../components/booking/BookingModal';
 import { AccountButton } from '../components/AccountButton';
 import { useSEO } from '../hooks/useSEO';
@@ -44,9 +45,19 @@ export function EventDetailPage() {
 
     useEffect(() => {
         async function loadEvent() {
+            // Prerendered page: show the embedded event right away and refresh
+            // it from the live API in the background (no snapshot fallback —
+            // that is what is already shown); a failed refresh keeps it.
+            const embedded = !code && eventId ? readRouteData('event', extractId(eventId)) : null;
             try {
-                setLoading(true);
-                setError(null);
+                if (embedded) {
+                    setEvent(embedded.event);
+                    setError(null);
+                    setLoading(false);
+                } else {
+                    setLoading(true);
+                    setError(null);
+                }
 
                 let eventData: Event;
 
@@ -56,6 +67,8 @@ export function EventDetailPage() {
                     const data = await response.json();
                     if (data.type !== 'event') throw new Error('Invalid link');
                     eventData = data.data;
+                } else if (embedded) {
+                    eventData = await fetchEventDetailsLive(embedded.id);
                 } else if (eventId) {
                     eventData = await fetchEventDetails(extractId(eventId));
                 } else {
@@ -64,7 +77,7 @@ export function EventDetailPage() {
 
                 setEvent(eventData);
             } catch (err) {
-                setError('Failed to load event. Please try again.');
+                if (!embedded) setError('Failed to load event. Please try again.');
                 console.error(err);
             } finally {
                 setLoading(false);
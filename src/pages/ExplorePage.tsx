@@ -1,10 +1,10 @@
 import { useEffect, useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import type { Club, Event } from '../types';
 import { CITIES } from '../types';
 import { fetchClubs, fetchEvents, formatDate } from '../api';
 import { useSEO } from '../hooks/useSEO';
 import { clubPath, eventPath, getCitySlug, SUBCITIES } from '../lib/urls';
+import { loadSearchIndex, type ClubSummary, type EventSummary } from '../lib/searchIndex';
 import { ArrowLeft, MapPin, Calendar } from 'lucide-react';
 import { AccountButton } from '../components/AccountButton';
 
@@ -14,12 +14,23 @@ const citySlug = (id: string) => id.toLowerCase().replace(/\s+/g, '-');
 
 export function ExplorePage() {
     const navigate = useNavigate();
-    const [clubs, setClubs] = useState<Club[]>([]);
-    const [events, setEvents] = useState<Event[]>([]);
+    const [clubs, setClubs] = useState<ClubSummary[]>([]);
+    const [events, setEvents] = useState<EventSummary[]>([]);
 
     useEffect(() => {
-        fetchClubs().then(setClubs).catch(() => { });
-        fetchEvents(undefined, true).then(setEvents).catch(() => { });
+        // Build-time 'all' index shard first (CDN, no API round-trip); the API
+        // only when it is unavailable. The shard's events were upcoming at build
+        // time, so drop any that have passed since.
+        loadSearchIndex('all').then((index) => {
+            if (index) {
+                const today = new Date().toISOString().slice(0, 10);
+                setClubs(index.clubs);
+                setEvents(index.events.filter((e) => e.date >= today));
+                return;
+            }
+            fetchClubs().then(setClubs).catch(() => { });
+            fetchEvents(undefined, true).then(setEvents).catch(() => { });
+        });
     }, []);
 
     useSEO({
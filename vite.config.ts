@@ -4,4 +4,6 @@ import react from '@vitejs/plugin-react'
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react()],
+  // CITY_PAGE_SIZE is shared with scripts/prerender.py and generate-sitemap.mjs.
+  envPrefix: ['VITE_', 'CITY_PAGE_SIZE'],
 })